@@ -0,0 +1,310 @@
+"""
+=============================================================================
+RTP BOT BENCHMARK
+=============================================================================
+Reproducible timings for the RTP kernels, catalog evaluation, game queries
+and one full main() cycle against a fake Telegram backend. The clock is
+frozen, so every run evaluates exactly the same intervals.
+
+    python benchmark.py --output results.json
+    python benchmark.py --baseline results.json --threshold 0.25
+
+With --baseline the run fails (exit code 1) when any benchmark is slower
+than the baseline by more than the threshold (0.25 = 25%).
+=============================================================================
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+# Keep benchmark state (ledger, outbox, caches) away from the bot's own cache
+os.environ.setdefault("CACHE_DIR", os.path.join(tempfile.gettempdir(), "rtp_bot_benchmark"))
+
+import numpy as np
+
+import kiki2test as bot
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+# Every benchmark runs at this São Paulo time
+FROZEN_NOW = bot.SAO_PAULO_TZ.localize(datetime(2025, 1, 15, 12, 1, 30))
+
+# Catalog sizes for the full-catalog evaluation
+CATALOG_SIZES = (175, 5_000, 50_000)
+
+# Timing repeats per benchmark (the median is compared against baselines)
+REPEAT = 7
+
+# Default allowed slowdown before a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+
+class FrozenDatetime(datetime):
+    """datetime whose now() always returns FROZEN_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW.astimezone(tz) if tz is not None else FROZEN_NOW.replace(tzinfo=None)
+
+
+def synthetic_catalog(size: int) -> bot.GameCatalog:
+    """Catalog of `size` games split between the two providers."""
+    providers = ("PG SOFT", "PRAGMATIC PLAY")
+    games = [
+        {
+            "game_id": f"{providers[i % 2]}/BENCH_{i:06d}.webp",
+            "display_name": f"Bench {i}",
+            "provider": providers[i % 2],
+            "image_file": f"BENCH_{i:06d}.webp",
+        }
+        for i in range(size)
+    ]
+    return bot.GameCatalog(games)
+
+
+# =============================================================================
+# FAKE TELEGRAM BACKEND
+# =============================================================================
+
+class FakeTelegramBot:
+    """
+    In-process stand-in for telegram.Bot: answers instantly with message
+    objects shaped like the real ones.
+    """
+
+    def __init__(self):
+        self.message_id = 0
+        self.calls = 0
+
+    def _message(self):
+        self.message_id += 1
+        self.calls += 1
+        return SimpleNamespace(
+            message_id=self.message_id,
+            photo=[SimpleNamespace(file_id=f"fake-file-{self.message_id}")]
+        )
+
+    async def send_photo(self, **kwargs):
+        return self._message()
+
+    async def send_message(self, **kwargs):
+        return self._message()
+
+    async def send_media_group(self, **kwargs):
+        return [self._message() for _ in kwargs["media"]]
+
+
+# =============================================================================
+# TIMING
+# =============================================================================
+
+def measure(func, repeat: int = REPEAT) -> dict:
+    """
+    Times a zero-argument callable like timeit: calls per repeat are chosen
+    so one repeat takes at least 0.2 seconds.
+
+    Returns:
+        Per-call seconds (median and min) and the loop sizes used
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"median_s": statistics.median(times), "min_s": min(times), "number": number, "repeat": repeat}
+
+
+def bench_kernels() -> dict:
+    """Scalar RTP functions."""
+    time_seed = bot.get_time_seed(FROZEN_NOW)
+    game_hash = bot.string_to_hash("PG SOFT/FORTUNE_1.webp")
+    combined = time_seed * 1000 + game_hash
+    return {
+        "string_to_hash": measure(lambda: bot.string_to_hash("PG SOFT/FORTUNE_1.webp")),
+        "seeded_random": measure(lambda: bot.seeded_random(combined)),
+        "get_seeded_random_int": measure(lambda: bot.get_seeded_random_int(combined, 30, 99)),
+    }
+
+
+def bench_catalog_evaluation() -> dict:
+    """evaluate_games_batch() over synthetic catalogs."""
+    time_seed = bot.get_time_seed(FROZEN_NOW)
+    results = {}
+    for size in CATALOG_SIZES:
+        catalog = synthetic_catalog(size)
+        results[f"evaluate_catalog[{size}]"] = measure(lambda: bot.evaluate_games_batch(catalog.hashes, time_seed))
+    return results
+
+
+def bench_queries() -> dict:
+    """get_high_rtp_games() per provider on the real catalog."""
+    snapshot = bot.get_interval_snapshot(FROZEN_NOW)
+    bot.IMAGE_INDEX.refresh(force=True)
+    providers = ["ALL"] + sorted(set(bot.get_catalog().providers))
+    return {
+        f"get_high_rtp_games[{provider}]": measure(lambda: bot.get_high_rtp_games(provider, snapshot))
+        for provider in providers
+    }
+
+
+async def _run_main_cycle() -> tuple:
+    """Runs main() until its first cycle finished; returns (startup + cycle, cycle) seconds."""
+    def cycles():
+        return sum(state[2] for state in bot.CYCLE_SECONDS._values.values())
+
+    fake_bots = []
+    for tenant in bot.get_tenants():
+        tenant.bot = FakeTelegramBot()
+        tenant.rate_limiter = bot.TelegramRateLimiter(name=tenant.name)
+        fake_bots.append(tenant.bot)
+
+    # Start every run from the same state: no forecast, snapshots or sends in memory
+    bot.SEND_LEDGER._db.execute("DELETE FROM sent")
+    bot._snapshot_cache.clear()
+    bot._forecast_table = None
+
+    done = cycles()
+    started = time.perf_counter()
+    task = asyncio.create_task(bot.main())
+    while cycles() == done and not task.done():
+        await asyncio.sleep(0.0005)
+    total = time.perf_counter() - started
+
+    for other in asyncio.all_tasks():
+        if other is not asyncio.current_task():
+            other.cancel()
+    await asyncio.gather(*(t for t in asyncio.all_tasks() if t is not asyncio.current_task()), return_exceptions=True)
+    if task.done() and not task.cancelled() and task.exception() is not None:
+        raise task.exception()
+    # A cycle that sent nothing would only time an empty loop
+    if sum(fake.calls for fake in fake_bots) == 0:
+        raise RuntimeError("main() cycle sent no messages; the timing would be meaningless")
+
+    (state,) = bot.CYCLE_SECONDS._values.values()
+    return total, state[1] / state[2]
+
+
+def bench_main_cycle(repeat: int = REPEAT) -> dict:
+    """One full main() cycle (startup included) against FakeTelegramBot."""
+    real_datetime = bot.datetime
+    bot.datetime = FrozenDatetime
+    try:
+        asyncio.run(_run_main_cycle())  # Warm-up: converts images, builds the forecast
+        totals, cycles = [], []
+        for _ in range(repeat):
+            bot.CYCLE_SECONDS._values.clear()
+            total, cycle = asyncio.run(_run_main_cycle())
+            totals.append(total)
+            cycles.append(cycle)
+    finally:
+        bot.datetime = real_datetime
+    return {
+        "main_startup_and_cycle": {"median_s": statistics.median(totals), "min_s": min(totals), "number": 1, "repeat": repeat},
+        "main_cycle": {"median_s": statistics.median(cycles), "min_s": min(cycles), "number": 1, "repeat": repeat},
+    }
+
+
+BENCHMARK_GROUPS = {
+    "kernels": bench_kernels,
+    "catalog": bench_catalog_evaluation,
+    "queries": bench_queries,
+    "main": bench_main_cycle,
+}
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+def environment_info() -> dict:
+    """Where the numbers come from."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "frozen_now": FROZEN_NOW.isoformat(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Benchmarks slower than the baseline by more than `threshold`.
+
+    Returns:
+        (name, baseline seconds, current seconds, ratio) per regression
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = current["median_s"] / previous["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append((name, previous["median_s"], current["median_s"], ratio))
+    return regressions
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown vs the baseline (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARK_GROUPS), help="run only these groups")
+    args = parser.parse_args()
+
+    results = {}
+    for group, run in BENCHMARK_GROUPS.items():
+        if args.only and group not in args.only:
+            continue
+        for name, result in run().items():
+            results[name] = result
+            print(f"{name:<40} {format_seconds(result['median_s']):>12}  (min {format_seconds(result['min_s'])})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment_info(), "results": results}, f, indent=2)
+        print(f"\n💾 Resultados salvos em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressão(ões) acima de {args.threshold:.0%}:")
+            for name, before, after, ratio in regressions:
+                print(f"   • {name}: {format_seconds(before)} -> {format_seconds(after)} ({ratio:.2f}x)")
+            return 1
+        print(f"\n✅ Nenhuma regressão acima de {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,7 @@
 """Debug script to trace RTP calculation differences"""
-import ctypes
 import math
 
-def to_int32(val):
-    return ctypes.c_int32(val).value
-
-def to_uint32(val):
-    return ctypes.c_uint32(val).value
-
-def string_to_hash(s):
-    hash_val = 0
-    for char in s:
-        shifted = to_int32(hash_val << 5)
-        hash_val = to_int32(shifted - hash_val + ord(char))
-    return abs(hash_val)
-
-def js_imul(a, b):
-    return to_int32((to_uint32(a) * to_uint32(b)) & 0xFFFFFFFF)
-
-def seeded_random(seed):
-    seed = abs(to_int32(seed))
-    t = to_uint32(seed + 0x6D2B79F5)
-    t = to_uint32(js_imul(t ^ (t >> 15), t | 1))
-    t = to_uint32(t ^ to_uint32(t + js_imul(t ^ (t >> 7), t | 61)))
-    return to_uint32(t ^ (t >> 14)) / 4294967296
-
-def get_seeded_random_int(seed, min_val, max_val):
-    seed = (seed * 9301 + 49297) % 233280
-    rnd = seeded_random(seed)
-    return math.floor(rnd * (max_val - min_val + 1)) + min_val
+from rtp_reference import reduce_seed, seeded_random, string_to_hash
 
 # Test with the EXACT time seed from website
 time_seed = 1064842017
@@ -44,7 +17,7 @@ print(f"Game Hash: {game_hash}")
 print(f"Combined Seed: {combined_seed}")
 
 # Step through get_seeded_random_int
-seed_after_transform = (combined_seed * 9301 + 49297) % 233280
+seed_after_transform = reduce_seed(combined_seed)
 print(f"Seed after transform: {seed_after_transform}")
 
 rnd = seeded_random(seed_after_transform)
@@ -0,0 +1,565 @@
+"""
+=============================================================================
+FAKE TELEGRAM BOT API SERVER - LOCAL LOAD AND THROUGHPUT TESTING
+=============================================================================
+Implements the part of the Bot API the bot uses (getMe, sendPhoto,
+sendMessage, sendMediaGroup, editMessageCaption) with configurable latency, injected
+429 retry_after responses and Telegram-like rate limits per bot and per chat.
+
+Point the bot at it with TELEGRAM_BASE_URL:
+
+    python fake_telegram_server.py --port 8081 --latency 80 --chat-rate 20
+    TELEGRAM_BASE_URL=http://127.0.0.1:8081/bot python kiki2test.py
+
+Or let it drive one send cycle for many simulated channels and report
+messages/second, the prepare and commit durations and the
+boundary-to-delivery latency:
+
+    python fake_telegram_server.py --load-test 300 --tenants 3
+
+GET /stats returns the request counters as JSON.
+=============================================================================
+"""
+
+import argparse
+import asyncio
+import email.parser
+import email.policy
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# =============================================================================
+# SERVER CONFIGURATION
+# =============================================================================
+
+DEFAULT_PORT = 8081
+
+# Telegram's documented limits: ~30 messages/second per bot and
+# ~20 messages/minute per group or channel
+DEFAULT_GLOBAL_RATE = 30.0
+DEFAULT_CHAT_RATE_PER_MINUTE = 20.0
+
+# Largest body accepted (Telegram allows 10 MB photos)
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+
+class FakeTelegramConfig:
+    """
+    Behaviour of the fake server.
+
+    Attributes:
+        latency: Mean response delay in seconds
+        jitter: Uniform +/- jitter around latency, in seconds
+        error_rate_429: Probability of an injected 429 per request
+        retry_after: retry_after (seconds) of injected 429s
+        global_rate: Messages/second per bot token (0 = unlimited)
+        chat_rate_per_minute: Messages/minute per chat (0 = unlimited)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate_429: float = 0.0,
+        retry_after: int = 5,
+        global_rate: float = DEFAULT_GLOBAL_RATE,
+        chat_rate_per_minute: float = DEFAULT_CHAT_RATE_PER_MINUTE
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate_429 = error_rate_429
+        self.retry_after = retry_after
+        self.global_rate = global_rate
+        self.chat_rate_per_minute = chat_rate_per_minute
+
+
+class ApiError(Exception):
+    """Bot API error response."""
+
+    def __init__(self, error_code: int, description: str, retry_after: Optional[int] = None):
+        super().__init__(description)
+        self.error_code = error_code
+        self.description = description
+        self.retry_after = retry_after
+
+    def to_json(self) -> Dict:
+        body = {"ok": False, "error_code": self.error_code, "description": self.description}
+        if self.retry_after is not None:
+            body["parameters"] = {"retry_after": self.retry_after}
+        return body
+
+
+class SlidingWindowLimiter:
+    """At most `limit` messages per `window` seconds per key."""
+
+    def __init__(self, limit: float, window: float):
+        self.limit = limit
+        self.window = window
+        self._events: Dict[str, deque] = defaultdict(deque)
+
+    def check(self, key: str, cost: int, now: float) -> Optional[int]:
+        """
+        Records `cost` messages for key if allowed.
+
+        Returns:
+            None if allowed, otherwise the retry_after in whole seconds
+        """
+        if not self.limit:
+            return None
+        events = self._events[key]
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if len(events) + cost > self.limit:
+            oldest = events[max(0, len(events) + cost - int(self.limit) - 1)] if events else now
+            return max(1, int(oldest + self.window - now + 0.999))
+        events.extend([now] * cost)
+        return None
+
+
+# =============================================================================
+# BOT API STATE
+# =============================================================================
+
+class FakeBotApi:
+    """
+    In-memory Bot API: chats, messages and uploaded files per bot token.
+    """
+
+    def __init__(self, config: FakeTelegramConfig):
+        self.config = config
+        self.global_limiter = SlidingWindowLimiter(config.global_rate, 1.0)
+        self.chat_limiter = SlidingWindowLimiter(config.chat_rate_per_minute, 60.0)
+        self._chat_ids: Dict[str, int] = {}
+        self._messages: Dict[Tuple[str, int], Dict[int, Dict]] = defaultdict(dict)
+        self._next_message_id: Dict[Tuple[str, int], int] = defaultdict(int)
+        self._file_ids: Dict[str, set] = defaultdict(set)
+        self.stats = {
+            "requests": defaultdict(int),
+            "messages": 0,
+            "errors": defaultdict(int),
+            "per_chat": defaultdict(int),
+            "started": time.time(),
+        }
+        # Wall-clock time of every delivered message
+        self.delivered_at: List[float] = []
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    def _chat(self, chat_id: str) -> Dict:
+        if chat_id is None or chat_id == "":
+            raise ApiError(400, "Bad Request: chat_id is empty")
+        chat_id = str(chat_id)
+        if chat_id.lstrip("-").isdigit():
+            return {"id": int(chat_id), "type": "channel", "title": chat_id}
+        if chat_id not in self._chat_ids:
+            self._chat_ids[chat_id] = -1000000000000 - len(self._chat_ids) - 1
+        return {"id": self._chat_ids[chat_id], "type": "channel", "title": chat_id, "username": chat_id.lstrip("@")}
+
+    def _photo(self, token: str, photo, files: Dict[str, bytes]) -> List[Dict]:
+        """PhotoSize list for an uploaded file, attach:// reference or file_id."""
+        if isinstance(photo, str) and photo.startswith("attach://"):
+            photo = files.get(photo[len("attach://"):])
+        if isinstance(photo, bytes):
+            file_id = f"FAKE{len(self._file_ids[token]) + 1:08d}_{abs(hash(photo)) % 10**8:08d}"
+            self._file_ids[token].add(file_id)
+            size = len(photo)
+        elif isinstance(photo, str) and photo in self._file_ids[token]:
+            file_id, size = photo, 0
+        else:
+            raise ApiError(400, "Bad Request: wrong file identifier/http url specified")
+        return [{"file_id": file_id, "file_unique_id": file_id[-8:], "width": 360, "height": 472, "file_size": size}]
+
+    def _store(self, token: str, chat: Dict, **content) -> Dict:
+        key = (token, chat["id"])
+        self._next_message_id[key] += 1
+        message = {"message_id": self._next_message_id[key], "date": int(time.time()), "chat": chat, **content}
+        self._messages[key][message["message_id"]] = message
+        return message
+
+    def _limit(self, token: str, chat: Dict, cost: int):
+        now = time.monotonic()
+        retry_after = self.chat_limiter.check(f"{token}:{chat['id']}", cost, now)
+        if retry_after is None:
+            retry_after = self.global_limiter.check(token, cost, now)
+        if retry_after is None and self.config.error_rate_429 and random.random() < self.config.error_rate_429:
+            retry_after = self.config.retry_after
+        if retry_after is not None:
+            raise ApiError(429, f"Too Many Requests: retry after {retry_after}", retry_after=retry_after)
+
+    # -------------------------------------------------------------------------
+    # Methods
+    # -------------------------------------------------------------------------
+
+    def get_me(self, token: str, params: Dict, files: Dict[str, bytes]) -> Dict:
+        bot_id = token.split(":", 1)[0]
+        return {
+            "id": int(bot_id) if bot_id.isdigit() else 1, "is_bot": True,
+            "first_name": "Fake RTP Bot", "username": f"fake_{bot_id}_bot",
+        }
+
+    def send_photo(self, token: str, params: Dict, files: Dict[str, bytes]) -> Dict:
+        chat = self._chat(params.get("chat_id"))
+        self._limit(token, chat, 1)
+        photo = files.get("photo", params.get("photo"))
+        message = self._store(token, chat, photo=self._photo(token, photo, files), caption=params.get("caption"))
+        if params.get("reply_markup"):
+            message["reply_markup"] = json.loads(params["reply_markup"])
+        return message
+
+    def send_message(self, token: str, params: Dict, files: Dict[str, bytes]) -> Dict:
+        chat = self._chat(params.get("chat_id"))
+        if not params.get("text"):
+            raise ApiError(400, "Bad Request: message text is empty")
+        self._limit(token, chat, 1)
+        message = self._store(token, chat, text=params["text"])
+        if params.get("reply_markup"):
+            message["reply_markup"] = json.loads(params["reply_markup"])
+        return message
+
+    def send_media_group(self, token: str, params: Dict, files: Dict[str, bytes]) -> List[Dict]:
+        chat = self._chat(params.get("chat_id"))
+        media = json.loads(params.get("media") or "[]")
+        if not 2 <= len(media) <= 10:
+            raise ApiError(400, "Bad Request: media group must include 2-10 items")
+        self._limit(token, chat, len(media))
+        photos = [self._photo(token, item["media"], files) for item in media]
+        group_id = str(random.getrandbits(60))
+        return [
+            self._store(token, chat, photo=photo, caption=item.get("caption"), media_group_id=group_id)
+            for item, photo in zip(media, photos)
+        ]
+
+    def edit_message_caption(self, token: str, params: Dict, files: Dict[str, bytes]) -> Dict:
+        chat = self._chat(params.get("chat_id"))
+        message = self._messages[(token, chat["id"])].get(int(params.get("message_id") or 0))
+        if message is None:
+            raise ApiError(400, "Bad Request: message to edit not found")
+        if message.get("caption") == params.get("caption"):
+            raise ApiError(400, "Bad Request: message is not modified")
+        self._limit(token, chat, 1)
+        message["caption"] = params.get("caption")
+        message["edit_date"] = int(time.time())
+        return message
+
+    METHODS = {
+        "getme": get_me,
+        "sendphoto": send_photo,
+        "sendmessage": send_message,
+        "sendmediagroup": send_media_group,
+        "editmessagecaption": edit_message_caption,
+    }
+
+    async def call(self, token: str, method: str, params: Dict, files: Dict[str, bytes]) -> Tuple[int, Dict]:
+        """
+        Runs one API method after the configured latency.
+
+        Returns:
+            (HTTP status, response JSON)
+        """
+        self.stats["requests"][method] += 1
+        delay = self.config.latency + random.uniform(-self.config.jitter, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        handler = self.METHODS.get(method.lower())
+        if handler is None:
+            self.stats["errors"][404] += 1
+            return 404, ApiError(404, "Not Found").to_json()
+        try:
+            result = handler(self, token, params, files)
+        except ApiError as e:
+            self.stats["errors"][e.error_code] += 1
+            return e.error_code, e.to_json()
+
+        if "chat_id" in params:
+            sent = len(result) if isinstance(result, list) else 1
+            self.stats["messages"] += sent
+            self.stats["per_chat"][str(params["chat_id"])] += sent
+            self.delivered_at.extend([time.time()] * sent)
+        return 200, {"ok": True, "result": result}
+
+    def stats_json(self) -> Dict:
+        elapsed = max(1e-9, time.time() - self.stats["started"])
+        return {
+            "requests": dict(self.stats["requests"]),
+            "messages": self.stats["messages"],
+            "messages_per_second": self.stats["messages"] / elapsed,
+            "errors": {str(code): count for code, count in self.stats["errors"].items()},
+            "chats": len(self.stats["per_chat"]),
+            "elapsed_s": elapsed,
+        }
+
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+def parse_body(content_type: str, body: bytes) -> Tuple[Dict, Dict[str, bytes]]:
+    """
+    Parses a urlencoded, multipart or JSON request body.
+
+    Returns:
+        (parameters, uploaded files by field name)
+    """
+    params: Dict = {}
+    files: Dict[str, bytes] = {}
+    if content_type.startswith("multipart/form-data"):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+        )
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            payload = part.get_payload(decode=True) or b""
+            if part.get_filename() is not None:
+                files[name] = payload
+            else:
+                params[name] = payload.decode("utf-8")
+    elif content_type.startswith("application/json"):
+        params = {k: v if isinstance(v, str) else json.dumps(v) for k, v in json.loads(body or b"{}").items()}
+    elif body:
+        params = {k: v[0] for k, v in parse_qs(body.decode("utf-8"), keep_blank_values=True).items()}
+    return params, files
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Reads one HTTP/1.1 request; None when the client closed the connection."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    else:
+        length = int(headers.get("content-length", "0"))
+        if length > MAX_BODY_BYTES:
+            raise ValueError("request body too large")
+        body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def http_response(status: int, payload: Dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests"}.get(status, "Error")
+    return (
+        f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode() + body
+
+
+def make_handler(api: FakeBotApi):
+    """Connection handler for asyncio.start_server (keep-alive aware)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                path = urlsplit(target).path
+
+                if path == "/stats":
+                    status, payload = 200, api.stats_json()
+                elif path.startswith("/bot") and path.count("/") == 2:
+                    token, api_method = path[len("/bot"):].split("/", 1)
+                    params, files = parse_body(headers.get("content-type", ""), body)
+                    params.update({k: v[0] for k, v in parse_qs(urlsplit(target).query).items()})
+                    status, payload = await api.call(token, api_method, params, files)
+                else:
+                    status, payload = 404, ApiError(404, "Not Found").to_json()
+
+                writer.write(http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def start_fake_server(
+    config: FakeTelegramConfig, host: str = "127.0.0.1", port: int = DEFAULT_PORT
+) -> Tuple[asyncio.AbstractServer, FakeBotApi]:
+    """
+    Starts the fake Bot API on the running event loop.
+
+    Returns:
+        (server, api) - api.stats_json() has the counters
+    """
+    api = FakeBotApi(config)
+    server = await asyncio.start_server(make_handler(api), host, port, limit=MAX_BODY_BYTES)
+    return server, api
+
+
+# =============================================================================
+# LOAD TEST
+# =============================================================================
+
+def write_load_test_catalog(path: str, channels: int, tenants: int):
+    """catalog.json copy with `channels` simulated channels split over `tenants` bots."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(script_dir, "catalog.json"), "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+    providers = ["ALL", "PG SOFT", "PRAGMATIC PLAY"]
+    catalog.pop("channels", None)
+    catalog["tenants"] = [
+        {
+            "name": f"load{t}",
+            "bot_token": f"{100000 + t}:FAKE-TOKEN-{t}",
+            "channels": [
+                {
+                    "channel_id": f"@load_{t}_{c}",
+                    "provider": providers[c % len(providers)],
+                    "name": f"Load {t}/{c}",
+                    "album": c % 2 == 0,
+                }
+                for c in range(t, channels, tenants)
+            ],
+        }
+        for t in range(tenants)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False)
+
+
+async def run_load_test(args) -> Dict:
+    """Sends one cycle to `args.load_test` channels through the fake server."""
+    config = FakeTelegramConfig(
+        args.latency / 1000, args.jitter / 1000, args.error_rate_429, args.retry_after,
+        args.global_rate, args.chat_rate
+    )
+    server, api = await start_fake_server(config, "127.0.0.1", args.port)
+
+    work_dir = tempfile.mkdtemp(prefix="rtp_bot_load_")
+    catalog_path = os.path.join(work_dir, "catalog.json")
+    write_load_test_catalog(catalog_path, args.load_test, args.tenants)
+    os.environ.update({
+        "TELEGRAM_BASE_URL": f"http://127.0.0.1:{args.port}/bot",
+        "CATALOG_FILE": catalog_path,
+        "CACHE_DIR": os.path.join(work_dir, "cache"),
+    })
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import kiki2test as bot
+
+    bot.IMAGE_INDEX.refresh(force=True)
+    snapshot = bot.get_interval_snapshot()
+    channels = bot.get_tenants().channels()
+
+    # Prepare phase, then commit as if the boundary were now
+    started = time.perf_counter()
+    prepared = await asyncio.gather(*(
+        bot.prepare_prediction(
+            channel_id=cfg["channel_id"], provider_filter=cfg["provider"], channel_name=cfg["name"],
+            snapshot=snapshot, album=cfg.get("album", False), query=bot.get_channel_query(cfg, tenant),
+            tenant=tenant
+        )
+        for tenant, cfg in channels
+    ))
+    prepare = time.perf_counter() - started
+
+    boundary = bot.datetime.now(bot.SAO_PAULO_TZ)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        bot.commit_prediction(prediction, boundary) for prediction in prepared if prediction is not None
+    ), return_exceptions=True)
+    cycle = time.perf_counter() - started
+    latencies = sorted(t - boundary.timestamp() for t in api.delivered_at)
+
+    for tenant in bot.get_tenants():
+        await tenant.bot.shutdown()
+    server.close()
+    await server.wait_closed()
+    stats = api.stats_json()
+    return {
+        "channels": len(channels),
+        "tenants": args.tenants,
+        "prepare_s": prepare,
+        "cycle_s": cycle,
+        "boundary_to_delivery_s": {
+            "first": latencies[0] if latencies else None,
+            "p50": latencies[len(latencies) // 2] if latencies else None,
+            "p95": latencies[int(len(latencies) * 0.95)] if latencies else None,
+            "last": latencies[-1] if latencies else None,
+        },
+        "messages": stats["messages"],
+        "messages_per_second": stats["messages"] / cycle if cycle else 0.0,
+        "requests": stats["requests"],
+        "errors": stats["errors"],
+        "failed_channels": sum(isinstance(r, Exception) for r in results),
+    }
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean response delay in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- latency jitter in ms")
+    parser.add_argument("--error-rate-429", type=float, default=0.0, help="probability of an injected 429")
+    parser.add_argument("--retry-after", type=int, default=5, help="retry_after of injected 429s (seconds)")
+    parser.add_argument("--global-rate", type=float, default=DEFAULT_GLOBAL_RATE,
+                        help="messages/second per bot token, 0 = unlimited (default: %(default)s)")
+    parser.add_argument("--chat-rate", type=float, default=DEFAULT_CHAT_RATE_PER_MINUTE,
+                        help="messages/minute per chat, 0 = unlimited (default: %(default)s)")
+    parser.add_argument("--load-test", type=int, metavar="CHANNELS",
+                        help="run one send cycle for this many simulated channels and exit")
+    parser.add_argument("--tenants", type=int, default=1, help="bots the load-test channels are split over")
+    args = parser.parse_args()
+
+    if args.load_test:
+        report = asyncio.run(run_load_test(args))
+        print(json.dumps(report, indent=2))
+        return 0 if report["failed_channels"] == 0 else 1
+
+    async def serve():
+        config = FakeTelegramConfig(
+            args.latency / 1000, args.jitter / 1000, args.error_rate_429, args.retry_after,
+            args.global_rate, args.chat_rate
+        )
+        server, _ = await start_fake_server(config, args.host, args.port)
+        print(f"🤖 Fake Telegram Bot API em http://{args.host}:{args.port}/bot<token>/<method>")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+=============================================================================
+RTP DIFFERENTIAL FUZZER - OPTIMIZED KERNELS VS THE REFERENCE PORT
+=============================================================================
+Checks an RTP implementation against rtp_reference.py: first on the golden
+vectors captured from the website JavaScript, then on millions of random
+(time seed, game) pairs. Half of the random games are raw game ids, hashed by
+the bot's own hashing path; the other half are uniform hashes. Any difference
+in the hash, RTP, normal spins, auto, turbo or multiplier is reported with
+the inputs that reproduce it.
+
+    python fuzz_rtp.py                          # batch engine, 1M games
+    python fuzz_rtp.py --impl scalar --count 200000
+    python fuzz_rtp.py --impl mymodule:evaluate --count 5000000 --workers 8
+    python fuzz_rtp.py --hash mymodule:hash_game_ids
+
+An implementation is any function (game_hashes, time_seed) -> dict of arrays
+with the keys of rtp_reference.EVALUATION_FIELDS, like
+kiki2test.evaluate_games_batch(). A hash function is any function
+(game_ids) -> sequence of hashes, like catalog_hashes().
+=============================================================================
+"""
+
+import argparse
+import importlib
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+import kiki2test as bot
+import rtp_reference as reference
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+DEFAULT_COUNT = 1_000_000
+
+# Random games evaluated per random time seed
+GAMES_PER_TIME_SEED = 16
+
+# Games per work unit handed to a worker process
+CHUNK_GAMES = 20_000
+
+# Counterexamples printed (and kept) per run
+MAX_REPORTED = 10
+
+# Realistic time seeds: the years the bot can plausibly run in
+REALISTIC_TIME_SEEDS = (reference.get_time_seed(datetime(2020, 1, 1)), reference.get_time_seed(datetime(2040, 12, 31, 23, 59)))
+
+# Characters of random game ids (mostly ASCII, some accents and non-BMP)
+GAME_ID_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 _-./" * 4 + "çãéõ🎰𝐀"
+GAME_ID_PROVIDERS = ("PG SOFT/", "PRAGMATIC PLAY/", "Pragmatic Play/", "")
+
+
+# =============================================================================
+# IMPLEMENTATIONS UNDER TEST
+# =============================================================================
+
+def evaluate_scalar(game_hashes, time_seed: int) -> Dict[str, np.ndarray]:
+    """The bot's scalar path: table-based get_seeded_random_int() / get_seeded_choice()."""
+    results = defaultdict(list)
+    auto_indexes = list(range(len(bot.CONFIG["auto_options"])))
+    turbo_indexes = list(range(len(bot.CONFIG["turbo_options"])))
+    for game_hash in game_hashes:
+        base_seed = time_seed * 1000 + int(game_hash)
+        results["rtp"].append(bot.get_seeded_random_int(base_seed, bot.CONFIG["rtp_min"], bot.CONFIG["rtp_max"]))
+        results["normal"].append(bot.get_seeded_random_int(base_seed + 1000, bot.CONFIG["normal_min"], bot.CONFIG["normal_max"]))
+        results["auto_index"].append(bot.get_seeded_choice(base_seed + 2000, auto_indexes))
+        results["turbo_index"].append(bot.get_seeded_choice(base_seed + 3000, turbo_indexes))
+        results["multiplier_index"].append(bot.get_seeded_random_int(base_seed * 7, 0, len(bot.CONFIG["multipliers"]) - 1))
+    return {field: np.asarray(values) for field, values in results.items()}
+
+
+def catalog_hashes(game_ids: List[str]) -> np.ndarray:
+    """The bot's hashing path: GameCatalog precomputes string_to_hash() of every game_id."""
+    games = [
+        {"game_id": game_id, "display_name": game_id, "provider": "FUZZ", "image_file": ""}
+        for game_id in game_ids
+    ]
+    return bot.GameCatalog(games).hashes
+
+
+IMPLEMENTATIONS = {
+    "batch": bot.evaluate_games_batch,
+    "scalar": evaluate_scalar,
+}
+
+HASHERS = {
+    "catalog": catalog_hashes,
+}
+
+
+def resolve(name: str, builtins: Dict[str, Callable]) -> Callable:
+    """Built-in function name, or "module:function"."""
+    if name in builtins:
+        return builtins[name]
+    module_name, _, function_name = name.partition(":")
+    if not function_name:
+        raise ValueError(f"unknown function {name!r} (use {', '.join(builtins)} or module:function)")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def resolve_implementation(name: str) -> Callable:
+    return resolve(name, IMPLEMENTATIONS)
+
+
+def resolve_hasher(name: str) -> Callable:
+    return resolve(name, HASHERS)
+
+
+# =============================================================================
+# CHECKS
+# =============================================================================
+
+def check_config() -> List[str]:
+    """The bot's CONFIG ranges and option lists against the website constants."""
+    config = bot.CONFIG
+    problems = []
+    expected = {
+        "rtp range": ((config["rtp_min"], config["rtp_max"]), (reference.RTP_MIN, reference.RTP_MAX)),
+        "normal range": ((config["normal_min"], config["normal_max"]), (reference.NORMAL_MIN, reference.NORMAL_MAX)),
+        "auto_options": (tuple(config["auto_options"]), reference.AUTO_OPTIONS),
+        "turbo_options count": (len(config["turbo_options"]), len(reference.TURBO_OPTIONS)),
+        "multipliers": (tuple(m["value"] for m in config["multipliers"]), reference.MULTIPLIER_VALUES),
+    }
+    for name, (got, want) in expected.items():
+        if got != want:
+            problems.append(f"CONFIG {name} = {got}, website uses {want}")
+    return problems
+
+
+def compare_hashes(hasher: Callable, game_ids: List[str]) -> List[Tuple]:
+    """
+    Hashes game ids with both implementations.
+
+    Returns:
+        (None, game_id, "hash", reference value, implementation value) per difference
+    """
+    got = hasher(game_ids) if game_ids else []
+    differences = []
+    for game_id, value in zip(game_ids, got):
+        expected = reference.string_to_hash(game_id)
+        if int(value) != expected:
+            differences.append((None, game_id, "hash", expected, int(value)))
+    return differences
+
+
+def compare(implementation: Callable, hasher: Callable, time_seed: int, games: List) -> List[Tuple]:
+    """
+    Evaluates one time seed with both implementations. Games given as game
+    id strings are hashed by `hasher` on the implementation side and by the
+    reference on the other; ints are used as hashes directly.
+
+    Returns:
+        (time_seed, game, field, reference value, implementation value) per difference
+    """
+    game_ids = [game for game in games if isinstance(game, str)]
+    hashed = iter(hasher(game_ids) if game_ids else [])
+    got_hashes = [int(next(hashed)) if isinstance(game, str) else game for game in games]
+    expected_hashes = [reference.string_to_hash(game) if isinstance(game, str) else game for game in games]
+    differences = [
+        (None, game, "hash", expected_hash, got_hash)
+        for game, expected_hash, got_hash in zip(games, expected_hashes, got_hashes)
+        if got_hash != expected_hash
+    ]
+
+    got = implementation(np.asarray(got_hashes, dtype=np.int64), time_seed)
+    for i, game in enumerate(games):
+        expected = reference.evaluate_game(expected_hashes[i], time_seed)
+        for field in reference.EVALUATION_FIELDS:
+            value = int(got[field][i])
+            if value != expected[field]:
+                differences.append((time_seed, game, field, expected[field], value))
+    return differences
+
+
+def check_golden(implementation: Callable, hasher: Callable) -> List[str]:
+    """Reference, implementation and hash function against the golden vectors."""
+    vectors = reference.load_golden_vectors()
+    problems = [f"reference: {problem}" for problem in reference.verify_golden_vectors(vectors)]
+    problems.extend(
+        f"hash: string_to_hash({game_id!r}) = {got}, expected {expected}"
+        for _, game_id, _, expected, got in compare_hashes(hasher, [s for s, _ in vectors["hashes"]])
+    )
+
+    fields = vectors["evaluations"]["fields"]
+    by_time_seed = defaultdict(list)
+    for row in vectors["evaluations"]["rows"]:
+        by_time_seed[row[0]].append(row)
+    for time_seed, rows in by_time_seed.items():
+        got = implementation(np.asarray([row[1] for row in rows], dtype=np.int64), time_seed)
+        for i, row in enumerate(rows):
+            for field, expected in zip(fields[2:], row[2:]):
+                if int(got[field][i]) != expected:
+                    problems.append(
+                        f"implementation: {field}(time_seed={time_seed}, hash={row[1]}) = {int(got[field][i])}, expected {expected}"
+                    )
+    return problems
+
+
+# =============================================================================
+# RANDOM INPUTS
+# =============================================================================
+
+def random_game_id(rng: random.Random) -> str:
+    name = "".join(rng.choices(GAME_ID_ALPHABET, k=rng.randint(1, 40)))
+    return rng.choice(GAME_ID_PROVIDERS) + name + rng.choice((".webp", ".png", ""))
+
+
+def random_time_seed(rng: random.Random) -> int:
+    if rng.random() < 0.75:
+        return rng.randint(*REALISTIC_TIME_SEEDS)
+    return rng.randint(0, 2**31 - 1)
+
+
+def random_games(rng: random.Random, count: int) -> List:
+    """Half random game ids, half hashes uniform over [0, 2^31] (abs(INT32_MIN) included)."""
+    return [random_game_id(rng) if rng.random() < 0.5 else rng.randint(0, 2**31) for _ in range(count)]
+
+
+_implementation = None
+_hasher = None
+
+
+def _init_worker(name: str, hasher_name: str):
+    global _implementation, _hasher
+    _implementation = resolve_implementation(name)
+    _hasher = resolve_hasher(hasher_name)
+
+
+def fuzz_chunk(args: Tuple[int, int]) -> Tuple[int, List[Tuple]]:
+    """
+    Checks `games` random games drawn from a seeded generator.
+
+    Returns:
+        (games checked, differences found)
+    """
+    chunk_seed, games = args
+    rng = random.Random(chunk_seed)
+    differences = []
+    checked = 0
+    while checked < games:
+        count = min(GAMES_PER_TIME_SEED, games - checked)
+        differences.extend(compare(_implementation, _hasher, random_time_seed(rng), random_games(rng, count)))
+        checked += count
+    return checked, differences[:MAX_REPORTED]
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--impl", default="batch", help="batch, scalar or module:function (default: %(default)s)")
+    parser.add_argument("--hash", default="catalog", help="catalog or module:function (default: %(default)s)")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="random games to check (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="master seed (default: random, printed)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args()
+
+    implementation = resolve_implementation(args.impl)
+    hasher = resolve_hasher(args.hash)
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    print(f"🔍 Implementação: {args.impl} | hash: {args.hash} | jogos aleatórios: {args.count:,} | seed: {seed}")
+
+    problems = check_config() + check_golden(implementation, hasher)
+    if problems:
+        for problem in problems[:MAX_REPORTED]:
+            print(f"❌ {problem}")
+        print(f"❌ {len(problems)} divergência(s) nos vetores golden / configuração")
+        return 1
+    print("✅ Vetores golden e configuração conferem")
+
+    chunks = [
+        (seed * 1_000_003 + i, min(CHUNK_GAMES, args.count - start))
+        for i, start in enumerate(range(0, args.count, CHUNK_GAMES))
+    ]
+    started = time.perf_counter()
+    checked = 0
+    differences = []
+    with Pool(args.workers, initializer=_init_worker, initargs=(args.impl, args.hash)) as pool:
+        for games, found in pool.imap_unordered(fuzz_chunk, chunks):
+            checked += games
+            differences.extend(found)
+            if len(differences) >= MAX_REPORTED:
+                pool.terminate()
+                break
+    elapsed = time.perf_counter() - started
+
+    if differences:
+        print(f"❌ Divergências encontradas após {checked:,} jogos (reproduza com --seed {seed}):")
+        for time_seed, game, field, expected, got in differences[:MAX_REPORTED]:
+            inputs = f"game_id={game!r}" if isinstance(game, str) else f"hash={game}"
+            if time_seed is not None:
+                inputs = f"time_seed={time_seed}, {inputs}"
+            print(f"   • {field}({inputs}): referência {expected}, implementação {got}")
+        return 1
+    print(f"✅ {checked:,} jogos conferem com a referência ({elapsed:.1f}s, {checked / elapsed:,.0f} jogos/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,7 @@ Features:
 - Only shows games with RTP >= 80%
 - Top 15 games from the grid (sorted by popularity)
 - One picture + descriptions for all qualifying games
+- Whole catalog evaluated in one vectorized NumPy pass
 
 Author: RTP Bot System
 Version: 2.0 - Website Synchronized
@@ -17,13 +18,39 @@ Version: 2.0 - Website Synchronized
 """
 
 import asyncio
+import atexit
+import bisect
 import math
-import ctypes
+import hashlib
+import json
+import logging
+import logging.handlers
 import os
+import queue
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
+from urllib.parse import parse_qs
+import numpy as np
 import pytz
-from telegram import Bot, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram import Bot, InlineKeyboardMarkup, InlineKeyboardButton, InputMediaPhoto
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+from telegram.request import HTTPXRequest
+
+import rtp_reference
+from rtp_reference import reduce_seed, seeded_random, string_to_hash
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional: without it the original images are sent
+    Image = None
 
 # =============================================================================
 # BOT CONFIGURATION
@@ -33,6 +60,11 @@ from telegram import Bot, InlineKeyboardMarkup, InlineKeyboardButton
 # =============================================================================
 
 BOT_TOKEN = os.getenv("BOT_TOKEN", "7735558077:AAErlE2HtjPR81N-PCmJrvp6CYMCV33n_No")
+
+# Bot API endpoint; point it at fake_telegram_server.py for load tests
+# (e.g. http://127.0.0.1:8081/bot)
+TELEGRAM_BASE_URL = os.getenv("TELEGRAM_BASE_URL", "https://api.telegram.org/bot")
+
 LINK_URL = os.getenv("LINK_URL", "https://t.me/POPREDE_bonus_Bot")
 PLAY_URL = os.getenv("PLAY_URL", "https://popduqo.com/?ch=23890")
 
@@ -40,12 +72,76 @@ PLAY_URL = os.getenv("PLAY_URL", "https://popduqo.com/?ch=23890")
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 IMAGE_BASE_PATH = os.path.join(SCRIPT_DIR, "images") + os.sep
 
+# Local cache directory for generated data (lookup tables, etc.)
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(SCRIPT_DIR, ".cache"))
+
 # CDN Base URL (same as website)
 CDN_BASE = "https://poprtp88.github.io/TEST-RTP-BARU-2"
 
 # São Paulo timezone (Brazil stopped DST in 2019, always UTC-3)
 SAO_PAULO_TZ = pytz.timezone("America/Sao_Paulo")
 
+# =============================================================================
+# LOGGING - STRUCTURED, NON-BLOCKING
+# Log calls only put the record on a queue; a background thread formats it
+# (one JSON object per line) and writes it to stdout, so slow log collectors
+# never stall the event loop. The entry point calls setup_logging(); importing
+# the module leaves logging alone.
+# =============================================================================
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# "json" for log collectors, "text" for plain messages when running locally
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+log = logging.getLogger("rtp_bot")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON line. Structured values passed as
+    extra={"fields": {...}} are merged into the object.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, pytz.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> logging.handlers.QueueListener:
+    """
+    Routes the bot's logger through a queue to a stdout writer thread.
+    
+    Args:
+        level: Log level name ("DEBUG", "INFO", ...)
+        fmt: "json" or "text"
+    
+    Returns:
+        The running QueueListener (stopped and flushed at exit)
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter("%(message)s"))
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    log.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    log.setLevel(level)
+    log.propagate = False
+    return listener
+
 # =============================================================================
 # RTP CONFIGURATION (Must match website exactly)
 # =============================================================================
@@ -72,464 +168,582 @@ CONFIG = {
 }
 
 # =============================================================================
-# EXPANDED GAMES LIST - 100 PG SOFT + 100 PRAGMATIC PLAY GAMES
+# GAMES LIST AND CHANNEL CONFIGURATION - catalog.json
+# =============================================================================
+# The games list and the channels live in catalog.json (CATALOG_FILE). It is
+# loaded on first use and reloaded while the bot runs whenever it changes,
+# so adding or removing games/channels does not need a redeploy.
+#
+# "games": {"game_id", "display_name", "provider", "image_file"}
 # The game_id format MUST match website exactly: "Provider/ImageName"
 # This ensures RTP calculations are IDENTICAL to the website!
+#
+# "channels": {"channel_id", "provider", "name", "album"}
+# Each channel can be configured to show only specific providers
+# Set provider to "ALL" to show all games, or specify provider name
+# Set album to true to send the games as one photo album (one API call)
+# followed by a short message carrying the bonus button
+# Optional filters: "rtp_min", "rtp_max", "max_games" and
+# "multiplier_types" (e.g. ["high"]); "provider" may also be a list
+#
+# Example "ALL" channel that shows all games:
+#   {"channel_id": "@ALL_GAMES_CHANNEL", "provider": "ALL", "name": "All Games Channel", "album": true}
+#
+# Several brands can run in one process with "tenants" instead of "channels".
+# Each tenant has its own bot, channels and defaults; all of them share the
+# same per-interval RTP computation:
+#   "tenants": [{
+#       "name": "brand_a",
+#       "bot_token_env": "BRAND_A_BOT_TOKEN",   (or "bot_token")
+#       "link_url": "https://t.me/...", "play_url": "https://...",
+#       "rtp_threshold": 85, "max_games": 3,
+#       "buttons": [{"text": "🎮 JOGAR", "url": "{play_url}"}],
+#       "base_url": "http://...",               (optional, default TELEGRAM_BASE_URL)
+#       "channels": [...]
+#   }]
+# Without "tenants", "channels" belongs to the "default" tenant, which uses
+# BOT_TOKEN, LINK_URL and PLAY_URL.
 # =============================================================================
 
+CATALOG_FILE = os.getenv("CATALOG_FILE", os.path.join(SCRIPT_DIR, "catalog.json"))
+
+# How often catalog.json is checked for changes (seconds)
+CATALOG_POLL_SECONDS = 10
+
 # Maximum games to show per notification
 MAX_GAMES_PER_NOTIFICATION = 5
 
-# PG SOFT Games (100 games)
-PG_SOFT_GAMES = [
-    # Named Fortune Games (7)
-    {"game_id": "PG SOFT/FORTUNE_1.webp", "display_name": "🐰 Fortune Rabbit", "provider": "PG SOFT", "image_file": "FORTUNE_1.webp"},
-    {"game_id": "PG SOFT/FORTUNE_2.webp", "display_name": "🐍 Fortune Snake", "provider": "PG SOFT", "image_file": "FORTUNE_2.webp"},
-    {"game_id": "PG SOFT/FORTUNE_3.webp", "display_name": "🐅 Fortune Tiger", "provider": "PG SOFT", "image_file": "FORTUNE_3.webp"},
-    {"game_id": "PG SOFT/FORTUNE_4.webp", "display_name": "💰 Wild Heist Cashout", "provider": "PG SOFT", "image_file": "FORTUNE_4.webp"},
-    {"game_id": "PG SOFT/FORTUNE_5.webp", "display_name": "🐉 Fortune Dragon", "provider": "PG SOFT", "image_file": "FORTUNE_5.webp"},
-    {"game_id": "PG SOFT/FORTUNE_6.webp", "display_name": "🐂 Fortune OX", "provider": "PG SOFT", "image_file": "FORTUNE_6.webp"},
-    {"game_id": "PG SOFT/FORTUNE_7.webp", "display_name": "🐭 Fortune Mouse", "provider": "PG SOFT", "image_file": "FORTUNE_7.webp"},
-    # Hash-named PG SOFT games (93 more to reach 100)
-    {"game_id": "PG SOFT/00a551e721df0397dec7670b58bdd51707b88f6944451c47fd929e8bfbb97083.webp", "display_name": "🎰 PG Slot 01", "provider": "PG SOFT", "image_file": "00a551e721df0397dec7670b58bdd51707b88f6944451c47fd929e8bfbb97083.webp"},
-    {"game_id": "PG SOFT/0383908af3539ad060baa90833f03c15742031a906d1c104445d5cdd78e7cdf1.webp", "display_name": "🎰 PG Slot 02", "provider": "PG SOFT", "image_file": "0383908af3539ad060baa90833f03c15742031a906d1c104445d5cdd78e7cdf1.webp"},
-    {"game_id": "PG SOFT/0783fd411d9e05082875f6a2a09c52ae2cc82e1449b00f7850d8ae37f3d3d2bb.webp", "display_name": "🎰 PG Slot 03", "provider": "PG SOFT", "image_file": "0783fd411d9e05082875f6a2a09c52ae2cc82e1449b00f7850d8ae37f3d3d2bb.webp"},
-    {"game_id": "PG SOFT/0e266d67bbb5dd084ec7f70bc758b502a52a258692009e6544c2bb61267f7468.webp", "display_name": "🎰 PG Slot 04", "provider": "PG SOFT", "image_file": "0e266d67bbb5dd084ec7f70bc758b502a52a258692009e6544c2bb61267f7468.webp"},
-    {"game_id": "PG SOFT/0f471a2be468714d161c9051fb7ff57179252d199f98e92d1e967be9786e2017.webp", "display_name": "🎰 PG Slot 05", "provider": "PG SOFT", "image_file": "0f471a2be468714d161c9051fb7ff57179252d199f98e92d1e967be9786e2017.webp"},
-    {"game_id": "PG SOFT/0f7a0139c997fb49499bdd5fe6d9b3c0b53f839770b12be6fa6467e5cd3d84e2.webp", "display_name": "🎰 PG Slot 06", "provider": "PG SOFT", "image_file": "0f7a0139c997fb49499bdd5fe6d9b3c0b53f839770b12be6fa6467e5cd3d84e2.webp"},
-    {"game_id": "PG SOFT/15c15dad7ed21ae72991e66194d0a24651f27f34fe9ca3a32e9ee6aea2c4729e.webp", "display_name": "🎰 PG Slot 07", "provider": "PG SOFT", "image_file": "15c15dad7ed21ae72991e66194d0a24651f27f34fe9ca3a32e9ee6aea2c4729e.webp"},
-    {"game_id": "PG SOFT/1663801e30484b58dd67ea075ae766eb74bb0943f5bae1ea4d5e6c7ac112fb4c.webp", "display_name": "🎰 PG Slot 08", "provider": "PG SOFT", "image_file": "1663801e30484b58dd67ea075ae766eb74bb0943f5bae1ea4d5e6c7ac112fb4c.webp"},
-    {"game_id": "PG SOFT/18a559e861fb310540293ee4191f8d8fd0df4febab7453e80e885f714c6b5bb3.webp", "display_name": "🎰 PG Slot 09", "provider": "PG SOFT", "image_file": "18a559e861fb310540293ee4191f8d8fd0df4febab7453e80e885f714c6b5bb3.webp"},
-    {"game_id": "PG SOFT/19b3440364161ede8c85c9cbb3bbe39f0adb8bf53d8ae7ffe4da1a622c340997.webp", "display_name": "🎰 PG Slot 10", "provider": "PG SOFT", "image_file": "19b3440364161ede8c85c9cbb3bbe39f0adb8bf53d8ae7ffe4da1a622c340997.webp"},
-    {"game_id": "PG SOFT/1e0ff105d1f1d9ffca7b826fe3d84d63f24a216f060b2783b5077a3c002f07ce.webp", "display_name": "🎰 PG Slot 11", "provider": "PG SOFT", "image_file": "1e0ff105d1f1d9ffca7b826fe3d84d63f24a216f060b2783b5077a3c002f07ce.webp"},
-    {"game_id": "PG SOFT/1e5d818e614417f723e793b377c8988b531be669d5916f0066090dcfb547dc7a.webp", "display_name": "🎰 PG Slot 12", "provider": "PG SOFT", "image_file": "1e5d818e614417f723e793b377c8988b531be669d5916f0066090dcfb547dc7a.webp"},
-    {"game_id": "PG SOFT/206c543474a411164b4955b204fa7ec3b0a28dd260207e9f49e66f42bfa4fc61.webp", "display_name": "🎰 PG Slot 13", "provider": "PG SOFT", "image_file": "206c543474a411164b4955b204fa7ec3b0a28dd260207e9f49e66f42bfa4fc61.webp"},
-    {"game_id": "PG SOFT/231e682dc941d4fee28c159217a85b849a5644174d04a5e7e6cca53c7ffc6559.webp", "display_name": "🎰 PG Slot 14", "provider": "PG SOFT", "image_file": "231e682dc941d4fee28c159217a85b849a5644174d04a5e7e6cca53c7ffc6559.webp"},
-    {"game_id": "PG SOFT/27992dc65d125e58b650a44db23a5564174d9cc4b6193498507c6b43340f9cfe.webp", "display_name": "🎰 PG Slot 15", "provider": "PG SOFT", "image_file": "27992dc65d125e58b650a44db23a5564174d9cc4b6193498507c6b43340f9cfe.webp"},
-    {"game_id": "PG SOFT/28689642bb26ac2711280fd846841fb70c02d4df0ac32215d1ec7ee47287b0c3.webp", "display_name": "🎰 PG Slot 16", "provider": "PG SOFT", "image_file": "28689642bb26ac2711280fd846841fb70c02d4df0ac32215d1ec7ee47287b0c3.webp"},
-    {"game_id": "PG SOFT/2c7bccf6b837082ce28c2bc78a83c4366f0ba041700059d092bccb9bd8e66219.webp", "display_name": "🎰 PG Slot 17", "provider": "PG SOFT", "image_file": "2c7bccf6b837082ce28c2bc78a83c4366f0ba041700059d092bccb9bd8e66219.webp"},
-    {"game_id": "PG SOFT/2e34322c98847518039606f308d1387726496d8175fb7f0af65e49209818bf5b.webp", "display_name": "🎰 PG Slot 18", "provider": "PG SOFT", "image_file": "2e34322c98847518039606f308d1387726496d8175fb7f0af65e49209818bf5b.webp"},
-    {"game_id": "PG SOFT/304f08dcb2037f6f48c83d0878bb9495d044019ebe64dae192312b8316921e71.webp", "display_name": "🎰 PG Slot 19", "provider": "PG SOFT", "image_file": "304f08dcb2037f6f48c83d0878bb9495d044019ebe64dae192312b8316921e71.webp"},
-    {"game_id": "PG SOFT/305c9006b8580e1ed4fd44831fdd6fdcd75308ee1d5e206a4765865c7edbac89.webp", "display_name": "🎰 PG Slot 20", "provider": "PG SOFT", "image_file": "305c9006b8580e1ed4fd44831fdd6fdcd75308ee1d5e206a4765865c7edbac89.webp"},
-    {"game_id": "PG SOFT/3086b80ed6350fbaeaf265007a8db67018e45bf577f85b46b69e7ab91204b6c1.webp", "display_name": "🎰 PG Slot 21", "provider": "PG SOFT", "image_file": "3086b80ed6350fbaeaf265007a8db67018e45bf577f85b46b69e7ab91204b6c1.webp"},
-    {"game_id": "PG SOFT/3165842615badb659169b005972d3322c179681b9fa40ed0bd4d4b38240039ff.webp", "display_name": "🎰 PG Slot 22", "provider": "PG SOFT", "image_file": "3165842615badb659169b005972d3322c179681b9fa40ed0bd4d4b38240039ff.webp"},
-    {"game_id": "PG SOFT/36a56c751761daafa24e39f299b9c7514db1e38a6c2974ebe5d8fb0d15c8f974.webp", "display_name": "🎰 PG Slot 23", "provider": "PG SOFT", "image_file": "36a56c751761daafa24e39f299b9c7514db1e38a6c2974ebe5d8fb0d15c8f974.webp"},
-    {"game_id": "PG SOFT/36b789a430850114370377fb0a3157a937c9f4537b87e4f51859ec2e3b31e4ca.webp", "display_name": "🎰 PG Slot 24", "provider": "PG SOFT", "image_file": "36b789a430850114370377fb0a3157a937c9f4537b87e4f51859ec2e3b31e4ca.webp"},
-    {"game_id": "PG SOFT/44171610fd2b532cf0359fabc730b90ba9cdc6ce83e5cfc693d28c4118544ff9.webp", "display_name": "🎰 PG Slot 25", "provider": "PG SOFT", "image_file": "44171610fd2b532cf0359fabc730b90ba9cdc6ce83e5cfc693d28c4118544ff9.webp"},
-    {"game_id": "PG SOFT/4ad6cd019f1a59b142d165ce9bfe46bd082de2e22729d01c5a8072b30a32e6b5.webp", "display_name": "🎰 PG Slot 26", "provider": "PG SOFT", "image_file": "4ad6cd019f1a59b142d165ce9bfe46bd082de2e22729d01c5a8072b30a32e6b5.webp"},
-    {"game_id": "PG SOFT/4bef33625ecea66eaec5cbba7af3f87cc0ccd9cf4f5de447f912bc4438f74c77.webp", "display_name": "🎰 PG Slot 27", "provider": "PG SOFT", "image_file": "4bef33625ecea66eaec5cbba7af3f87cc0ccd9cf4f5de447f912bc4438f74c77.webp"},
-    {"game_id": "PG SOFT/4eef0671e220f626402d069eeac75402c276c4d8d2447276921bd23a28127930.webp", "display_name": "🎰 PG Slot 28", "provider": "PG SOFT", "image_file": "4eef0671e220f626402d069eeac75402c276c4d8d2447276921bd23a28127930.webp"},
-    {"game_id": "PG SOFT/501cfd29c5161aaebc4e74a29a619689d55cf59c04f8ba5450e08fd86e5341c4.webp", "display_name": "🎰 PG Slot 29", "provider": "PG SOFT", "image_file": "501cfd29c5161aaebc4e74a29a619689d55cf59c04f8ba5450e08fd86e5341c4.webp"},
-    {"game_id": "PG SOFT/51ac0bac746b4cdd135084f85b6e1907ff5a0bd67788ba29e2259119a13753d1.webp", "display_name": "🎰 PG Slot 30", "provider": "PG SOFT", "image_file": "51ac0bac746b4cdd135084f85b6e1907ff5a0bd67788ba29e2259119a13753d1.webp"},
-    {"game_id": "PG SOFT/5767d78a5dad829da3696033c52703effadaeecc63368976a9c819abef7e316a.webp", "display_name": "🎰 PG Slot 31", "provider": "PG SOFT", "image_file": "5767d78a5dad829da3696033c52703effadaeecc63368976a9c819abef7e316a.webp"},
-    {"game_id": "PG SOFT/5df44a36f199216628bd6e6a29e2c100af4792aec54412eb4243293c98685d44.webp", "display_name": "🎰 PG Slot 32", "provider": "PG SOFT", "image_file": "5df44a36f199216628bd6e6a29e2c100af4792aec54412eb4243293c98685d44.webp"},
-    {"game_id": "PG SOFT/688e084e49eff7f1ac0db6bb8d947a22b6406604aacfd85749ec163c7c2cbc52.webp", "display_name": "🎰 PG Slot 33", "provider": "PG SOFT", "image_file": "688e084e49eff7f1ac0db6bb8d947a22b6406604aacfd85749ec163c7c2cbc52.webp"},
-    {"game_id": "PG SOFT/6d970637c00b524fb7374ae49bb4cb81b8bca04e970822d9b20dc4fc2f3f9342.webp", "display_name": "🎰 PG Slot 34", "provider": "PG SOFT", "image_file": "6d970637c00b524fb7374ae49bb4cb81b8bca04e970822d9b20dc4fc2f3f9342.webp"},
-    {"game_id": "PG SOFT/72cdaf43de85c8a1f96b81d590d9917d5c5dd559e3cc105654589fddc581abad.webp", "display_name": "🎰 PG Slot 35", "provider": "PG SOFT", "image_file": "72cdaf43de85c8a1f96b81d590d9917d5c5dd559e3cc105654589fddc581abad.webp"},
-    {"game_id": "PG SOFT/786b1ff57f062d116e6bbc7a5a64a071c2cc33762540d4fe88537d281e9d362a.webp", "display_name": "🎰 PG Slot 36", "provider": "PG SOFT", "image_file": "786b1ff57f062d116e6bbc7a5a64a071c2cc33762540d4fe88537d281e9d362a.webp"},
-    {"game_id": "PG SOFT/7c31008ca65f8b938d44c6dd4f37083bf4d70eadfd1361d00100bd9849c64886.webp", "display_name": "🎰 PG Slot 37", "provider": "PG SOFT", "image_file": "7c31008ca65f8b938d44c6dd4f37083bf4d70eadfd1361d00100bd9849c64886.webp"},
-    {"game_id": "PG SOFT/7dbec5678181612dc2ea2257b42e7244836a24f7758cb48786bd59dd6cde0d8b.webp", "display_name": "🎰 PG Slot 38", "provider": "PG SOFT", "image_file": "7dbec5678181612dc2ea2257b42e7244836a24f7758cb48786bd59dd6cde0d8b.webp"},
-    {"game_id": "PG SOFT/81371649118a5aff0f7a48e70b6e70a88276831fbbb8121ede76b0700b73c24a.webp", "display_name": "🎰 PG Slot 39", "provider": "PG SOFT", "image_file": "81371649118a5aff0f7a48e70b6e70a88276831fbbb8121ede76b0700b73c24a.webp"},
-    {"game_id": "PG SOFT/8668d1bee3eb2776c5182e32e69134244e75100e8431617d2974ce3bd2059434.webp", "display_name": "🎰 PG Slot 40", "provider": "PG SOFT", "image_file": "8668d1bee3eb2776c5182e32e69134244e75100e8431617d2974ce3bd2059434.webp"},
-    {"game_id": "PG SOFT/8693e6eab04ef6966315f076752f80469a8ee938e01adb247bea3475e64955ef.webp", "display_name": "🎰 PG Slot 41", "provider": "PG SOFT", "image_file": "8693e6eab04ef6966315f076752f80469a8ee938e01adb247bea3475e64955ef.webp"},
-    {"game_id": "PG SOFT/888b90ccd4249552b071c02b9cc37dca8ed19433f45c81ba4a2a6b2d34c2cbd7.webp", "display_name": "🎰 PG Slot 42", "provider": "PG SOFT", "image_file": "888b90ccd4249552b071c02b9cc37dca8ed19433f45c81ba4a2a6b2d34c2cbd7.webp"},
-    {"game_id": "PG SOFT/8b344c6ddca073c38a6ab5eead9a076b7d71d06d7675f76cd29c1541b465a627.webp", "display_name": "🎰 PG Slot 43", "provider": "PG SOFT", "image_file": "8b344c6ddca073c38a6ab5eead9a076b7d71d06d7675f76cd29c1541b465a627.webp"},
-    {"game_id": "PG SOFT/8cdd8efbd41092eb47bd902ef4a2b77f4a83b1338b04dbb9f4ab3e004387e55f.webp", "display_name": "🎰 PG Slot 44", "provider": "PG SOFT", "image_file": "8cdd8efbd41092eb47bd902ef4a2b77f4a83b1338b04dbb9f4ab3e004387e55f.webp"},
-    {"game_id": "PG SOFT/8d55964f5a2914be1a72e528febe099432c867db6bcda7c45477c04644ff8722.webp", "display_name": "🎰 PG Slot 45", "provider": "PG SOFT", "image_file": "8d55964f5a2914be1a72e528febe099432c867db6bcda7c45477c04644ff8722.webp"},
-    {"game_id": "PG SOFT/9687532f7e0035f3acec8dff4f8f19a785178e9d83a30f8710913bad8252352d.webp", "display_name": "🎰 PG Slot 46", "provider": "PG SOFT", "image_file": "9687532f7e0035f3acec8dff4f8f19a785178e9d83a30f8710913bad8252352d.webp"},
-    {"game_id": "PG SOFT/9fd67b536b36a8bb524440f8c51844bff116538ccf53cd4324ac7f0b07c6e2eb.webp", "display_name": "🎰 PG Slot 47", "provider": "PG SOFT", "image_file": "9fd67b536b36a8bb524440f8c51844bff116538ccf53cd4324ac7f0b07c6e2eb.webp"},
-    {"game_id": "PG SOFT/a58269307024a4b61d36d2ade5ae82ae20d5d34ab118c52ae1b4a6148e20a2cb.webp", "display_name": "🎰 PG Slot 48", "provider": "PG SOFT", "image_file": "a58269307024a4b61d36d2ade5ae82ae20d5d34ab118c52ae1b4a6148e20a2cb.webp"},
-    {"game_id": "PG SOFT/a6e4218c56f254dbc12e2d124f5af070b42247634aa4d045489349218ee5d580.webp", "display_name": "🎰 PG Slot 49", "provider": "PG SOFT", "image_file": "a6e4218c56f254dbc12e2d124f5af070b42247634aa4d045489349218ee5d580.webp"},
-    {"game_id": "PG SOFT/aa68cc308dd757091dcd668d3a6c4344b5fe1be285b36953426e6d0ae239274a.webp", "display_name": "🎰 PG Slot 50", "provider": "PG SOFT", "image_file": "aa68cc308dd757091dcd668d3a6c4344b5fe1be285b36953426e6d0ae239274a.webp"},
-    {"game_id": "PG SOFT/ab71c0e54d919a05caaf76be86bb5f46743791165c110e1790b3baea94e9839c.webp", "display_name": "🎰 PG Slot 51", "provider": "PG SOFT", "image_file": "ab71c0e54d919a05caaf76be86bb5f46743791165c110e1790b3baea94e9839c.webp"},
-    {"game_id": "PG SOFT/b12988a7565b01014829ad93b4e7019bf75ab3186266c6acfb52139f505f646c.webp", "display_name": "🎰 PG Slot 52", "provider": "PG SOFT", "image_file": "b12988a7565b01014829ad93b4e7019bf75ab3186266c6acfb52139f505f646c.webp"},
-    {"game_id": "PG SOFT/b2ea1e9d093897e77ee5cf107213b22591b60a8d221080f698b94718bce53f28.webp", "display_name": "🎰 PG Slot 53", "provider": "PG SOFT", "image_file": "b2ea1e9d093897e77ee5cf107213b22591b60a8d221080f698b94718bce53f28.webp"},
-    {"game_id": "PG SOFT/b4de37d456458c68a628594df3a05c454e5ec4ae61eb7526a5a71fc91f7380af.webp", "display_name": "🎰 PG Slot 54", "provider": "PG SOFT", "image_file": "b4de37d456458c68a628594df3a05c454e5ec4ae61eb7526a5a71fc91f7380af.webp"},
-    {"game_id": "PG SOFT/b733ac0b664b9b0b7aa1faa4ec788a998d79353286062733d19b45f93e80c6de.webp", "display_name": "🎰 PG Slot 55", "provider": "PG SOFT", "image_file": "b733ac0b664b9b0b7aa1faa4ec788a998d79353286062733d19b45f93e80c6de.webp"},
-    {"game_id": "PG SOFT/bf60e4e05d738e2cbfbc1b42a46664c3b50e194564ddf63b2350d70f7ec98277.webp", "display_name": "🎰 PG Slot 56", "provider": "PG SOFT", "image_file": "bf60e4e05d738e2cbfbc1b42a46664c3b50e194564ddf63b2350d70f7ec98277.webp"},
-    {"game_id": "PG SOFT/bfffecea030a24a526007bbcfc231774dcb7560b421ceef1e9917ce7736ea6bc.webp", "display_name": "🎰 PG Slot 57", "provider": "PG SOFT", "image_file": "bfffecea030a24a526007bbcfc231774dcb7560b421ceef1e9917ce7736ea6bc.webp"},
-    {"game_id": "PG SOFT/c227b1bb327a8fd31e90e8eaf1bdf7b61c39f8fc05afa73222c7079ac3f8e6a0.webp", "display_name": "🎰 PG Slot 58", "provider": "PG SOFT", "image_file": "c227b1bb327a8fd31e90e8eaf1bdf7b61c39f8fc05afa73222c7079ac3f8e6a0.webp"},
-    {"game_id": "PG SOFT/c5005543fef7245219afa13116b2ff09d9ab3b5cb93f1f299c14fe85141d4895.webp", "display_name": "🎰 PG Slot 59", "provider": "PG SOFT", "image_file": "c5005543fef7245219afa13116b2ff09d9ab3b5cb93f1f299c14fe85141d4895.webp"},
-    {"game_id": "PG SOFT/cba13601a1b83715abda91a5a6195319192b5b288c878966b9d5bd4a1a87fae8.webp", "display_name": "🎰 PG Slot 60", "provider": "PG SOFT", "image_file": "cba13601a1b83715abda91a5a6195319192b5b288c878966b9d5bd4a1a87fae8.webp"},
-    {"game_id": "PG SOFT/d10245e2aab6d911a4e3cbb5e3a1463f426313725b4f96cde9879ff4b279a02b.webp", "display_name": "🎰 PG Slot 61", "provider": "PG SOFT", "image_file": "d10245e2aab6d911a4e3cbb5e3a1463f426313725b4f96cde9879ff4b279a02b.webp"},
-    {"game_id": "PG SOFT/d3710a8bf2e94dc80524b5b1d8a185f31d414a0eaf9dbdd6b997d2de2a2e5e9a.webp", "display_name": "🎰 PG Slot 62", "provider": "PG SOFT", "image_file": "d3710a8bf2e94dc80524b5b1d8a185f31d414a0eaf9dbdd6b997d2de2a2e5e9a.webp"},
-    {"game_id": "PG SOFT/dd87c3e26e691394644f73fd585a6110b59f8585f080bbd1e472dbfccf991c26.webp", "display_name": "🎰 PG Slot 63", "provider": "PG SOFT", "image_file": "dd87c3e26e691394644f73fd585a6110b59f8585f080bbd1e472dbfccf991c26.webp"},
-    {"game_id": "PG SOFT/e0ba91c17c2d2b2af5bae040c981e4531ac94406797d5427f199e17ac9eba05c.webp", "display_name": "🎰 PG Slot 64", "provider": "PG SOFT", "image_file": "e0ba91c17c2d2b2af5bae040c981e4531ac94406797d5427f199e17ac9eba05c.webp"},
-    {"game_id": "PG SOFT/e3aff371bba17c1db7572ff07512aafb8c4ae473f0f0d95d1461e7daf319fe1a.webp", "display_name": "🎰 PG Slot 65", "provider": "PG SOFT", "image_file": "e3aff371bba17c1db7572ff07512aafb8c4ae473f0f0d95d1461e7daf319fe1a.webp"},
-    {"game_id": "PG SOFT/e682e8740cb65b3620c148693d1aa4cdd90d0b3f1690b98f697fb7e6b072e0ef.webp", "display_name": "🎰 PG Slot 66", "provider": "PG SOFT", "image_file": "e682e8740cb65b3620c148693d1aa4cdd90d0b3f1690b98f697fb7e6b072e0ef.webp"},
-    {"game_id": "PG SOFT/e7f15a5d4fb512510ce01f7473211aebdbdf5f77545d0091003f1e1335a317bf.webp", "display_name": "🎰 PG Slot 67", "provider": "PG SOFT", "image_file": "e7f15a5d4fb512510ce01f7473211aebdbdf5f77545d0091003f1e1335a317bf.webp"},
-    {"game_id": "PG SOFT/f1048986d68bd8492a6ad219afd5f3137561bc8a772594b9deb8a058903d6188.webp", "display_name": "🎰 PG Slot 68", "provider": "PG SOFT", "image_file": "f1048986d68bd8492a6ad219afd5f3137561bc8a772594b9deb8a058903d6188.webp"},
-    {"game_id": "PG SOFT/f2a4f2677fe5582eee5b8697294e0991027b0b98358828ee4bd6dce909b992a2.webp", "display_name": "🎰 PG Slot 69", "provider": "PG SOFT", "image_file": "f2a4f2677fe5582eee5b8697294e0991027b0b98358828ee4bd6dce909b992a2.webp"},
-    {"game_id": "PG SOFT/f2cf678febd959e953600562ec6549fd8cd58a882c65d1fd97ce892679fd12d7.webp", "display_name": "🎰 PG Slot 70", "provider": "PG SOFT", "image_file": "f2cf678febd959e953600562ec6549fd8cd58a882c65d1fd97ce892679fd12d7.webp"},
-    {"game_id": "PG SOFT/f2d40f0a0ede301a5ea6e1c21a7bd744d144ce4429240a20c362d50845b75fa6.webp", "display_name": "🎰 PG Slot 71", "provider": "PG SOFT", "image_file": "f2d40f0a0ede301a5ea6e1c21a7bd744d144ce4429240a20c362d50845b75fa6.webp"},
-    {"game_id": "PG SOFT/f8851c0c514b0ae10397f841dfd2b54f563dfd032a5bb23ed06294a3cadf3488.webp", "display_name": "🎰 PG Slot 72", "provider": "PG SOFT", "image_file": "f8851c0c514b0ae10397f841dfd2b54f563dfd032a5bb23ed06294a3cadf3488.webp"},
-    {"game_id": "PG SOFT/f90bde94d4c692be0656cb87f4a5b8f5aefae22994a9692bee7d27b752dc9b75.webp", "display_name": "🎰 PG Slot 73", "provider": "PG SOFT", "image_file": "f90bde94d4c692be0656cb87f4a5b8f5aefae22994a9692bee7d27b752dc9b75.webp"},
-    {"game_id": "PG SOFT/fd2b972e7879166ad09cd693a58ead3b062d5c1b7e598e39670b07729dac90ea.webp", "display_name": "🎰 PG Slot 74", "provider": "PG SOFT", "image_file": "fd2b972e7879166ad09cd693a58ead3b062d5c1b7e598e39670b07729dac90ea.webp"},
-    {"game_id": "PG SOFT/fda969baceb517b392506ce27e181e3f27a7a093c906e6a2b2080ea14eb9cde1.webp", "display_name": "🎰 PG Slot 75", "provider": "PG SOFT", "image_file": "fda969baceb517b392506ce27e181e3f27a7a093c906e6a2b2080ea14eb9cde1.webp"},
-]
-
-# Pragmatic Play Games (100 games)
-PRAGMATIC_GAMES = [
-    # Named Popular Games (12)
-    {"game_id": "Pragmatic Play/OLYMPUS.webp", "display_name": "⚡ Gates of Olympus", "provider": "PRAGMATIC PLAY", "image_file": "OLYMPUS.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_1.webp", "display_name": "🍓 Fruit Party", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_1.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_2.webp", "display_name": "🎄 Sugar Rush Xmas", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_2.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_3.webp", "display_name": "🐟 Big Bass Bonanza", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_3.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_4.webp", "display_name": "💎 Gems Bonanza", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_4.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_5.webp", "display_name": "🍬 Sweet Bonanza", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_5.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_6.webp", "display_name": "👸 Starlight Princess 1000", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_6.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_7.webp", "display_name": "⚡ Gates of Olympus SS", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_7.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_8.webp", "display_name": "⚡ Gates of Olympus 1000", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_8.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_9.webp", "display_name": "🎰 Popular Slot 9", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_9.webp"},
-    {"game_id": "Pragmatic Play/POPULAR_10.webp", "display_name": "🎰 Popular Slot 10", "provider": "PRAGMATIC PLAY", "image_file": "POPULAR_10.webp"},
-    # Hash-named Pragmatic Play games (88 more to reach 100)
-    {"game_id": "Pragmatic Play/01eb804c6f183be20037c9c767a8552f5c01a31351017717d7a49de4b4d43844.webp", "display_name": "🎲 PP Slot 01", "provider": "PRAGMATIC PLAY", "image_file": "01eb804c6f183be20037c9c767a8552f5c01a31351017717d7a49de4b4d43844.webp"},
-    {"game_id": "Pragmatic Play/0b269cceb05d0f0a368c87fc7d6412c77574a0414f451cb9b9c550c0b1381a2d.webp", "display_name": "🎲 PP Slot 02", "provider": "PRAGMATIC PLAY", "image_file": "0b269cceb05d0f0a368c87fc7d6412c77574a0414f451cb9b9c550c0b1381a2d.webp"},
-    {"game_id": "Pragmatic Play/0e12554e0954c76443375cdde490b4ee1ed170eaa7b157909675f8d683afee3c.webp", "display_name": "🎲 PP Slot 03", "provider": "PRAGMATIC PLAY", "image_file": "0e12554e0954c76443375cdde490b4ee1ed170eaa7b157909675f8d683afee3c.webp"},
-    {"game_id": "Pragmatic Play/0e544b224c23d04c0d9677a65ada5d87749027cec56af4ce419b8a4bde1e31da.webp", "display_name": "🎲 PP Slot 04", "provider": "PRAGMATIC PLAY", "image_file": "0e544b224c23d04c0d9677a65ada5d87749027cec56af4ce419b8a4bde1e31da.webp"},
-    {"game_id": "Pragmatic Play/0eeb084b421e2e96d17fce52d9bd81ca5c7396e8035beaf30e84a8510169e1b4.webp", "display_name": "🎲 PP Slot 05", "provider": "PRAGMATIC PLAY", "image_file": "0eeb084b421e2e96d17fce52d9bd81ca5c7396e8035beaf30e84a8510169e1b4.webp"},
-    {"game_id": "Pragmatic Play/14d5410c6cf4c303d291262a10e949dc14b0ac2eca2a7a730b0401919c01358e.webp", "display_name": "🎲 PP Slot 06", "provider": "PRAGMATIC PLAY", "image_file": "14d5410c6cf4c303d291262a10e949dc14b0ac2eca2a7a730b0401919c01358e.webp"},
-    {"game_id": "Pragmatic Play/179ea3eb0e30b31875d7889466c65b52f028eb05d5153cab9e7aaddc1007e18c.webp", "display_name": "🎲 PP Slot 07", "provider": "PRAGMATIC PLAY", "image_file": "179ea3eb0e30b31875d7889466c65b52f028eb05d5153cab9e7aaddc1007e18c.webp"},
-    {"game_id": "Pragmatic Play/181ccd872939a7a23b955a3de13bb83cc2c923e20fe358c37f70d3f9af533e7e.webp", "display_name": "🎲 PP Slot 08", "provider": "PRAGMATIC PLAY", "image_file": "181ccd872939a7a23b955a3de13bb83cc2c923e20fe358c37f70d3f9af533e7e.webp"},
-    {"game_id": "Pragmatic Play/1b79532a239bd087f3c3ea7d3fc831587d03ee765a07fcb4b1ca104a055544b2.webp", "display_name": "🎲 PP Slot 09", "provider": "PRAGMATIC PLAY", "image_file": "1b79532a239bd087f3c3ea7d3fc831587d03ee765a07fcb4b1ca104a055544b2.webp"},
-    {"game_id": "Pragmatic Play/1f8f74ee5cdbcd77a1bdb882e6218ada8f29a21de3c77f7c028fe021e13ab4c5.webp", "display_name": "🎲 PP Slot 10", "provider": "PRAGMATIC PLAY", "image_file": "1f8f74ee5cdbcd77a1bdb882e6218ada8f29a21de3c77f7c028fe021e13ab4c5.webp"},
-    {"game_id": "Pragmatic Play/254be69fcde2ce6dc6ffda3319d00af47708a4285de4196cbf58e33139a5e552.webp", "display_name": "🎲 PP Slot 11", "provider": "PRAGMATIC PLAY", "image_file": "254be69fcde2ce6dc6ffda3319d00af47708a4285de4196cbf58e33139a5e552.webp"},
-    {"game_id": "Pragmatic Play/26802168dc5361febe0325f36cfc6af8a4b8535c8d6181961d4d6d948d4f5ee0.webp", "display_name": "🎲 PP Slot 12", "provider": "PRAGMATIC PLAY", "image_file": "26802168dc5361febe0325f36cfc6af8a4b8535c8d6181961d4d6d948d4f5ee0.webp"},
-    {"game_id": "Pragmatic Play/2859df47036f5c6d3f33fead0d26c9538046589c90d5b59621306d9e4e7bfcc0.webp", "display_name": "🎲 PP Slot 13", "provider": "PRAGMATIC PLAY", "image_file": "2859df47036f5c6d3f33fead0d26c9538046589c90d5b59621306d9e4e7bfcc0.webp"},
-    {"game_id": "Pragmatic Play/2cef1d4fc88f4f91ab86775d25b4cc3fed042af3ac81d641a559a4c517f3d9ef.webp", "display_name": "🎲 PP Slot 14", "provider": "PRAGMATIC PLAY", "image_file": "2cef1d4fc88f4f91ab86775d25b4cc3fed042af3ac81d641a559a4c517f3d9ef.webp"},
-    {"game_id": "Pragmatic Play/2e0fb5d8d19a26f8dabafc4076ce81c7eb653a613219a9fbb7cc44ec936ce993.webp", "display_name": "🎲 PP Slot 15", "provider": "PRAGMATIC PLAY", "image_file": "2e0fb5d8d19a26f8dabafc4076ce81c7eb653a613219a9fbb7cc44ec936ce993.webp"},
-    {"game_id": "Pragmatic Play/2e2aac1c67740ba49ee4a3e5c8e7e5397d5cdb477298db45b82916e2431e898b.webp", "display_name": "🎲 PP Slot 16", "provider": "PRAGMATIC PLAY", "image_file": "2e2aac1c67740ba49ee4a3e5c8e7e5397d5cdb477298db45b82916e2431e898b.webp"},
-    {"game_id": "Pragmatic Play/2f62c75034b67e30d769838612cc8cd0021eb2033acccf98c5e889cab847be05.webp", "display_name": "🎲 PP Slot 17", "provider": "PRAGMATIC PLAY", "image_file": "2f62c75034b67e30d769838612cc8cd0021eb2033acccf98c5e889cab847be05.webp"},
-    {"game_id": "Pragmatic Play/308ef68e4faa11eeea79ebe1a428a6b8e51681e4a5393a1ecfe3ba5db5adf196.webp", "display_name": "🎲 PP Slot 18", "provider": "PRAGMATIC PLAY", "image_file": "308ef68e4faa11eeea79ebe1a428a6b8e51681e4a5393a1ecfe3ba5db5adf196.webp"},
-    {"game_id": "Pragmatic Play/31704ea553666f0d08ef9edffe97996f367f38aa5bc32b280f305c2e25f96d57.webp", "display_name": "🎲 PP Slot 19", "provider": "PRAGMATIC PLAY", "image_file": "31704ea553666f0d08ef9edffe97996f367f38aa5bc32b280f305c2e25f96d57.webp"},
-    {"game_id": "Pragmatic Play/31d384b25e3d6c8704f84b3db84e31bceacf2ff16279fbcc25ad9e1bf55a7564.webp", "display_name": "🎲 PP Slot 20", "provider": "PRAGMATIC PLAY", "image_file": "31d384b25e3d6c8704f84b3db84e31bceacf2ff16279fbcc25ad9e1bf55a7564.webp"},
-    {"game_id": "Pragmatic Play/33ea7f514199523216fbb025355f8fdbb0a29bae063e751655e64c99743f16ac.webp", "display_name": "🎲 PP Slot 21", "provider": "PRAGMATIC PLAY", "image_file": "33ea7f514199523216fbb025355f8fdbb0a29bae063e751655e64c99743f16ac.webp"},
-    {"game_id": "Pragmatic Play/35ad71ac5000b070bf9d5ab332602ae69f8e22c8e1c8d24a1f4418a20bd18eda.webp", "display_name": "🎲 PP Slot 22", "provider": "PRAGMATIC PLAY", "image_file": "35ad71ac5000b070bf9d5ab332602ae69f8e22c8e1c8d24a1f4418a20bd18eda.webp"},
-    {"game_id": "Pragmatic Play/385705dc3bc1b5cff015de7acb337ccb6767a42e19ed12a5f70089b67361218d.webp", "display_name": "🎲 PP Slot 23", "provider": "PRAGMATIC PLAY", "image_file": "385705dc3bc1b5cff015de7acb337ccb6767a42e19ed12a5f70089b67361218d.webp"},
-    {"game_id": "Pragmatic Play/3ae0cb707dd63ad5ff0618d8a38ddf31cc74c371fc35a3644d0122b116252504.webp", "display_name": "🎲 PP Slot 24", "provider": "PRAGMATIC PLAY", "image_file": "3ae0cb707dd63ad5ff0618d8a38ddf31cc74c371fc35a3644d0122b116252504.webp"},
-    {"game_id": "Pragmatic Play/3b1de17d4f265d5ca39a883d651bd70a6b0a6859203e519d2f67e2598a4704aa.webp", "display_name": "🎲 PP Slot 25", "provider": "PRAGMATIC PLAY", "image_file": "3b1de17d4f265d5ca39a883d651bd70a6b0a6859203e519d2f67e2598a4704aa.webp"},
-    {"game_id": "Pragmatic Play/4751adaff8999760e52bbdc76cd404fc064ad198c8778cfb8fdfaae50b003f98.webp", "display_name": "🎲 PP Slot 26", "provider": "PRAGMATIC PLAY", "image_file": "4751adaff8999760e52bbdc76cd404fc064ad198c8778cfb8fdfaae50b003f98.webp"},
-    {"game_id": "Pragmatic Play/47638ff859b79996b7fdc10cd3b14360b708c640536acdc5ad5aa879c6fe7044.webp", "display_name": "🎲 PP Slot 27", "provider": "PRAGMATIC PLAY", "image_file": "47638ff859b79996b7fdc10cd3b14360b708c640536acdc5ad5aa879c6fe7044.webp"},
-    {"game_id": "Pragmatic Play/47b80f887282c2e75f1d398eb58823e9ecf0abd0bcf72d25f8c38e64a33a577e.webp", "display_name": "🎲 PP Slot 28", "provider": "PRAGMATIC PLAY", "image_file": "47b80f887282c2e75f1d398eb58823e9ecf0abd0bcf72d25f8c38e64a33a577e.webp"},
-    {"game_id": "Pragmatic Play/49950a8148c358e88455c78d8dd1abfbeb8d2dd31a7b7971f5515ae4091b6429.webp", "display_name": "🎲 PP Slot 29", "provider": "PRAGMATIC PLAY", "image_file": "49950a8148c358e88455c78d8dd1abfbeb8d2dd31a7b7971f5515ae4091b6429.webp"},
-    {"game_id": "Pragmatic Play/4a8e119e4fc2dfd38439f8adbd315ed6c377f5ea825bb293f28fabbe0a34cd38.webp", "display_name": "🎲 PP Slot 30", "provider": "PRAGMATIC PLAY", "image_file": "4a8e119e4fc2dfd38439f8adbd315ed6c377f5ea825bb293f28fabbe0a34cd38.webp"},
-    {"game_id": "Pragmatic Play/4af24920ee5ecb18c43c754e17f03803bb465100ae71123e40db0f34f10b0b84.webp", "display_name": "🎲 PP Slot 31", "provider": "PRAGMATIC PLAY", "image_file": "4af24920ee5ecb18c43c754e17f03803bb465100ae71123e40db0f34f10b0b84.webp"},
-    {"game_id": "Pragmatic Play/4cb1ded0004d8bfc0133b38ad1ba357ecb1610eae73c8587cd09d5aa4becaf98.webp", "display_name": "🎲 PP Slot 32", "provider": "PRAGMATIC PLAY", "image_file": "4cb1ded0004d8bfc0133b38ad1ba357ecb1610eae73c8587cd09d5aa4becaf98.webp"},
-    {"game_id": "Pragmatic Play/4d7d6df43e4183cb9f149bdb96f15da63de78efa52daeb7fc4cf0b2dc37608e9.webp", "display_name": "🎲 PP Slot 33", "provider": "PRAGMATIC PLAY", "image_file": "4d7d6df43e4183cb9f149bdb96f15da63de78efa52daeb7fc4cf0b2dc37608e9.webp"},
-    {"game_id": "Pragmatic Play/4dd82e4a742d93dc80c411ea0b7bde677a01727287535e07946f831cfccf0957.webp", "display_name": "🎲 PP Slot 34", "provider": "PRAGMATIC PLAY", "image_file": "4dd82e4a742d93dc80c411ea0b7bde677a01727287535e07946f831cfccf0957.webp"},
-    {"game_id": "Pragmatic Play/4e9386ce838d3c59b1905529a13063930ea1bc11cc9bd29a5062dd7d47c383d1.webp", "display_name": "🎲 PP Slot 35", "provider": "PRAGMATIC PLAY", "image_file": "4e9386ce838d3c59b1905529a13063930ea1bc11cc9bd29a5062dd7d47c383d1.webp"},
-    {"game_id": "Pragmatic Play/4f656be5970a7314078d68157aa835ef7e821a2f5fa16bdddf0b175f927fe791.webp", "display_name": "🎲 PP Slot 36", "provider": "PRAGMATIC PLAY", "image_file": "4f656be5970a7314078d68157aa835ef7e821a2f5fa16bdddf0b175f927fe791.webp"},
-    {"game_id": "Pragmatic Play/513989e83e5078b3a03a8d1d3c71b5ac8dfdc8a064430adc3e34eca732733b8e.webp", "display_name": "🎲 PP Slot 37", "provider": "PRAGMATIC PLAY", "image_file": "513989e83e5078b3a03a8d1d3c71b5ac8dfdc8a064430adc3e34eca732733b8e.webp"},
-    {"game_id": "Pragmatic Play/515b7aad8b76748956fe3c8fc75a80604ff1b3aa6507e90cdf67663d7a47c3b2.webp", "display_name": "🎲 PP Slot 38", "provider": "PRAGMATIC PLAY", "image_file": "515b7aad8b76748956fe3c8fc75a80604ff1b3aa6507e90cdf67663d7a47c3b2.webp"},
-    {"game_id": "Pragmatic Play/516dd23e24bc643b9f6d77362b11b8b077ccea882a4dffb2913e023d7131fbef.webp", "display_name": "🎲 PP Slot 39", "provider": "PRAGMATIC PLAY", "image_file": "516dd23e24bc643b9f6d77362b11b8b077ccea882a4dffb2913e023d7131fbef.webp"},
-    {"game_id": "Pragmatic Play/58c26df3887b38eec9946ebe7ec61016f3cd1bb443540019fc85584af52d78f2.webp", "display_name": "🎲 PP Slot 40", "provider": "PRAGMATIC PLAY", "image_file": "58c26df3887b38eec9946ebe7ec61016f3cd1bb443540019fc85584af52d78f2.webp"},
-    {"game_id": "Pragmatic Play/58d261aa0cb26e3647956d9cedb3d6efbd8bf9fc12d1498dda8ee053c64cc064.webp", "display_name": "🎲 PP Slot 41", "provider": "PRAGMATIC PLAY", "image_file": "58d261aa0cb26e3647956d9cedb3d6efbd8bf9fc12d1498dda8ee053c64cc064.webp"},
-    {"game_id": "Pragmatic Play/5befbb8621f3b529ef0a8576edc94bce337c013f8788e9fb71d8b552a0bd5f9e.webp", "display_name": "🎲 PP Slot 42", "provider": "PRAGMATIC PLAY", "image_file": "5befbb8621f3b529ef0a8576edc94bce337c013f8788e9fb71d8b552a0bd5f9e.webp"},
-    {"game_id": "Pragmatic Play/5f66bd7f515175883d6d66e609e125fcf33f53508ea9a986841a822b63dbc9cf.webp", "display_name": "🎲 PP Slot 43", "provider": "PRAGMATIC PLAY", "image_file": "5f66bd7f515175883d6d66e609e125fcf33f53508ea9a986841a822b63dbc9cf.webp"},
-    {"game_id": "Pragmatic Play/60206bb76f8d15dd2975ea5d5c908194c66a1183683e6988c83027ada9befbef.webp", "display_name": "🎲 PP Slot 44", "provider": "PRAGMATIC PLAY", "image_file": "60206bb76f8d15dd2975ea5d5c908194c66a1183683e6988c83027ada9befbef.webp"},
-    {"game_id": "Pragmatic Play/61aff4b0576e94af8e472da08694b9d63c47a08401e90fbecb381578704175c4.webp", "display_name": "🎲 PP Slot 45", "provider": "PRAGMATIC PLAY", "image_file": "61aff4b0576e94af8e472da08694b9d63c47a08401e90fbecb381578704175c4.webp"},
-    {"game_id": "Pragmatic Play/628496a33da1c9c2c781d908a993a0de45f6672a1a4187b03e014743280f9f71.webp", "display_name": "🎲 PP Slot 46", "provider": "PRAGMATIC PLAY", "image_file": "628496a33da1c9c2c781d908a993a0de45f6672a1a4187b03e014743280f9f71.webp"},
-    {"game_id": "Pragmatic Play/62b2449f9a8577d4908ca4c2478e8db46ce6ef3f306eaa4497d607e0db853d5b.webp", "display_name": "🎲 PP Slot 47", "provider": "PRAGMATIC PLAY", "image_file": "62b2449f9a8577d4908ca4c2478e8db46ce6ef3f306eaa4497d607e0db853d5b.webp"},
-    {"game_id": "Pragmatic Play/63b93076df813efb83ee33b4d4f8cb4500ac4bfd0c454c4d3a051b0da7f8af9a.webp", "display_name": "🎲 PP Slot 48", "provider": "PRAGMATIC PLAY", "image_file": "63b93076df813efb83ee33b4d4f8cb4500ac4bfd0c454c4d3a051b0da7f8af9a.webp"},
-    {"game_id": "Pragmatic Play/64436402c8e5d5331d04d615796f0f74da0260f52cef74e61acfac0378466309.webp", "display_name": "🎲 PP Slot 49", "provider": "PRAGMATIC PLAY", "image_file": "64436402c8e5d5331d04d615796f0f74da0260f52cef74e61acfac0378466309.webp"},
-    {"game_id": "Pragmatic Play/6b106c589bb9482c20e5716667face26cbd017abc13ed84e2dc2d2beb4d31ebf.webp", "display_name": "🎲 PP Slot 50", "provider": "PRAGMATIC PLAY", "image_file": "6b106c589bb9482c20e5716667face26cbd017abc13ed84e2dc2d2beb4d31ebf.webp"},
-    {"game_id": "Pragmatic Play/6bd16708800d460b31c2ee7996f01a806496830fe5cff923daa003eeca3d0fd8.webp", "display_name": "🎲 PP Slot 51", "provider": "PRAGMATIC PLAY", "image_file": "6bd16708800d460b31c2ee7996f01a806496830fe5cff923daa003eeca3d0fd8.webp"},
-    {"game_id": "Pragmatic Play/6cc2add248e5f0abe721f03240b12cb42b7c3cb4661504b521d91859bedcddad.webp", "display_name": "🎲 PP Slot 52", "provider": "PRAGMATIC PLAY", "image_file": "6cc2add248e5f0abe721f03240b12cb42b7c3cb4661504b521d91859bedcddad.webp"},
-    {"game_id": "Pragmatic Play/6d6b5cda13c1b3cacf27c22c7a5842dc539c71f962b5d2c2ba51b47cc19b9079.webp", "display_name": "🎲 PP Slot 53", "provider": "PRAGMATIC PLAY", "image_file": "6d6b5cda13c1b3cacf27c22c7a5842dc539c71f962b5d2c2ba51b47cc19b9079.webp"},
-    {"game_id": "Pragmatic Play/6de4ad5cbac5be1dbb06c9bbee87bea4b08b1d30fa4715229cc421f972a65337.webp", "display_name": "🎲 PP Slot 54", "provider": "PRAGMATIC PLAY", "image_file": "6de4ad5cbac5be1dbb06c9bbee87bea4b08b1d30fa4715229cc421f972a65337.webp"},
-    {"game_id": "Pragmatic Play/6eba0e3bad33c83a24477372960f6abdcb7087e42a8fd35423beb4e083c33060.webp", "display_name": "🎲 PP Slot 55", "provider": "PRAGMATIC PLAY", "image_file": "6eba0e3bad33c83a24477372960f6abdcb7087e42a8fd35423beb4e083c33060.webp"},
-    {"game_id": "Pragmatic Play/73754d4bf421b78fbd3895bbc7890d379797588cb699d6cbe47f3656aa93613b.webp", "display_name": "🎲 PP Slot 56", "provider": "PRAGMATIC PLAY", "image_file": "73754d4bf421b78fbd3895bbc7890d379797588cb699d6cbe47f3656aa93613b.webp"},
-    {"game_id": "Pragmatic Play/741f8f9dd2ead70e1e3fb9b34ef4058b0b431ea93f60f17b71ac65fa7f41bf17.webp", "display_name": "🎲 PP Slot 57", "provider": "PRAGMATIC PLAY", "image_file": "741f8f9dd2ead70e1e3fb9b34ef4058b0b431ea93f60f17b71ac65fa7f41bf17.webp"},
-    {"game_id": "Pragmatic Play/767b3f62a9beb01c841faca3bb76846e7a4626efe2f8b67e195880d9bebe817f.webp", "display_name": "🎲 PP Slot 58", "provider": "PRAGMATIC PLAY", "image_file": "767b3f62a9beb01c841faca3bb76846e7a4626efe2f8b67e195880d9bebe817f.webp"},
-    {"game_id": "Pragmatic Play/7681efb7a93a1213310cb40d18f06111d8809ce1becf6b77ef033ac83d2d1d24.webp", "display_name": "🎲 PP Slot 59", "provider": "PRAGMATIC PLAY", "image_file": "7681efb7a93a1213310cb40d18f06111d8809ce1becf6b77ef033ac83d2d1d24.webp"},
-    {"game_id": "Pragmatic Play/78460943fb9a9ceb88066262c9d5a208212383b6a8b530ea7a2a302257e8bfa2.webp", "display_name": "🎲 PP Slot 60", "provider": "PRAGMATIC PLAY", "image_file": "78460943fb9a9ceb88066262c9d5a208212383b6a8b530ea7a2a302257e8bfa2.webp"},
-    {"game_id": "Pragmatic Play/796957e88a7a9d2531a60ccde77ed922ebb028c6e3d2d3a3eb683ca3e7dd9feb.webp", "display_name": "🎲 PP Slot 61", "provider": "PRAGMATIC PLAY", "image_file": "796957e88a7a9d2531a60ccde77ed922ebb028c6e3d2d3a3eb683ca3e7dd9feb.webp"},
-    {"game_id": "Pragmatic Play/7a73d0321e7b6501b7f92b3522c7e6410f4ba8a94ffbf2a260b92a4c509e8cec.webp", "display_name": "🎲 PP Slot 62", "provider": "PRAGMATIC PLAY", "image_file": "7a73d0321e7b6501b7f92b3522c7e6410f4ba8a94ffbf2a260b92a4c509e8cec.webp"},
-    {"game_id": "Pragmatic Play/7afa70087cd305cd29c1e27e2dd61c71982ceefb16fe17fb593da1214ca20276.webp", "display_name": "🎲 PP Slot 63", "provider": "PRAGMATIC PLAY", "image_file": "7afa70087cd305cd29c1e27e2dd61c71982ceefb16fe17fb593da1214ca20276.webp"},
-    {"game_id": "Pragmatic Play/7beb8d9a3555d964d702dc7c466dbb8970db965854a7ef1863591a5fa030e91c.webp", "display_name": "🎲 PP Slot 64", "provider": "PRAGMATIC PLAY", "image_file": "7beb8d9a3555d964d702dc7c466dbb8970db965854a7ef1863591a5fa030e91c.webp"},
-    {"game_id": "Pragmatic Play/7f65a3148997321a5a97908745726044e003b310bc0e52a397acef36b525dcbe.webp", "display_name": "🎲 PP Slot 65", "provider": "PRAGMATIC PLAY", "image_file": "7f65a3148997321a5a97908745726044e003b310bc0e52a397acef36b525dcbe.webp"},
-    {"game_id": "Pragmatic Play/80987919d4aa387ebdd70045c930a556e6905899121577da102dcb19f728e026.webp", "display_name": "🎲 PP Slot 66", "provider": "PRAGMATIC PLAY", "image_file": "80987919d4aa387ebdd70045c930a556e6905899121577da102dcb19f728e026.webp"},
-    {"game_id": "Pragmatic Play/80cef3c2101ccc6abeb74df85fe242c1ba7cb741f4d1c16c8791818721495943.webp", "display_name": "🎲 PP Slot 67", "provider": "PRAGMATIC PLAY", "image_file": "80cef3c2101ccc6abeb74df85fe242c1ba7cb741f4d1c16c8791818721495943.webp"},
-    {"game_id": "Pragmatic Play/83f635b69fd26ecd4a7c43a983302ad110a1150ffc23b930fa04d99f6fb186bf.webp", "display_name": "🎲 PP Slot 68", "provider": "PRAGMATIC PLAY", "image_file": "83f635b69fd26ecd4a7c43a983302ad110a1150ffc23b930fa04d99f6fb186bf.webp"},
-    {"game_id": "Pragmatic Play/83fbc67b1edc1081b2394e3650cb62cfd17456ebf68727ac287b4c55de00c0db.webp", "display_name": "🎲 PP Slot 69", "provider": "PRAGMATIC PLAY", "image_file": "83fbc67b1edc1081b2394e3650cb62cfd17456ebf68727ac287b4c55de00c0db.webp"},
-    {"game_id": "Pragmatic Play/84b9e198ab9afe0b9624816c00d6ebebb7df1cf348bc26ed055235bd9ee1ab07.webp", "display_name": "🎲 PP Slot 70", "provider": "PRAGMATIC PLAY", "image_file": "84b9e198ab9afe0b9624816c00d6ebebb7df1cf348bc26ed055235bd9ee1ab07.webp"},
-    {"game_id": "Pragmatic Play/8641f39a396b6d38f7259c16f09f320f5f1b5652c4ce8ec4a231bd585ff9ba5b.webp", "display_name": "🎲 PP Slot 71", "provider": "PRAGMATIC PLAY", "image_file": "8641f39a396b6d38f7259c16f09f320f5f1b5652c4ce8ec4a231bd585ff9ba5b.webp"},
-    {"game_id": "Pragmatic Play/8777ab38250f62af7f6f7f0d4665cb12354a2774ca5e2be7e78958c8a118fa64.webp", "display_name": "🎲 PP Slot 72", "provider": "PRAGMATIC PLAY", "image_file": "8777ab38250f62af7f6f7f0d4665cb12354a2774ca5e2be7e78958c8a118fa64.webp"},
-    {"game_id": "Pragmatic Play/884da2c4d7b719ff5078a4960928d11f831314f1c4fe6db828d3fced07404d13.webp", "display_name": "🎲 PP Slot 73", "provider": "PRAGMATIC PLAY", "image_file": "884da2c4d7b719ff5078a4960928d11f831314f1c4fe6db828d3fced07404d13.webp"},
-    {"game_id": "Pragmatic Play/88d127f9829aa7336afc1d00ef0513e7c48d412ef33138b73f7a7746314375bd.webp", "display_name": "🎲 PP Slot 74", "provider": "PRAGMATIC PLAY", "image_file": "88d127f9829aa7336afc1d00ef0513e7c48d412ef33138b73f7a7746314375bd.webp"},
-    {"game_id": "Pragmatic Play/8b7b4969e2d28e603176bd8efe2e2e791efe6435ed4c1ab8456948e3f6d6cfb8.webp", "display_name": "🎲 PP Slot 75", "provider": "PRAGMATIC PLAY", "image_file": "8b7b4969e2d28e603176bd8efe2e2e791efe6435ed4c1ab8456948e3f6d6cfb8.webp"},
-]
-
-# Combine all games
-ALL_GAMES = PG_SOFT_GAMES + PRAGMATIC_GAMES
-
-# =============================================================================
-# CHANNEL CONFIGURATION
-# =============================================================================
-# Each channel can be configured to show only specific providers
-# Set provider to "ALL" to show all games, or specify provider name
-# =============================================================================
-
-CHANNEL_CONFIG = [
-    {
-        "channel_id": "@PGSinaisPop",      # Replace with your PG SOFT channel
-        "provider": "PG SOFT",                  # Only PG SOFT games (Fortune series)
-        "name": "PG SOFT Channel"
-    },
-    {
-        "channel_id": "@PPSinaisPOP",    # Replace with your Pragmatic Play channel
-        "provider": "PRAGMATIC PLAY",           # Only Pragmatic Play games (Popular series)
-        "name": "Pragmatic Play Channel"
-    },
-    # Uncomment below to add an "ALL" channel that shows all games:
-    # {
-    #     "channel_id": "@ALL_GAMES_CHANNEL",
-    #     "provider": "ALL",
-    #     "name": "All Games Channel"
-    # },
-]
+# Tenant used when catalog.json only has a "channels" list
+DEFAULT_TENANT = "default"
 
 # =============================================================================
 # RTP ALGORITHM - EXACT MATCH WITH WEBSITE (script.js)
-# Uses ctypes.c_int32 for proper JavaScript 32-bit signed integer emulation
+# The scalar website functions (string_to_hash, seeded_random, ...) live in
+# rtp_reference.py; this section adds the bot's table lookups on top of them.
 # =============================================================================
 
-def to_int32(val: int) -> int:
+def get_time_seed(now: Optional[datetime] = None) -> int:
     """
-    Converts a Python integer to JavaScript-style 32-bit signed integer.
-    Uses ctypes for exact behavior matching.
+    Generates a time-based seed synchronized to São Paulo timezone.
+    Updates every 3 minutes, aligned with the website (see
+    rtp_reference.get_time_seed()).
     
     Args:
-        val: Input integer value
+        now: São Paulo time to compute the seed for (defaults to current time)
     
     Returns:
-        32-bit signed integer (-2147483648 to 2147483647)
+        Total minutes since epoch in São Paulo timezone, rounded to 3-minute intervals
     """
-    return ctypes.c_int32(val).value
+    return rtp_reference.get_time_seed(now if now is not None else datetime.now(SAO_PAULO_TZ))
 
 
-def to_uint32(val: int) -> int:
+def get_interval_start(now: Optional[datetime] = None) -> datetime:
     """
-    Converts a Python integer to JavaScript-style 32-bit unsigned integer.
-    Uses ctypes for exact behavior matching.
+    Gets the start of the 3-minute interval containing a São Paulo time.
     
     Args:
-        val: Input integer value
+        now: São Paulo time (defaults to current time)
     
     Returns:
-        32-bit unsigned integer (0 to 4294967295)
+        São Paulo datetime rounded down to the 3-minute boundary
     """
-    return ctypes.c_uint32(val).value
+    if now is None:
+        now = datetime.now(SAO_PAULO_TZ)
+    return now.replace(minute=(now.minute // 3) * 3, second=0, microsecond=0)
 
 
-def string_to_hash(s: str) -> int:
+def get_seeded_random_int(seed: int, min_val: int, max_val: int) -> int:
     """
-    Converts a string to a 32-bit hash value.
-    This is an EXACT port of the JavaScript stringToHash() function.
-    
-    JavaScript equivalent:
-        function stringToHash(str) {
-            let hash = 0;
-            for (let i = 0; i < str.length; i++) {
-                const char = str.charCodeAt(i);
-                hash = ((hash << 5) - hash) + char;
-                hash = hash & hash;
-            }
-            return Math.abs(hash);
-        }
+    Generates a deterministic random integer within a range.
+    This is an EXACT port of the JavaScript getSeededRandomInt() function.
     
-    CRITICAL: JavaScript's << operator returns a 32-bit SIGNED integer.
-    The & hash operation also forces 32-bit signed conversion.
-    We use ctypes.c_int32 to exactly match this behavior.
+    The seededRandom() call is replaced by a lookup in SEEDED_RANDOM_TABLE,
+    which holds its output for every possible reduced seed.
     
     Args:
-        s: Input string (game ID like "PG SOFT/FORTUNE_1.webp")
+        seed: Input seed value
+        min_val: Minimum value (inclusive)
+        max_val: Maximum value (inclusive)
     
     Returns:
-        Absolute value of 32-bit hash
+        Random integer between min_val and max_val
     """
-    hash_val = 0
-    for char in s:
-        char_code = ord(char)
-        # JavaScript: hash << 5 returns 32-bit signed
-        shifted = to_int32(hash_val << 5)
-        # JavaScript: (shifted - hash) + char, then & hash converts to int32
-        hash_val = to_int32(shifted - hash_val + char_code)
-    return abs(hash_val)
+    rnd = SEEDED_RANDOM_TABLE[reduce_seed(seed)]
+    return math.floor(rnd * (max_val - min_val + 1)) + min_val
 
 
-def get_time_seed() -> int:
+def get_seeded_choice(seed: int, options: list):
     """
-    Generates a time-based seed synchronized to São Paulo timezone.
-    Updates every 3 minutes, aligned with the website.
+    Selects a deterministic choice from a list of options.
+    Uses the same seed reduction and SEEDED_RANDOM_TABLE lookup as
+    get_seeded_random_int().
     
-    This is an EXACT port of the JavaScript getTimeSeed() function.
+    Args:
+        seed: Input seed value
+        options: List of options to choose from
     
     Returns:
-        Total minutes since epoch in São Paulo timezone, rounded to 3-minute intervals
+        Selected option
     """
-    # Get current time in São Paulo timezone
-    sao_paulo_time = datetime.now(SAO_PAULO_TZ)
-    
-    # Round down to nearest 3-minute interval
-    current_minute = sao_paulo_time.minute
-    rounded_minute = (current_minute // 3) * 3
-    
-    # Calculate total minutes (matching JavaScript calculation)
-    # Note: JavaScript getMonth() is 0-11, so we use month - 1
-    total_minutes = (
-        sao_paulo_time.year * 525600 +
-        (sao_paulo_time.month - 1) * 43800 +  # month - 1 to match JS
-        sao_paulo_time.day * 1440 +
-        sao_paulo_time.hour * 60 +
-        rounded_minute
-    )
-    
-    return total_minutes
+    rnd = SEEDED_RANDOM_TABLE[reduce_seed(seed)]
+    idx = math.floor(rnd * len(options))
+    return options[idx]
 
 
-def js_imul(a: int, b: int) -> int:
+# =============================================================================
+# BATCH RTP ENGINE - WHOLE CATALOG IN ONE NUMPY PASS
+# Bit-exact vectorized port of the functions above. uint32 arithmetic wraps
+# modulo 2^32 exactly like Math.imul / >>> 0, and the seed reduction keeps
+# the float64 precision loss of JavaScript's (seed * 9301 + 49297) % 233280.
+# =============================================================================
+
+def batch_reduce_seed(seeds: np.ndarray) -> np.ndarray:
     """
-    JavaScript Math.imul equivalent - 32-bit integer multiplication.
+    Vectorized form of the seed reduction done by get_seeded_random_int().
     
-    Math.imul performs 32-bit integer multiplication, similar to how
-    the multiplication would work in C. This handles overflow correctly.
+    The multiplication is done in float64 on purpose: combined seeds are around
+    1e12, so seed * 9301 exceeds 2^53 and loses precision exactly like JavaScript.
     
     Args:
-        a: First operand
-        b: Second operand
+        seeds: Array of combined seeds (int64)
     
     Returns:
-        32-bit signed integer result of multiplication
+        Array of reduced seeds in [0, 233280) (int64)
     """
-    # Convert both to 32-bit unsigned, multiply, then convert result to signed
-    a = to_uint32(a)
-    b = to_uint32(b)
-    # Perform multiplication and take lower 32 bits
-    result = (a * b) & 0xFFFFFFFF
-    # Convert to signed 32-bit
-    return to_int32(result)
+    return np.fmod(seeds.astype(np.float64) * 9301 + 49297, 233280).astype(np.int64)
 
 
-def seeded_random(seed: int) -> float:
+def batch_seeded_random(seeds: np.ndarray) -> np.ndarray:
     """
-    Generates a deterministic random number from a seed.
-    This is an EXACT port of the JavaScript seededRandom() function.
+    Vectorized seeded_random() for seeds already reduced into [0, 233280).
+    Only used to build SEEDED_RANDOM_TABLE; the hot path reads the table.
     
-    JavaScript equivalent:
-        function seededRandom(seed) {
-            seed = Math.abs(seed | 0);
-            let t = seed += 0x6D2B79F5;
-            t = Math.imul(t ^ t >>> 15, t | 1);
-            t ^= t + Math.imul(t ^ t >>> 7, t | 61);
-            return ((t ^ t >>> 14) >>> 0) / 4294967296;
-        }
+    Reduced seeds are always non-negative 32-bit values, so the
+    Math.abs(seed | 0) step of the JavaScript version is a no-op here.
     
     Args:
-        seed: Input seed value
+        seeds: Array of reduced seeds
     
     Returns:
-        Float between 0 and 1
+        Array of floats between 0 and 1 (float64)
     """
-    # seed = Math.abs(seed | 0) - convert to 32-bit signed, then abs
-    seed = abs(to_int32(seed))
-    
-    # let t = seed += 0x6D2B79F5
-    # In JS this modifies seed and assigns to t, but we only need t
-    t = to_uint32(seed + 0x6D2B79F5)
+    t = seeds.astype(np.uint32) + np.uint32(0x6D2B79F5)
+    t = (t ^ (t >> np.uint32(15))) * (t | np.uint32(1))
+    t = t ^ (t + (t ^ (t >> np.uint32(7))) * (t | np.uint32(61)))
+    return (t ^ (t >> np.uint32(14))).astype(np.float64) / 4294967296
+
+
+def batch_seeded_random_int(seeds: np.ndarray, min_val: int, max_val: int) -> np.ndarray:
+    """
+    Vectorized get_seeded_random_int().
     
-    # t = Math.imul(t ^ t >>> 15, t | 1)
-    # >>> is unsigned right shift in JavaScript
-    t_shifted = t >> 15  # In Python, >> on positive numbers is like >>>
-    t = to_uint32(js_imul(t ^ t_shifted, t | 1))
+    Args:
+        seeds: Array of combined seeds (int64)
+        min_val: Minimum value (inclusive)
+        max_val: Maximum value (inclusive)
     
-    # t ^= t + Math.imul(t ^ t >>> 7, t | 61)
-    t_shifted2 = t >> 7
-    imul_result = js_imul(t ^ t_shifted2, t | 61)
-    t = to_uint32(t ^ to_uint32(t + imul_result))
+    Returns:
+        Array of random integers between min_val and max_val (int32)
+    """
+    rnd = SEEDED_RANDOM_TABLE[batch_reduce_seed(seeds)]
+    return (np.floor(rnd * (max_val - min_val + 1)) + min_val).astype(np.int32)
+
+
+def batch_seeded_choice_index(seeds: np.ndarray, option_count: int) -> np.ndarray:
+    """
+    Vectorized get_seeded_choice(), returning the chosen index instead of the option.
     
-    # return ((t ^ t >>> 14) >>> 0) / 4294967296
-    # >>> 0 ensures unsigned 32-bit
-    result = to_uint32(t ^ (t >> 14))
+    Args:
+        seeds: Array of combined seeds (int64)
+        option_count: Number of options to choose from
     
-    return result / 4294967296
+    Returns:
+        Array of option indexes (int32)
+    """
+    rnd = SEEDED_RANDOM_TABLE[batch_reduce_seed(seeds)]
+    return np.floor(rnd * option_count).astype(np.int32)
 
 
-def get_seeded_random_int(seed: int, min_val: int, max_val: int) -> int:
+def evaluate_games_batch(game_hashes, time_seed: int) -> Dict[str, np.ndarray]:
     """
-    Generates a deterministic random integer within a range.
-    This is an EXACT port of the JavaScript getSeededRandomInt() function.
-    
-    CRITICAL: JavaScript uses 64-bit floats which lose precision for large integers.
-    We must use float() to match JavaScript's behavior exactly!
+    Evaluates RTP, strategy and multiplier for many games at once.
+    Produces exactly the same values as generate_game_rtp(),
+    generate_game_strategy() and generate_multiplier() for each game.
     
     Args:
-        seed: Input seed value
-        min_val: Minimum value (inclusive)
-        max_val: Maximum value (inclusive)
+        game_hashes: Sequence or array of string_to_hash() values
+        time_seed: Time seed of the interval (see get_time_seed())
     
     Returns:
-        Random integer between min_val and max_val
+        Dictionary of int32 arrays aligned with game_hashes:
+        - rtp: RTP percentage (30-99)
+        - normal: Normal spins
+        - auto_index: Index into CONFIG["auto_options"]
+        - turbo_index: Index into CONFIG["turbo_options"]
+        - multiplier_index: Index into CONFIG["multipliers"]
     """
-    # MUST use float to match JavaScript's 64-bit float precision loss!
-    seed = int((float(seed) * 9301 + 49297) % 233280)
-    rnd = seeded_random(seed)
-    return math.floor(rnd * (max_val - min_val + 1)) + min_val
+    hashes = np.asarray(game_hashes, dtype=np.uint32).astype(np.int64)
+    base_seed = np.int64(time_seed) * 1000 + hashes
+    
+    return {
+        "rtp": batch_seeded_random_int(base_seed, CONFIG["rtp_min"], CONFIG["rtp_max"]),
+        "normal": batch_seeded_random_int(base_seed + 1000, CONFIG["normal_min"], CONFIG["normal_max"]),
+        "auto_index": batch_seeded_choice_index(base_seed + 2000, len(CONFIG["auto_options"])),
+        "turbo_index": batch_seeded_choice_index(base_seed + 3000, len(CONFIG["turbo_options"])),
+        "multiplier_index": batch_seeded_random_int(base_seed * 7, 0, len(CONFIG["multipliers"]) - 1),
+    }
 
 
-def get_seeded_choice(seed: int, options: list):
+# =============================================================================
+# SEEDED RANDOM LOOKUP TABLE
+# Every draw reduces its seed modulo 233280 before calling seededRandom(), so
+# there are only 233,280 possible outputs. They are generated once, stored in
+# CACHE_DIR, memory-mapped on startup and validated against a fixed checksum.
+# =============================================================================
+
+SEED_MODULUS = rtp_reference.SEED_MODULUS
+SEEDED_RANDOM_TABLE_FILE = os.path.join(CACHE_DIR, "seeded_random_table.npy")
+
+# SHA-256 of the table as little-endian float64 (seededRandom(0..233279))
+SEEDED_RANDOM_TABLE_SHA256 = "0ba574354391b69fe162911ecccdc8fba4e12d91ab99cda4ad4fe201d71900b9"
+
+
+def _table_checksum(table: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(table, dtype="<f8").tobytes()).hexdigest()
+
+
+def load_seeded_random_table(path: str = SEEDED_RANDOM_TABLE_FILE) -> np.ndarray:
     """
-    Selects a deterministic choice from a list of options.
+    Loads the seeded_random() lookup table, generating it if needed.
+    
+    The file is memory-mapped read-only. A missing, truncated or corrupted
+    file is regenerated and rewritten atomically.
     
     Args:
-        seed: Input seed value
-        options: List of options to choose from
+        path: Location of the .npy table file
     
     Returns:
-        Selected option
+        float64 array where table[seed] == seeded_random(seed)
     """
-    # MUST use float to match JavaScript's 64-bit float precision loss!
-    seed = int((float(seed) * 9301 + 49297) % 233280)
-    rnd = seeded_random(seed)
-    idx = math.floor(rnd * len(options))
-    return options[idx]
+    try:
+        table = np.load(path, mmap_mode="r")
+        if table.shape == (SEED_MODULUS,) and _table_checksum(table) == SEEDED_RANDOM_TABLE_SHA256:
+            return table
+        log.warning(f"⚠️ Tabela de seeds inválida, gerando novamente: {path}")
+    except (OSError, ValueError):
+        pass
+    
+    table = batch_seeded_random(np.arange(SEED_MODULUS)).astype("<f8")
+    if _table_checksum(table) != SEEDED_RANDOM_TABLE_SHA256:
+        raise RuntimeError("seeded_random() table does not match the expected checksum")
+    
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp_path, path)
+        return np.load(path, mmap_mode="r")
+    except OSError as e:
+        # Read-only filesystem: keep the in-memory table
+        log.warning(f"⚠️ Não foi possível salvar a tabela de seeds: {e}")
+        return table
+
+
+SEEDED_RANDOM_TABLE = load_seeded_random_table()
+
+
+# =============================================================================
+# GAME CATALOG - BUILT ONCE PER VERSION OF catalog.json
+# Hashes, provider codes and image paths are computed a single time, so the
+# per-cycle code never re-hashes game_ids or copies game dictionaries. On
+# reload, games that were already known keep their hash.
+# =============================================================================
+
+class GameRecord:
+    """
+    Compact, read-only record for one catalog entry.
+    
+    Attributes:
+        index: Position in the catalog
+        game_id: Website game identifier (e.g., "PG SOFT/FORTUNE_1.webp")
+        display_name: Name shown in Telegram messages
+        provider: Provider name as written in the game list
+        image_file: Image file name inside IMAGE_BASE_PATH
+        image_path: Full path to the image file
+        game_hash: Precomputed string_to_hash(game_id)
+    """
+    __slots__ = ("index", "game_id", "display_name", "provider", "image_file", "image_path", "game_hash")
+    
+    def __init__(self, index: int, game: Dict, game_hash: int):
+        self.index = index
+        self.game_id = game["game_id"]
+        self.display_name = game["display_name"]
+        self.provider = game["provider"]
+        self.image_file = game["image_file"]
+        self.image_path = f"{IMAGE_BASE_PATH}{game['image_file']}"
+        self.game_hash = game_hash
+    
+    def __repr__(self) -> str:
+        return f"GameRecord({self.index}, {self.game_id!r})"
+
+
+class GameCatalog:
+    """
+    Array-backed game catalog with O(1) access by index and by game_id.
+    
+    Attributes:
+        records: Tuple of GameRecord, in game list order
+        hashes: uint32 array of game hashes, aligned with records
+        provider_codes: uint8 array of provider codes, aligned with records
+        providers: Upper-case provider names, indexed by provider code
+        fingerprint: SHA-256 of the hashes and RTP settings, changes whenever
+                     the evaluated values could change
+    """
+    __slots__ = (
+        "records", "hashes", "provider_codes", "providers", "fingerprint",
+        "_index_by_id", "_code_by_provider", "_all_indexes", "_indexes_by_code", "_indexes_by_set"
+    )
+    
+    def __init__(self, games: List[Dict], previous: Optional["GameCatalog"] = None):
+        known = previous._index_by_id if previous is not None else {}
+        records = []
+        for i, game in enumerate(games):
+            known_index = known.get(game["game_id"])
+            if known_index is not None:
+                game_hash = previous.records[known_index].game_hash
+            else:
+                game_hash = string_to_hash(game["game_id"])
+            records.append(GameRecord(i, game, game_hash))
+        self.records = tuple(records)
+        self.hashes = np.array([r.game_hash for r in self.records], dtype=np.uint32)
+        
+        self.providers = []
+        self._code_by_provider = {}
+        codes = []
+        for record in self.records:
+            provider = record.provider.upper()
+            if provider not in self._code_by_provider:
+                self._code_by_provider[provider] = len(self.providers)
+                self.providers.append(provider)
+            codes.append(self._code_by_provider[provider])
+        self.provider_codes = np.array(codes, dtype=np.uint8)
+        
+        # Catalog indexes pre-partitioned by provider (each sorted ascending)
+        self._all_indexes = np.arange(len(self.records))
+        self._indexes_by_code = [np.flatnonzero(self.provider_codes == code) for code in range(len(self.providers))]
+        self._indexes_by_set = {}
+        
+        rtp_settings = json.dumps(
+            [CONFIG[key] for key in ("rtp_min", "rtp_max", "normal_min", "normal_max")] +
+            [len(CONFIG[key]) for key in ("auto_options", "turbo_options", "multipliers")]
+        )
+        self.fingerprint = hashlib.sha256(self.hashes.tobytes() + rtp_settings.encode()).hexdigest()
+        
+        self._index_by_id = {r.game_id: r.index for r in self.records}
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __getitem__(self, index: int) -> GameRecord:
+        return self.records[index]
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def index_of(self, game_id: str) -> int:
+        """Returns the catalog index of a game_id (KeyError if unknown)."""
+        return self._index_by_id[game_id]
+    
+    def get(self, game_id: str) -> Optional[GameRecord]:
+        """Returns the record for a game_id, or None if unknown."""
+        index = self._index_by_id.get(game_id)
+        return None if index is None else self.records[index]
+    
+    def provider_code(self, provider: str) -> Optional[int]:
+        """Returns the provider code for a provider name (case-insensitive)."""
+        return self._code_by_provider.get(provider.upper())
+    
+    def provider_indexes(self, providers: Optional[frozenset] = None) -> np.ndarray:
+        """
+        Catalog indexes of the games from a set of providers.
+        
+        Args:
+            providers: Upper-case provider names, or None for all games
+        
+        Returns:
+            Sorted index array (shared, do not modify)
+        """
+        if providers is None:
+            return self._all_indexes
+        indexes = self._indexes_by_set.get(providers)
+        if indexes is None:
+            parts = [
+                self._indexes_by_code[self._code_by_provider[provider]]
+                for provider in providers if provider in self._code_by_provider
+            ]
+            indexes = np.sort(np.concatenate(parts)) if parts else np.array([], dtype=np.int64)
+            self._indexes_by_set[providers] = indexes
+        return indexes
+
+
+class GamePrediction:
+    """
+    Prediction for one game in the current interval.
+    
+    Attributes:
+        game: GameRecord from the catalog
+        rtp: RTP percentage
+        normal: Normal spins
+        auto: Auto spins option
+        turbo: Turbo option
+        multiplier: Multiplier entry from CONFIG["multipliers"]
+    """
+    __slots__ = ("game", "rtp", "normal", "auto", "turbo", "multiplier")
+    
+    def __init__(self, game: GameRecord, rtp: int, normal: int, auto, turbo, multiplier: Dict):
+        self.game = game
+        self.rtp = rtp
+        self.normal = normal
+        self.auto = auto
+        self.turbo = turbo
+        self.multiplier = multiplier
+    
+    def __repr__(self) -> str:
+        return f"GamePrediction({self.game.game_id!r}, rtp={self.rtp})"
+
+
+class CatalogLoader:
+    """
+    Loads CATALOG_FILE lazily and reloads it when its mtime changes.
+    A file that fails to load is reported and the previous catalog is kept.
+    """
+    
+    def __init__(self, path: str = CATALOG_FILE):
+        self.path = path
+        self.catalog: Optional[GameCatalog] = None
+        self.tenants: List[Dict] = []
+        self._mtime_ns = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        games = data["games"]
+        for game in games:
+            missing = {"game_id", "display_name", "provider", "image_file"} - game.keys()
+            if missing:
+                raise ValueError(f"game {game.get('game_id')!r} missing {sorted(missing)}")
+        tenants = data.get("tenants")
+        if tenants is None:
+            tenants = [{"name": DEFAULT_TENANT, "channels": data.get("channels", [])}]
+        names = [tenant["name"] for tenant in tenants]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate tenant names: {names}")
+        
+        previous = self.catalog
+        catalog = GameCatalog(games, previous=previous)
+        self.catalog, self.tenants, self._mtime_ns = catalog, tenants, mtime_ns
+        
+        if previous is not None:
+            old_ids, new_ids = set(previous._index_by_id), set(catalog._index_by_id)
+            channel_count = sum(len(tenant.get("channels", [])) for tenant in tenants)
+            log.info(
+                f"🔄 Catálogo recarregado: {len(catalog)} jogos "
+                f"(+{len(new_ids - old_ids)} / -{len(old_ids - new_ids)}), "
+                f"{len(tenants)} tenant(s), {channel_count} canais",
+                extra={"fields": {
+                    "games": len(catalog), "added": sorted(new_ids - old_ids),
+                    "removed": sorted(old_ids - new_ids), "tenants": len(tenants), "channels": channel_count
+                }}
+            )
+    
+    def get(self) -> GameCatalog:
+        """Returns the current catalog, loading the file on first use."""
+        if self.catalog is None:
+            with self._lock:
+                if self.catalog is None:
+                    self._load()
+        return self.catalog
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reloads the file if it changed since the last load.
+        
+        Returns:
+            True if a new catalog was loaded
+        """
+        with self._lock:
+            try:
+                if os.stat(self.path).st_mtime_ns == self._mtime_ns:
+                    return False
+                self._load()
+                return True
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                log.error(f"❌ Erro ao recarregar {self.path}, mantendo o catálogo atual: {e}")
+                try:
+                    self._mtime_ns = os.stat(self.path).st_mtime_ns
+                except OSError:
+                    pass
+                return False
+
+
+CATALOG_LOADER = CatalogLoader()
+
+
+def get_catalog() -> GameCatalog:
+    """Returns the current game catalog (loaded from CATALOG_FILE on first use)."""
+    return CATALOG_LOADER.get()
+
+
+def get_tenant_configs() -> List[Dict]:
+    """Returns the current tenant configurations from CATALOG_FILE."""
+    get_catalog()
+    return CATALOG_LOADER.tenants
 
 
 # =============================================================================
 # GAME DATA GENERATION - SYNCHRONIZED WITH WEBSITE
 # =============================================================================
 
-def generate_game_rtp(game_id: str) -> int:
+def generate_game_rtp(catalog: GameCatalog, index: int, time_seed: Optional[int] = None) -> int:
     """
     Generates RTP percentage for a game.
     Uses the EXACT same algorithm as the website.
     
     Args:
-        game_id: Game identifier (e.g., "PG SOFT/FORTUNE_1.webp")
+        catalog: Game catalog
+        index: Catalog index of the game
+        time_seed: Interval time seed (defaults to get_time_seed())
     
     Returns:
         RTP percentage (30-99)
     """
-    time_seed = get_time_seed()
-    game_hash = string_to_hash(game_id)
+    if time_seed is None:
+        time_seed = get_time_seed()
+    game_hash = catalog.records[index].game_hash
     combined_seed = time_seed * 1000 + game_hash
     rtp = get_seeded_random_int(combined_seed, CONFIG["rtp_min"], CONFIG["rtp_max"])
     return rtp
 
 
-def generate_game_strategy(game_id: str) -> Dict:
+def generate_game_strategy(catalog: GameCatalog, index: int, time_seed: Optional[int] = None) -> Dict:
     """
     Generates betting strategy for a game (Normal, Auto, Turbo).
     Uses the EXACT same algorithm as the website.
     
     Args:
-        game_id: Game identifier
+        catalog: Game catalog
+        index: Catalog index of the game
+        time_seed: Interval time seed (defaults to get_time_seed())
     
     Returns:
         Dictionary with normal, auto, turbo values
     """
-    time_seed = get_time_seed()
-    game_hash = string_to_hash(game_id)
+    if time_seed is None:
+        time_seed = get_time_seed()
+    game_hash = catalog.records[index].game_hash
     base_seed = time_seed * 1000 + game_hash
     
     # Normal spins (Seed + 1000)
@@ -551,19 +765,22 @@ def generate_game_strategy(game_id: str) -> Dict:
     }
 
 
-def generate_multiplier(game_id: str) -> Dict:
+def generate_multiplier(catalog: GameCatalog, index: int, time_seed: Optional[int] = None) -> Dict:
     """
     Generates multiplier data for a game.
     Uses the EXACT same algorithm as the website.
     
     Args:
-        game_id: Game identifier
+        catalog: Game catalog
+        index: Catalog index of the game
+        time_seed: Interval time seed (defaults to get_time_seed())
     
     Returns:
         Dictionary with multiplier value and type
     """
-    time_seed = get_time_seed()
-    game_hash = string_to_hash(game_id)
+    if time_seed is None:
+        time_seed = get_time_seed()
+    game_hash = catalog.records[index].game_hash
     
     multiplier_seed = (time_seed * 1000 + game_hash) * 7
     multiplier_index = get_seeded_random_int(
@@ -574,221 +791,2870 @@ def generate_multiplier(game_id: str) -> Dict:
 
 
 # =============================================================================
-# HIGH RTP GAMES FILTER
+# METRICS - PROMETHEUS TEXT FORMAT
+# Counters, gauges and histograms kept in memory and served at /metrics by a
+# small HTTP server on the bot's event loop (METRICS_PORT, 0 = disabled).
 # =============================================================================
 
-def get_high_rtp_games(provider_filter: str = "ALL") -> List[Dict]:
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Histogram buckets (seconds) for compute, rendering and API latencies
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...], extra: str = "") -> str:
+    parts = []
+    for name, value in zip(label_names, label_values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metric:
     """
-    Filters ALL_GAMES to find those with RTP >= 80%.
-    Returns only the TOP 5 highest RTP games per channel.
-    Can filter by provider. Skips games where image file doesn't exist.
-    
-    Args:
-        provider_filter: "ALL" for all games, or specific provider name
-                        (e.g., "PG SOFT", "PRAGMATIC PLAY")
+    One metric family; values are kept per tuple of label values.
     
-    Returns:
-        List of top 5 game dictionaries with RTP >= 80%, including:
-        - game_id, display_name, provider, image_file
-        - rtp, strategy (normal, auto, turbo), multiplier
+    Attributes:
+        name: Metric name
+        help_text: HELP line
+        label_names: Label names, in order
     """
-    high_rtp_games = []
+    kind = "untyped"
     
-    for game in ALL_GAMES:
-        # Filter by provider if specified
-        if provider_filter != "ALL":
-            if game["provider"].upper() != provider_filter.upper():
-                continue
-        
-        # Skip games where image file doesn't exist
-        image_path = f"{IMAGE_BASE_PATH}{game['image_file']}"
-        if not os.path.exists(image_path):
-            continue
-        
-        rtp = generate_game_rtp(game["game_id"])
-        
-        if rtp >= CONFIG["rtp_threshold"]:
-            strategy = generate_game_strategy(game["game_id"])
-            multiplier = generate_multiplier(game["game_id"])
-            
-            high_rtp_games.append({
-                **game,
-                "rtp": rtp,
-                "strategy": strategy,
-                "multiplier": multiplier
-            })
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], object] = {}
     
-    # Sort by RTP (highest first)
-    high_rtp_games.sort(key=lambda x: x["rtp"], reverse=True)
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
     
-    # Return only top 5 highest RTP games
-    return high_rtp_games[:MAX_GAMES_PER_NOTIFICATION]
-
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonic counter."""
+    kind = "counter"
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+    kind = "gauge"
+    
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """Distribution over fixed buckets, with sum and count."""
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        counts = state[0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        state[1] += value
+        state[2] += 1
+    
+    def time(self, **labels) -> "_HistogramTimer":
+        """Context manager observing the duration of its block."""
+        return _HistogramTimer(self, labels)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for key, (counts, total, count) in list(self._values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.label_names, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class _HistogramTimer:
+    __slots__ = ("histogram", "labels", "start")
+    
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class MetricsRegistry:
+    """All metrics exposed at /metrics."""
+    
+    def __init__(self):
+        self._metrics: List[Metric] = []
+    
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+COMPUTE_SECONDS = METRICS.register(Histogram(
+    "rtp_bot_compute_seconds", "Time to evaluate the catalog for one interval.", ("source",)
+))
+CAPTION_RENDER_SECONDS = METRICS.register(Histogram(
+    "rtp_bot_caption_render_seconds", "Time to render one game caption."
+))
+TELEGRAM_REQUEST_SECONDS = METRICS.register(Histogram(
+    "rtp_bot_telegram_request_seconds", "Telegram Bot API request latency.", ("method",)
+))
+RATE_LIMIT_WAIT_SECONDS = METRICS.register(Histogram(
+    "rtp_bot_rate_limit_wait_seconds", "Time requests waited for the rate limiter.", ("tenant",)
+))
+TELEGRAM_RETRY_AFTER = METRICS.register(Counter(
+    "rtp_bot_telegram_retry_after_total", "RetryAfter (429) responses from Telegram.", ("method",)
+))
+MESSAGES_SENT = METRICS.register(Counter(
+    "rtp_bot_messages_sent_total", "Game messages delivered.", ("tenant", "channel", "provider")
+))
+MESSAGES_FAILED = METRICS.register(Counter(
+    "rtp_bot_messages_failed_total", "Game messages that failed to send.", ("tenant", "channel", "provider")
+))
+MESSAGES_RETRIED = METRICS.register(Counter(
+    "rtp_bot_messages_retried_total", "Outbox retries by outcome.", ("tenant", "channel", "provider", "result")
+))
+WAKEUP_DRIFT_SECONDS = METRICS.register(Gauge(
+    "rtp_bot_wakeup_drift_seconds", "Seconds between the 3-minute boundary and the start of the cycle."
+))
+CYCLE_SECONDS = METRICS.register(Histogram(
+    "rtp_bot_cycle_seconds", "Duration of one send cycle."
+))
+PREPARE_SECONDS = METRICS.register(Histogram(
+    "rtp_bot_prepare_seconds", "Duration of the prepare phase before an interval boundary."
+))
+BOUNDARY_DELIVERY_SECONDS = METRICS.register(Histogram(
+    "rtp_bot_boundary_delivery_seconds", "Interval boundary to Telegram delivery, per message.", ("tenant",)
+))
+
+
+async def _handle_metrics_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.split()
+        path, _, query = (parts[1] if len(parts) > 1 else b"").partition(b"?")
+        content_type = "text/plain; version=0.0.4; charset=utf-8"
+        if path == b"/metrics":
+            status, body = "200 OK", METRICS.render().encode()
+        elif path == b"/diagnostics":
+            # On-demand full dump of the current interval
+            snapshot = get_interval_snapshot()
+            status, content_type = "200 OK", "application/json; charset=utf-8"
+            body = json.dumps(
+                {"time_seed": snapshot.time_seed, "games": dump_games(snapshot)}, ensure_ascii=False
+            ).encode()
+        elif path == b"/schedule":
+            # When is a game hot next: /schedule?game_id=PG%20SOFT/FORTUNE_3.webp
+            status, content_type = "200 OK", "application/json; charset=utf-8"
+            params = parse_qs(query.decode("utf-8", "replace"))
+            try:
+                body = json.dumps(
+                    schedule_summary(params.get("game_id", [""])[0], int(params.get("min_rtp", [0])[0]) or None),
+                    ensure_ascii=False
+                ).encode()
+            except KeyError as e:
+                status, body = "404 Not Found", json.dumps({"error": f"unknown game_id {e}"}).encode()
+            except ValueError as e:
+                status, body = "400 Bad Request", json.dumps({"error": str(e)}).encode()
+        else:
+            status, body = "404 Not Found", b"not found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
 
-# =============================================================================
-# TELEGRAM MESSAGE FORMATTING
-# =============================================================================
 
-def format_single_game_message(game: Dict, valid_until: str) -> str:
+async def start_metrics_server(port: int = METRICS_PORT) -> Optional[asyncio.AbstractServer]:
     """
-    Formats a Telegram message for a SINGLE high RTP game.
-    Each game gets its own message with its own picture.
+    Serves /metrics (plus the /diagnostics full dump and /schedule lookups)
+    on the running event loop.
     
     Args:
-        game: Single game dictionary with RTP >= 80%
-        valid_until: Time string when the prediction expires
+        port: TCP port (0 disables the endpoint)
     
     Returns:
-        Formatted HTML message for one game
+        The server, or None when disabled
     """
-    lines = []
-    
-    # Header
-    
-    # Game info
-    lines.append(f"🎮 {game['display_name']}")
-    lines.append("")
-    lines.append(f"📊 <b>Porcentagem (RTP):</b> {game['rtp']}%\n")
-    lines.append(f"🎯 <b>Estratégia de Apostas:</b>")
-    lines.append(f"Normal: {game['strategy']['normal']} X")
-    lines.append(f"Auto: {game['strategy']['auto']}")
-    lines.append(f"Turbo: {game['strategy']['turbo']}\n")
-    lines.append(f"⏳ <b>Válido até:</b> {valid_until}\n")
-    lines.append("Jogue agora e ganhe!")
-    lines.append("Boa sorte! 🍀")
-    
-    return "\n".join(lines)
+    if not port:
+        return None
+    server = await asyncio.start_server(_handle_metrics_request, "0.0.0.0", port)
+    log.info(f"📈 Métricas em http://0.0.0.0:{port}/metrics")
+    return server
+
+
+# =============================================================================
+# INTERVAL SNAPSHOTS - ONE CATALOG EVALUATION PER 3-MINUTE INTERVAL
+# Every channel query and the debug report read from the same snapshot, so
+# a cycle never mixes time seeds across an interval boundary.
+# =============================================================================
+
+# Number of recent intervals kept in memory
+SNAPSHOT_CACHE_SIZE = 3
 
 
-def get_game_image_path(game: Dict) -> str:
+class IntervalSnapshot:
     """
-    Gets the image path for a specific game.
+    Evaluated catalog for one 3-minute interval.
+    
+    Attributes:
+        time_seed: Time seed of the interval
+        interval_start: São Paulo datetime when the interval starts
+        valid_until: São Paulo datetime when the interval ends
+        catalog: Game catalog the arrays are aligned with
+        rtp, normal, auto_index, turbo_index, multiplier_index:
+            int32 arrays from evaluate_games_batch()
+    """
+    __slots__ = (
+        "time_seed", "interval_start", "valid_until", "catalog",
+        "rtp", "normal", "auto_index", "turbo_index", "multiplier_index"
+    )
+    
+    def __init__(self, catalog: GameCatalog, interval_start: datetime, results: Dict[str, np.ndarray]):
+        self.time_seed = get_time_seed(interval_start)
+        self.interval_start = interval_start
+        self.valid_until = interval_start + timedelta(minutes=3)
+        self.catalog = catalog
+        self.rtp = results["rtp"]
+        self.normal = results["normal"]
+        self.auto_index = results["auto_index"]
+        self.turbo_index = results["turbo_index"]
+        self.multiplier_index = results["multiplier_index"]
+    
+    def prediction(self, index: int) -> GamePrediction:
+        """Builds the GamePrediction for one catalog index."""
+        return GamePrediction(
+            self.catalog.records[index],
+            rtp=int(self.rtp[index]),
+            normal=int(self.normal[index]),
+            auto=CONFIG["auto_options"][self.auto_index[index]],
+            turbo=CONFIG["turbo_options"][self.turbo_index[index]],
+            multiplier=CONFIG["multipliers"][self.multiplier_index[index]]
+        )
+    
+    def hot_mask(self, threshold: Optional[int] = None) -> np.ndarray:
+        """Boolean mask of games with RTP >= threshold (defaults to CONFIG)."""
+        if threshold is None:
+            threshold = CONFIG["rtp_threshold"]
+        return self.rtp >= threshold
+
+
+_snapshot_cache: "OrderedDict[int, IntervalSnapshot]" = OrderedDict()
+
+
+def get_interval_snapshot(now: Optional[datetime] = None, catalog: GameCatalog = None) -> IntervalSnapshot:
+    """
+    Gets the snapshot for the interval containing a São Paulo time.
+    The catalog is evaluated at most once per interval; older intervals
+    are evicted once more than SNAPSHOT_CACHE_SIZE are cached.
     
     Args:
-        game: Game dictionary
+        now: São Paulo time (defaults to current time)
+        catalog: Game catalog (defaults to get_catalog())
     
     Returns:
-        Full path to the image file
+        IntervalSnapshot for that interval
     """
-    return f"{IMAGE_BASE_PATH}{game['image_file']}"
+    if catalog is None:
+        catalog = get_catalog()
+    interval_start = get_interval_start(now)
+    time_seed = get_time_seed(interval_start)
+    
+    snapshot = _snapshot_cache.get(time_seed)
+    if snapshot is not None and snapshot.catalog is catalog and snapshot.interval_start == interval_start:
+        _snapshot_cache.move_to_end(time_seed)
+        return snapshot
+    
+    # Precomputed by the forecast table when available, otherwise evaluated now
+    snapshot = None
+    if _forecast_table is not None:
+        with COMPUTE_SECONDS.time(source="forecast"):
+            snapshot = _forecast_table.snapshot(interval_start, catalog)
+    if snapshot is None:
+        with COMPUTE_SECONDS.time(source="batch"):
+            snapshot = IntervalSnapshot(catalog, interval_start, evaluate_games_batch(catalog.hashes, time_seed))
+    _snapshot_cache[time_seed] = snapshot
+    while len(_snapshot_cache) > SNAPSHOT_CACHE_SIZE:
+        _snapshot_cache.popitem(last=False)
+    
+    return snapshot
 
 
 # =============================================================================
-# TELEGRAM BOT FUNCTIONS
+# LOOKAHEAD FORECAST - NEXT N INTERVALS PRECOMPUTED
+# RTP values depend only on the time seed and the game hash, so upcoming
+# intervals are computed ahead of time by a process pool into a memory-mapped
+# table. At the interval boundary the send loop only reads a row from it.
 # =============================================================================
 
-# Initialize bot
-bot = Bot(token=BOT_TOKEN)
+# Number of upcoming intervals kept precomputed (480 x 3 minutes = 24 hours)
+FORECAST_INTERVALS = int(os.getenv("FORECAST_INTERVALS", "480"))
+
+# Worker processes used to fill the table
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", "2"))
+
+# Refresh once fewer than this many intervals remain ahead
+FORECAST_REFRESH_BELOW = FORECAST_INTERVALS // 2
+
+FORECAST_META_FILE = os.path.join(CACHE_DIR, "forecast.json")
 
+# Column order of the forecast table's last axis
+FORECAST_FIELDS = ("rtp", "normal", "auto_index", "turbo_index", "multiplier_index")
 
-async def send_prediction(channel_id: str, provider_filter: str = "ALL", channel_name: str = ""):
+
+def get_interval_starts(start: datetime, count: int) -> List[datetime]:
     """
-    Sends prediction messages to a Telegram channel.
-    Each game with RTP >= 80% gets its OWN separate message with its own picture.
+    Lists consecutive 3-minute interval starts.
     
     Args:
-        channel_id: Telegram channel ID (e.g., "@PPSinaisPOP")
-        provider_filter: "ALL" for all games, or specific provider name
-        channel_name: Display name for logging
-    """
-    # Get games with RTP >= 80% filtered by provider
-    high_rtp_games = get_high_rtp_games(provider_filter)
-    
-    if not high_rtp_games:
-        display_name = channel_name if channel_name else channel_id
-        provider_info = f" ({provider_filter})" if provider_filter != "ALL" else ""
-        print(f"📊 {display_name}{provider_info}: Nenhum jogo com RTP >= 80% neste momento")
-        return
-    
-    # Calculate valid until time (3 minutes from now, aligned with website)
-    now = datetime.now(SAO_PAULO_TZ)
-    current_minute = now.minute
-    next_update_minute = ((current_minute // 3) + 1) * 3
-    
-    # Handle hour rollover
-    if next_update_minute >= 60:
-        valid_until = now.replace(minute=next_update_minute - 60) + timedelta(hours=1)
-    else:
-        valid_until = now.replace(minute=next_update_minute, second=0, microsecond=0)
+        start: First interval start (São Paulo time)
+        count: Number of intervals
     
-    valid_until_str = valid_until.strftime("%H:%M")
-
-    # Create keyboard (same for all messages)
-    keyboard = InlineKeyboardMarkup([
-        [InlineKeyboardButton("🎁 BOT BÔNUS", url=LINK_URL)]
-    ])
+    Returns:
+        List of São Paulo datetimes
+    """
+    return [SAO_PAULO_TZ.normalize(start + timedelta(minutes=3 * i)) for i in range(count)]
 
-    # Send a SEPARATE message for EACH high RTP game
-    sent_count = 0
-    for game in high_rtp_games:
-        # Format message for this specific game
-        caption = format_single_game_message(game, valid_until_str)
-        
-        # Get image path for this specific game
-        image_path = get_game_image_path(game)
 
-        try:
-            with open(image_path, "rb") as photo:
-                await bot.send_photo(
-                    chat_id=channel_id,
-                    photo=photo,
-                    caption=caption,
-                    parse_mode="HTML",
-                    reply_markup=keyboard
-                )
-                
-            print(f"✅ Enviado: {game['display_name']} (RTP: {game['rtp']}%)")
-            sent_count += 1
-            
-            # Small delay between messages to avoid rate limiting
-            await asyncio.sleep(1)
-                
-        except FileNotFoundError:
-            print(f"❌ Imagem não encontrada: {image_path}")
-            # Try sending without image
-            try:
-                await bot.send_message(
-                    chat_id=channel_id,
-                    text=caption,
-                    parse_mode="HTML",
-                    reply_markup=keyboard
-                )
-                print(f"✅ Mensagem enviada sem imagem: {game['display_name']}")
-                sent_count += 1
-            except Exception as e:
-                print(f"❌ Erro ao enviar mensagem: {e}")
-            
-        except Exception as e:
-            print(f"❌ Erro ao enviar {game['display_name']}: {e}")
-    
-    display_name = channel_name if channel_name else channel_id
-    provider_info = f" ({provider_filter})" if provider_filter != "ALL" else ""
-    print(f"📤 Total enviado para {display_name}{provider_info}: {sent_count}/{len(high_rtp_games)} jogos")
+def _fill_forecast_rows(path: str, rows: List[int], hashes: np.ndarray, time_seeds: List[int]):
+    """Process pool worker: evaluates some intervals and writes their rows in place."""
+    data = np.load(path, mmap_mode="r+")
+    for row, time_seed in zip(rows, time_seeds):
+        results = evaluate_games_batch(hashes, time_seed)
+        for column, field in enumerate(FORECAST_FIELDS):
+            data[row, :, column] = results[field]
+    data.flush()
 
 
-def verify_hash_calculation():
+class ForecastTable:
+    """
+    Read-only view of a precomputed forecast.
+    
+    Attributes:
+        catalog: Game catalog the table was computed for
+        interval_starts: São Paulo datetime of each row
+        time_seeds: Time seed of each row
+        data: uint8 array shaped (intervals, games, len(FORECAST_FIELDS))
+    """
+    __slots__ = ("catalog", "interval_starts", "time_seeds", "data", "_row_by_seed")
+    
+    def __init__(self, catalog: GameCatalog, interval_starts: List[datetime], data: np.ndarray):
+        self.catalog = catalog
+        self.interval_starts = interval_starts
+        self.time_seeds = [get_time_seed(start) for start in interval_starts]
+        self.data = data
+        # Seeds can repeat across a month boundary (same values); keep the first row
+        self._row_by_seed = {}
+        for row, seed in enumerate(self.time_seeds):
+            self._row_by_seed.setdefault(seed, row)
+    
+    def row_of(self, time_seed: int) -> Optional[int]:
+        """Returns the row holding a time seed, or None if not covered."""
+        return self._row_by_seed.get(time_seed)
+    
+    def remaining(self, now: Optional[datetime] = None) -> int:
+        """Number of intervals covered from the current one onwards."""
+        row = self.row_of(get_time_seed(get_interval_start(now)))
+        return 0 if row is None else len(self.time_seeds) - row
+    
+    def snapshot(self, interval_start: datetime, catalog: GameCatalog) -> Optional[IntervalSnapshot]:
+        """
+        Builds the snapshot of an interval from the table.
+        
+        Args:
+            interval_start: Start of the interval
+            catalog: Catalog the snapshot must be aligned with
+        
+        Returns:
+            IntervalSnapshot, or None if the interval or catalog is not covered
+        """
+        if catalog.fingerprint != self.catalog.fingerprint:
+            return None
+        row = self.row_of(get_time_seed(interval_start))
+        if row is None:
+            return None
+        results = {
+            field: self.data[row, :, column].astype(np.int32)
+            for column, field in enumerate(FORECAST_FIELDS)
+        }
+        return IntervalSnapshot(catalog, interval_start, results)
+
+
+def load_forecast(catalog: GameCatalog, meta_path: str = FORECAST_META_FILE) -> Optional[ForecastTable]:
+    """
+    Loads the forecast saved by a previous run, if it matches the catalog.
+    
+    Args:
+        catalog: Current game catalog
+        meta_path: Location of the forecast metadata file
+    
+    Returns:
+        ForecastTable, or None if missing, stale or unreadable
+    """
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["fingerprint"] != catalog.fingerprint:
+            return None
+        data = np.load(os.path.join(os.path.dirname(meta_path), meta["data_file"]), mmap_mode="r")
+        interval_starts = get_interval_starts(datetime.fromisoformat(meta["start"]).astimezone(SAO_PAULO_TZ), meta["intervals"])
+        if data.shape != (len(interval_starts), len(catalog), len(FORECAST_FIELDS)):
+            return None
+        # Tables left zeroed by an interrupted or broken build are rebuilt
+        if len(catalog) and int(data[..., 0].min()) < CONFIG["rtp_min"]:
+            return None
+        return ForecastTable(catalog, interval_starts, data)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def build_forecast(
+    catalog: GameCatalog,
+    start: datetime,
+    intervals: int = FORECAST_INTERVALS,
+    previous: Optional[ForecastTable] = None,
+    workers: int = FORECAST_WORKERS,
+    meta_path: str = FORECAST_META_FILE
+) -> ForecastTable:
+    """
+    Computes the forecast for the next intervals and saves it to disk.
+    Rows already present in the previous table are copied instead of
+    recomputed, so rolling the window forward only evaluates new intervals.
+    
+    Args:
+        catalog: Game catalog
+        start: First interval start (São Paulo time)
+        intervals: Number of intervals to cover
+        previous: Previous table to reuse rows from
+        workers: Worker processes for the new rows
+        meta_path: Location of the forecast metadata file
+    
+    Returns:
+        New ForecastTable backed by a memory-mapped file
+    """
+    cache_dir = os.path.dirname(meta_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    interval_starts = get_interval_starts(start, intervals)
+    time_seeds = [get_time_seed(s) for s in interval_starts]
+    # Every build gets its own file: the previous table may still be mapped
+    # from a file with the same seed and fingerprint
+    data_file = f"forecast-{time_seeds[0]}-{catalog.fingerprint[:12]}-{time.time_ns():x}.npy"
+    data_path = os.path.join(cache_dir, data_file)
+    
+    data = np.lib.format.open_memmap(
+        data_path, mode="w+", dtype=np.uint8,
+        shape=(intervals, len(catalog), len(FORECAST_FIELDS))
+    )
+    
+    missing = []
+    reusable = previous is not None and previous.catalog.fingerprint == catalog.fingerprint
+    for row, time_seed in enumerate(time_seeds):
+        old_row = previous.row_of(time_seed) if reusable else None
+        if old_row is not None:
+            data[row] = previous.data[old_row]
+        else:
+            missing.append(row)
+    data.flush()
+    del data
+    
+    if missing:
+        chunks = [missing[i::max(1, workers)] for i in range(max(1, workers))]
+        chunks = [chunk for chunk in chunks if chunk]
+        jobs = [(data_path, chunk, catalog.hashes, [time_seeds[row] for row in chunk]) for chunk in chunks]
+        if len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                for future in [pool.submit(_fill_forecast_rows, *job) for job in jobs]:
+                    future.result()
+        else:
+            _fill_forecast_rows(*jobs[0])
+    
+    # Publish the new table, then drop the data files it replaces
+    meta = {
+        "fingerprint": catalog.fingerprint,
+        "start": interval_starts[0].isoformat(),
+        "intervals": intervals,
+        "data_file": data_file
+    }
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+    
+    for name in os.listdir(cache_dir):
+        if name.startswith("forecast-") and name.endswith(".npy") and name != data_file:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    
+    log.info(f"🔮 Previsão atualizada: {intervals} intervalos ({len(missing)} calculados)")
+    return ForecastTable(catalog, interval_starts, np.load(data_path, mmap_mode="r"))
+
+
+_forecast_table: Optional[ForecastTable] = None
+
+
+def forecast_needs_refresh(catalog: GameCatalog = None) -> bool:
+    """True when the forecast is missing, stale or running out of intervals."""
+    if catalog is None:
+        catalog = get_catalog()
+    return (
+        _forecast_table is None
+        or _forecast_table.catalog.fingerprint != catalog.fingerprint
+        or _forecast_table.remaining() < FORECAST_REFRESH_BELOW
+    )
+
+
+async def refresh_forecast(catalog: GameCatalog = None):
+    """
+    Rolls the forecast forward without blocking the event loop.
+    On first use the table saved by a previous run is reused when valid.
+    
+    Args:
+        catalog: Game catalog (defaults to get_catalog())
+    """
+    global _forecast_table
+    if catalog is None:
+        catalog = get_catalog()
+    
+    previous = _forecast_table
+    if previous is None:
+        previous = load_forecast(catalog)
+        if previous is not None and previous.remaining() >= FORECAST_REFRESH_BELOW:
+            _forecast_table = previous
+            log.info(f"🔮 Previsão carregada do disco: {previous.remaining()} intervalos restantes")
+            return
+    
+    start = get_interval_start()
+    if (
+        previous is not None
+        and previous.catalog.fingerprint == catalog.fingerprint
+        and previous.interval_starts[0] == start
+        and len(previous.interval_starts) == FORECAST_INTERVALS
+    ):
+        # Same intervals, same catalog: nothing to rebuild
+        _forecast_table = previous
+        return
+    
+    loop = asyncio.get_running_loop()
+    try:
+        _forecast_table = await loop.run_in_executor(
+            None, build_forecast, catalog, start, FORECAST_INTERVALS, previous
+        )
+    except Exception as e:
+        # Snapshots fall back to computing the interval on demand
+        log.error(f"❌ Erro ao atualizar previsão: {e}")
+
+
+# =============================================================================
+# SCHEDULE INDEX - WHEN IS EACH GAME HOT NEXT?
+# Inverted index game -> upcoming intervals with RTP >= SCHEDULE_MIN_RTP,
+# sorted by time. Each update only evaluates the intervals that entered the
+# horizon (read from the forecast table when it covers them) and trims the
+# ones that rolled off, so queries are a bisect over one game's list.
+# =============================================================================
+
+# Intervals ahead covered by the schedule (480 x 3 minutes = 24 hours)
+SCHEDULE_HORIZON_INTERVALS = int(os.getenv("SCHEDULE_HORIZON_INTERVALS", str(FORECAST_INTERVALS)))
+
+# Lowest RTP indexed; queries can ask for a higher minimum, not a lower one
+SCHEDULE_MIN_RTP = int(os.getenv("SCHEDULE_MIN_RTP", str(CONFIG["rtp_threshold"])))
+
+INTERVAL_SECONDS = 3 * 60
+
+
+def get_interval_number(now: Optional[datetime] = None) -> int:
+    """
+    Number of the 3-minute interval containing a time. Unlike time seeds,
+    consecutive intervals have consecutive numbers.
+    """
+    if now is None:
+        now = datetime.now(SAO_PAULO_TZ)
+    return int(now.timestamp()) // INTERVAL_SECONDS
+
+
+def get_interval_datetime(number: int) -> datetime:
+    """Start of an interval number as São Paulo time."""
+    return datetime.fromtimestamp(number * INTERVAL_SECONDS, SAO_PAULO_TZ)
+
+
+class ScheduleIndex:
+    """
+    Upcoming hot intervals of every game.
+    
+    Attributes:
+        min_rtp: Lowest RTP indexed
+        horizon: Number of intervals covered from the current one
+        catalog: Catalog the index was built for
+        first_interval: First covered interval number
+        end_interval: Interval number after the last covered one
+    """
+    
+    def __init__(self, min_rtp: int = SCHEDULE_MIN_RTP, horizon: int = SCHEDULE_HORIZON_INTERVALS):
+        self.min_rtp = min_rtp
+        self.horizon = horizon
+        self.catalog: Optional[GameCatalog] = None
+        self.first_interval = 0
+        self.end_interval = 0
+        # Per catalog index: hot interval numbers (ascending) and their RTPs
+        self._intervals: List[List[int]] = []
+        self._rtps: List[List[int]] = []
+    
+    def _rtp_rows(self, catalog: GameCatalog, forecast: Optional[ForecastTable], numbers: range) -> np.ndarray:
+        """RTP of every game in each interval, shaped (intervals, games)."""
+        rows = np.empty((len(numbers), len(catalog)), dtype=np.uint8)
+        covered = forecast is not None and forecast.catalog.fingerprint == catalog.fingerprint
+        for i, number in enumerate(numbers):
+            time_seed = get_time_seed(get_interval_datetime(number))
+            row = forecast.row_of(time_seed) if covered else None
+            if row is not None:
+                rows[i] = forecast.data[row, :, 0]
+            else:
+                rows[i] = evaluate_games_batch(catalog.hashes, time_seed)["rtp"]
+        return rows
+    
+    def update(
+        self,
+        catalog: GameCatalog = None,
+        forecast: Optional[ForecastTable] = None,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Rolls the index forward to cover [current interval, current + horizon).
+        A catalog change (or a gap longer than the horizon) rebuilds it.
+        
+        Args:
+            catalog: Game catalog (defaults to get_catalog())
+            forecast: Forecast to read RTPs from (defaults to the current one)
+            now: Current São Paulo time (defaults to now)
+        
+        Returns:
+            Number of intervals added
+        """
+        if catalog is None:
+            catalog = get_catalog()
+        if forecast is None:
+            forecast = _forecast_table
+        current = get_interval_number(now)
+        
+        if self.catalog is None or self.catalog.fingerprint != catalog.fingerprint or current >= self.end_interval:
+            self.catalog = catalog
+            self._intervals = [[] for _ in range(len(catalog))]
+            self._rtps = [[] for _ in range(len(catalog))]
+            self.first_interval = self.end_interval = current
+        
+        # Drop intervals that rolled off
+        if current > self.first_interval:
+            for intervals, rtps in zip(self._intervals, self._rtps):
+                cut = bisect.bisect_left(intervals, current)
+                if cut:
+                    del intervals[:cut]
+                    del rtps[:cut]
+            self.first_interval = current
+        
+        # Index the intervals that entered the horizon
+        numbers = range(self.end_interval, current + self.horizon)
+        if numbers:
+            rows = self._rtp_rows(catalog, forecast, numbers)
+            games, offsets = np.nonzero(rows.T >= self.min_rtp)
+            bounds = np.searchsorted(games, np.arange(len(catalog) + 1))
+            for game in np.flatnonzero(np.diff(bounds)):
+                hot = offsets[bounds[game]:bounds[game + 1]]
+                self._intervals[game].extend((hot + numbers.start).tolist())
+                self._rtps[game].extend(rows[hot, game].tolist())
+            self.end_interval = numbers.stop
+        return len(numbers)
+    
+    def _entries(self, game_id: str, min_rtp: Optional[int]) -> Tuple[List[int], List[int], int]:
+        if min_rtp is None:
+            min_rtp = self.min_rtp
+        elif min_rtp < self.min_rtp:
+            raise ValueError(f"min_rtp {min_rtp} is below the indexed minimum {self.min_rtp}")
+        if self.catalog is None:
+            self.update()
+        index = self.catalog.index_of(game_id)
+        return self._intervals[index], self._rtps[index], min_rtp
+    
+    def upcoming(
+        self,
+        game_id: str,
+        now: Optional[datetime] = None,
+        min_rtp: Optional[int] = None,
+        limit: int = 10
+    ) -> List[Tuple[datetime, int]]:
+        """
+        Next hot intervals of a game.
+        
+        Args:
+            game_id: Game to look up (KeyError if unknown)
+            now: Reference São Paulo time (defaults to now)
+            min_rtp: Minimum RTP (defaults to min_rtp)
+            limit: Maximum number of intervals returned
+        
+        Returns:
+            (interval start, RTP) pairs in time order
+        """
+        intervals, rtps, min_rtp = self._entries(game_id, min_rtp)
+        result = []
+        for i in range(bisect.bisect_left(intervals, get_interval_number(now)), len(intervals)):
+            if rtps[i] >= min_rtp:
+                result.append((get_interval_datetime(intervals[i]), rtps[i]))
+                if len(result) >= limit:
+                    break
+        return result
+    
+    def next_hot(
+        self,
+        game_id: str,
+        now: Optional[datetime] = None,
+        min_rtp: Optional[int] = None
+    ) -> Optional[Tuple[datetime, int]]:
+        """
+        First interval from now on where a game is hot.
+        
+        Returns:
+            (interval start, RTP), or None if not hot within the horizon
+        """
+        upcoming = self.upcoming(game_id, now, min_rtp, limit=1)
+        return upcoming[0] if upcoming else None
+    
+    def hot_count(
+        self,
+        game_id: str,
+        start: datetime,
+        end: datetime,
+        min_rtp: Optional[int] = None
+    ) -> int:
+        """
+        Number of hot intervals of a game overlapping [start, end).
+        Only intervals within the horizon are counted.
+        """
+        intervals, rtps, min_rtp = self._entries(game_id, min_rtp)
+        lo = bisect.bisect_left(intervals, get_interval_number(start))
+        hi = bisect.bisect_left(intervals, -(-int(end.timestamp()) // INTERVAL_SECONDS))
+        if min_rtp == self.min_rtp:
+            return hi - lo
+        return sum(1 for rtp in rtps[lo:hi] if rtp >= min_rtp)
+    
+    def best_window_today(
+        self,
+        game_id: str,
+        length: int = 1,
+        now: Optional[datetime] = None,
+        min_rtp: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Best window of `length` consecutive intervals in the rest of today
+        (São Paulo): the most hot intervals, ties broken by total RTP.
+        
+        Args:
+            game_id: Game to look up (KeyError if unknown)
+            length: Window size in intervals (1 = best single interval)
+            now: Reference São Paulo time (defaults to now)
+            min_rtp: Minimum RTP (defaults to min_rtp)
+        
+        Returns:
+            Dictionary with start, end, hot_intervals and max_rtp, or None
+            if the game is not hot again today
+        """
+        if now is None:
+            now = datetime.now(SAO_PAULO_TZ)
+        intervals, rtps, min_rtp = self._entries(game_id, min_rtp)
+        midnight = SAO_PAULO_TZ.localize(datetime(now.year, now.month, now.day) + timedelta(days=1))
+        lo = bisect.bisect_left(intervals, get_interval_number(now))
+        hi = bisect.bisect_left(intervals, get_interval_number(midnight))
+        hot = [(intervals[i], rtps[i]) for i in range(lo, hi) if rtps[i] >= min_rtp]
+        
+        best = None
+        end = 0
+        total = 0
+        for start, (first, _) in enumerate(hot):
+            # Two pointers: hot[start:end] lies inside [first, first + length)
+            while end < len(hot) and hot[end][0] < first + length:
+                total += hot[end][1]
+                end += 1
+            key = (end - start, total)
+            if best is None or key > best[0]:
+                best = (key, first, max(rtp for _, rtp in hot[start:end]))
+            total -= hot[start][1]
+        if best is None:
+            return None
+        (count, _), first, max_rtp = best
+        return {
+            "start": get_interval_datetime(first),
+            "end": min(get_interval_datetime(first + length), midnight),
+            "hot_intervals": count,
+            "max_rtp": max_rtp,
+        }
+
+
+SCHEDULE = ScheduleIndex()
+
+
+def schedule_summary(game_id: str, min_rtp: Optional[int] = None, now: Optional[datetime] = None) -> Dict:
+    """
+    JSON-ready answer to "when is this game hot next?".
+    
+    Raises:
+        KeyError: Unknown game_id
+        ValueError: min_rtp below SCHEDULE_MIN_RTP
+    """
+    if now is None:
+        now = datetime.now(SAO_PAULO_TZ)
+    next_hot = SCHEDULE.next_hot(game_id, now, min_rtp)
+    best = SCHEDULE.best_window_today(game_id, now=now, min_rtp=min_rtp)
+    return {
+        "game_id": game_id,
+        "min_rtp": min_rtp or SCHEDULE.min_rtp,
+        "next_hot": None if next_hot is None else {"start": next_hot[0].isoformat(), "rtp": next_hot[1]},
+        "hot_next_hour": SCHEDULE.hot_count(game_id, now, now + timedelta(hours=1), min_rtp),
+        "best_interval_today": None if best is None else {
+            "start": best["start"].isoformat(), "rtp": best["max_rtp"]
+        },
+        "upcoming": [
+            {"start": start.isoformat(), "rtp": rtp} for start, rtp in SCHEDULE.upcoming(game_id, now, min_rtp)
+        ],
+    }
+
+
+# =============================================================================
+# IMAGE AVAILABILITY INDEX
+# One os.scandir() of the images folder instead of an os.path.exists() per
+# game per channel. The scan is repeated only when the directory's mtime
+# changes (files added, removed or renamed).
+# =============================================================================
+
+class ImageIndex:
+    """
+    Set of image file names present in the images folder.
+    
+    Attributes:
+        changed: Paths of files whose mtime or size differed in the last rescan
+    """
+    
+    def __init__(self, directory: str = IMAGE_BASE_PATH):
+        self.directory = directory
+        self.version = 0
+        self.changed = frozenset()
+        self._names = frozenset()
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._mtime_ns = None
+        self._mask_cache = None
+        self._reported = set()
+    
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Rescans the folder if its mtime changed.
+        
+        Args:
+            force: Rescan even if the mtime is unchanged
+        
+        Returns:
+            True if the folder was rescanned
+        """
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        if not force and mtime_ns == self._mtime_ns:
+            return False
+        
+        stats = {}
+        if mtime_ns != -1:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        self.changed = frozenset(
+            os.path.join(self.directory, name) for name, signature in stats.items()
+            if self._stats.get(name, signature) != signature
+        )
+        self._names = frozenset(stats)
+        self._stats = stats
+        self._mtime_ns = mtime_ns
+        self.version += 1
+        return True
+    
+    def has_image(self, game: GameRecord) -> bool:
+        """O(1) check whether a game's image file exists."""
+        if self._mtime_ns is None:
+            self.refresh()
+        return game.image_file in self._names
+    
+    def availability_mask(self, catalog: GameCatalog) -> np.ndarray:
+        """
+        Boolean mask of catalog games whose image exists.
+        Cached until the catalog or the folder contents change.
+        """
+        if self._mtime_ns is None:
+            self.refresh()
+        cached = self._mask_cache
+        if cached is not None and cached[0] is catalog and cached[1] == self.version:
+            return cached[2]
+        mask = np.array([record.image_file in self._names for record in catalog], dtype=bool)
+        self._mask_cache = (catalog, self.version, mask)
+        return mask
+    
+    def report_missing(self, catalog: GameCatalog):
+        """Logs catalog entries whose image is missing (each entry once)."""
+        missing = [
+            record for record in catalog
+            if not self.has_image(record) and record.game_id not in self._reported
+        ]
+        if not missing:
+            return
+        log.warning(
+            f"⚠️ {len(missing)} jogo(s) sem imagem em {self.directory} (não serão enviados)",
+            extra={"fields": {"missing": [f"{record.display_name}: {record.image_file}" for record in missing]}}
+        )
+        self._reported.update(record.game_id for record in missing)
+
+
+IMAGE_INDEX = ImageIndex()
+
+
+# =============================================================================
+# GAME QUERIES - FILTER AND TOP-K OVER AN INTERVAL SNAPSHOT
+# Queries start from the provider's pre-partitioned index array, so their cost
+# grows with the matching games rather than the whole catalog, and pick the
+# top K with np.argpartition instead of sorting every match.
+# =============================================================================
+
+# Multiplier type of each CONFIG["multipliers"] entry, as codes
+MULTIPLIER_TYPES = sorted({m["type"] for m in CONFIG["multipliers"]})
+MULTIPLIER_TYPE_CODES = np.array([MULTIPLIER_TYPES.index(m["type"]) for m in CONFIG["multipliers"]], dtype=np.int32)
+
+
+class GameQuery:
+    """
+    Composable filter over one interval's results.
+    
+    Attributes:
+        providers: Upper-case provider names, or None for all providers
+        rtp_min: Minimum RTP (inclusive), defaults to CONFIG["rtp_threshold"]
+        rtp_max: Maximum RTP (inclusive), or None
+        multiplier_types: Allowed multiplier types ("low", "medium", "high"), or None
+        limit: Maximum number of games returned
+        require_image: Skip games whose image file doesn't exist
+    """
+    __slots__ = ("providers", "rtp_min", "rtp_max", "multiplier_types", "limit", "require_image")
+    
+    def __init__(
+        self,
+        providers=None,
+        rtp_min: Optional[int] = None,
+        rtp_max: Optional[int] = None,
+        multiplier_types=None,
+        limit: Optional[int] = None,
+        require_image: bool = True
+    ):
+        if isinstance(providers, str):
+            providers = None if providers.upper() == "ALL" else [providers]
+        self.providers = None if providers is None else frozenset(p.upper() for p in providers)
+        self.rtp_min = CONFIG["rtp_threshold"] if rtp_min is None else rtp_min
+        self.rtp_max = rtp_max
+        self.multiplier_types = None if multiplier_types is None else frozenset(multiplier_types)
+        self.limit = MAX_GAMES_PER_NOTIFICATION if limit is None else limit
+        self.require_image = require_image
+    
+    def replace(self, **changes) -> "GameQuery":
+        """Returns a copy of the query with some filters changed."""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return GameQuery(**fields)
+    
+    def matching_indexes(self, snapshot: IntervalSnapshot) -> np.ndarray:
+        """
+        Catalog indexes of every game passing the filters (unordered by RTP).
+        
+        Args:
+            snapshot: Interval snapshot to filter
+        
+        Returns:
+            Sorted index array
+        """
+        catalog = snapshot.catalog
+        indexes = catalog.provider_indexes(self.providers)
+        rtp = snapshot.rtp[indexes]
+        
+        mask = rtp >= self.rtp_min
+        if self.rtp_max is not None:
+            mask &= rtp <= self.rtp_max
+        if self.multiplier_types is not None:
+            allowed = [MULTIPLIER_TYPES.index(t) for t in self.multiplier_types if t in MULTIPLIER_TYPES]
+            mask &= np.isin(MULTIPLIER_TYPE_CODES[snapshot.multiplier_index[indexes]], allowed)
+        if self.require_image:
+            mask &= IMAGE_INDEX.availability_mask(catalog)[indexes]
+        
+        return indexes[mask]
+    
+    def top_indexes(self, snapshot: IntervalSnapshot) -> np.ndarray:
+        """
+        Catalog indexes of the top `limit` matches, highest RTP first.
+        Ties keep catalog order, exactly like a stable sort by RTP.
+        
+        Args:
+            snapshot: Interval snapshot to query
+        
+        Returns:
+            Index array of at most `limit` games
+        """
+        indexes = self.matching_indexes(snapshot)
+        if self.limit <= 0 or len(indexes) == 0:
+            return indexes[:0]
+        
+        # Unique sort key: RTP descending, then catalog index ascending
+        keys = (-snapshot.rtp[indexes].astype(np.int64)) * len(snapshot.catalog) + indexes
+        if len(indexes) > self.limit:
+            selected = np.argpartition(keys, self.limit - 1)[:self.limit]
+            indexes, keys = indexes[selected], keys[selected]
+        return indexes[np.argsort(keys)]
+    
+    def run(self, snapshot: IntervalSnapshot) -> List[GamePrediction]:
+        """Top matches of the query as GamePrediction records."""
+        return [snapshot.prediction(i) for i in self.top_indexes(snapshot)]
+
+
+def get_channel_query(channel_cfg: Dict, tenant: "Tenant" = None) -> GameQuery:
+    """
+    Builds the query for a channel configuration entry.
+    
+    Optional keys besides "provider": "rtp_min", "rtp_max",
+    "multiplier_types" and "max_games".
+    
+    Args:
+        channel_cfg: Channel configuration
+        tenant: Tenant whose threshold and max games are the defaults
+    
+    Returns:
+        GameQuery for the channel
+    """
+    return GameQuery(
+        providers=channel_cfg.get("provider", "ALL"),
+        rtp_min=channel_cfg.get("rtp_min", tenant.rtp_threshold if tenant else None),
+        rtp_max=channel_cfg.get("rtp_max"),
+        multiplier_types=channel_cfg.get("multiplier_types"),
+        limit=channel_cfg.get("max_games", tenant.max_games if tenant else None)
+    )
+
+
+def get_high_rtp_games(provider_filter: str = "ALL", snapshot: IntervalSnapshot = None) -> List[GamePrediction]:
+    """
+    Finds games with RTP >= 80%.
+    Returns only the TOP 5 highest RTP games per channel.
+    Can filter by provider. Skips games where image file doesn't exist.
+    
+    Args:
+        provider_filter: "ALL" for all games, or specific provider name
+                        (e.g., "PG SOFT", "PRAGMATIC PLAY")
+        snapshot: Interval snapshot to read from (defaults to the current interval)
+    
+    Returns:
+        List of top 5 GamePrediction records with RTP >= 80%
+    """
+    if snapshot is None:
+        snapshot = get_interval_snapshot()
+    return GameQuery(providers=provider_filter).run(snapshot)
+
+
+# =============================================================================
+# OPTIMIZED IMAGES - TELEGRAM-FRIENDLY JPEG VARIANTS
+# Each catalog image is converted once to a size-capped JPEG at a fixed
+# resolution, kept only when it is smaller than the source. Results are cached
+# in CACHE_DIR by source content hash, so only new or changed images are
+# reprocessed. Requires Pillow.
+# =============================================================================
+
+OPTIMIZED_IMAGE_DIR = os.path.join(CACHE_DIR, "images")
+
+# Target resolution (the website's game tile size)
+OPTIMIZED_IMAGE_SIZE = (360, 472)
+
+# Upper bound for one JPEG; quality is lowered step by step until it fits and
+# is smaller than the source, otherwise the source is sent as is
+OPTIMIZED_IMAGE_MAX_BYTES = 30 * 1024
+OPTIMIZED_IMAGE_QUALITIES = (85, 80, 75, 70, 65, 60, 55, 50)
+
+# Worker processes used for transcoding
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# source image path -> optimized JPEG path
+_optimized_images: Dict[str, str] = {}
+
+
+def _transcode_image(src_path: str, dst_path: str) -> Tuple[int, int]:
+    """
+    Process pool worker: writes the JPEG variant of one image.
+    When no quality step is smaller than the source, an empty
+    "<dst_path>.orig" marker is written instead and the source is kept.
+    
+    Returns:
+        (source bytes, JPEG bytes or 0 when the source is kept)
+    """
+    src_size = os.path.getsize(src_path)
+    with Image.open(src_path) as img:
+        if img.size != OPTIMIZED_IMAGE_SIZE:
+            img = ImageOps.pad(img.convert("RGB"), OPTIMIZED_IMAGE_SIZE, method=Image.LANCZOS, color=(0, 0, 0))
+        else:
+            img = img.convert("RGB")
+    
+    target = min(OPTIMIZED_IMAGE_MAX_BYTES, src_size - 1)
+    tmp_path = f"{dst_path}.{os.getpid()}.tmp"
+    for quality in OPTIMIZED_IMAGE_QUALITIES:
+        img.save(tmp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+        if os.path.getsize(tmp_path) <= target:
+            os.replace(tmp_path, dst_path)
+            return src_size, os.path.getsize(dst_path)
+    
+    os.remove(tmp_path)
+    open(f"{dst_path}.orig", "wb").close()
+    return src_size, 0
+
+
+def optimize_catalog_images(catalog: GameCatalog = None, workers: int = IMAGE_WORKERS) -> int:
+    """
+    Makes sure every catalog image has an optimized JPEG variant.
+    
+    Args:
+        catalog: Game catalog (defaults to get_catalog())
+        workers: Worker processes for images that need converting
+    
+    Returns:
+        Number of images converted in this call
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    if Image is None:
+        log.warning("⚠️ Pillow não instalado: usando imagens originais")
+        return 0
+    
+    os.makedirs(OPTIMIZED_IMAGE_DIR, exist_ok=True)
+    jobs = {}
+    for record in catalog:
+        try:
+            content_hash = get_image_content_hash(record.image_path)
+        except OSError:
+            continue
+        dst_path = os.path.join(OPTIMIZED_IMAGE_DIR, f"{content_hash}.jpg")
+        if os.path.exists(dst_path):
+            _optimized_images[record.image_path] = dst_path
+        elif os.path.exists(f"{dst_path}.orig"):
+            _optimized_images.pop(record.image_path, None)  # The source is smaller
+        else:
+            jobs[dst_path] = record.image_path
+    
+    if jobs:
+        src_total = out_total = kept = 0
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(_transcode_image, src, dst): (src, dst) for dst, src in jobs.items()}
+            for future, (src_path, dst_path) in futures.items():
+                try:
+                    src_size, out_size = future.result()
+                except Exception as e:
+                    log.error(f"❌ Erro ao otimizar {src_path}: {e}")
+                    continue
+                src_total += src_size
+                if out_size:
+                    out_total += out_size
+                    _optimized_images[src_path] = dst_path
+                else:
+                    out_total += src_size
+                    kept += 1
+                    _optimized_images.pop(src_path, None)
+        log.info(
+            f"🖼️ Imagens otimizadas: {len(jobs)} convertidas ({kept} mantidas no original), "
+            f"{src_total / 1024:.0f} KB -> {out_total / 1024:.0f} KB ({out_total - src_total:+,} bytes), "
+            f"{len(_optimized_images)} disponíveis",
+            extra={"fields": {"converted": len(jobs), "kept_original": kept, "source_bytes": src_total, "output_bytes": out_total}}
+        )
+    
+    return len(jobs)
+
+
+# =============================================================================
+# IMAGE STORE - PRELOADED IMAGE BYTES
+# Images are read into memory at startup so the send path never blocks the
+# event loop on disk I/O. The store is an LRU cache bounded by
+# IMAGE_CACHE_MAX_BYTES; cold reads run in a worker thread.
+# =============================================================================
+
+# Memory cap for cached image bytes
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def _read_image(path: str) -> Tuple[bytes, str]:
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+class ImageStore:
+    """
+    LRU cache of image path -> (bytes, content SHA-256).
+    
+    The bytes objects are handed out as-is (no copies); they are immutable,
+    so every upload of the same image shares one buffer.
+    """
+    
+    def __init__(self, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._images: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._images)
+    
+    def _insert(self, path: str, entry: Tuple[bytes, str]) -> bool:
+        with self._lock:
+            if len(entry[0]) > self.max_bytes:
+                return False
+            old = self._images.pop(path, None)
+            if old is not None:
+                self.total_bytes -= len(old[0])
+            self._images[path] = entry
+            self.total_bytes += len(entry[0])
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.total_bytes -= len(evicted[0])
+            return True
+    
+    def get_cached(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """Returns (bytes, content hash) if the image is in memory, else None."""
+        with self._lock:
+            entry = self._images.get(path)
+            if entry is not None:
+                self._images.move_to_end(path)
+            return entry
+    
+    async def get(self, path: str) -> Tuple[bytes, str]:
+        """
+        Gets an image's bytes and content hash, reading it off-loop if cold.
+        
+        Args:
+            path: Full path to the image file
+        
+        Returns:
+            Tuple of (image bytes, hex SHA-256)
+        
+        Raises:
+            FileNotFoundError: If the image does not exist
+        """
+        entry = self.get_cached(path)
+        if entry is None:
+            entry = await asyncio.to_thread(_read_image, path)
+            self._insert(path, entry)
+        return entry
+    
+    def preload(self, paths: List[str]) -> int:
+        """
+        Reads images into memory until the memory cap is reached.
+        Meant to run in a worker thread at startup.
+        
+        Args:
+            paths: Image paths in priority order
+        
+        Returns:
+            Number of images loaded
+        """
+        loaded = 0
+        for path in paths:
+            if self.get_cached(path) is not None:
+                continue
+            try:
+                entry = _read_image(path)
+            except OSError:
+                continue
+            if self.total_bytes + len(entry[0]) > self.max_bytes:
+                break
+            if self._insert(path, entry):
+                loaded += 1
+        return loaded
+    
+    def invalidate(self, path: str):
+        """Drops an image whose file changed on disk."""
+        with self._lock:
+            entry = self._images.pop(path, None)
+            if entry is not None:
+                self.total_bytes -= len(entry[0])
+
+
+IMAGE_STORE = ImageStore()
+
+
+def forget_changed_images(paths) -> int:
+    """
+    Drops cached bytes and JPEG variants of source images that changed on
+    disk, so the next send reads the new file.
+    
+    Args:
+        paths: Source image paths (ImageIndex.changed)
+    
+    Returns:
+        Number of paths dropped
+    """
+    for path in paths:
+        IMAGE_STORE.invalidate(path)
+        optimized_path = _optimized_images.pop(path, None)
+        if optimized_path is not None:
+            IMAGE_STORE.invalidate(optimized_path)
+    return len(paths)
+
+
+# =============================================================================
+# TELEGRAM MESSAGE FORMATTING
+# =============================================================================
+
+def format_single_game_message(game: GamePrediction, valid_until: str) -> str:
+    """
+    Formats a Telegram message for a SINGLE high RTP game.
+    Each game gets its own message with its own picture.
+    
+    Args:
+        game: Single game prediction with RTP >= 80%
+        valid_until: Time string when the prediction expires
+    
+    Returns:
+        Formatted HTML message for one game
+    """
+    lines = []
+    
+    # Header
+    
+    # Game info
+    lines.append(f"🎮 {game.game.display_name}")
+    lines.append("")
+    lines.append(f"📊 <b>Porcentagem (RTP):</b> {game.rtp}%\n")
+    lines.append(f"🎯 <b>Estratégia de Apostas:</b>")
+    lines.append(f"Normal: {game.normal} X")
+    lines.append(f"Auto: {game.auto}")
+    lines.append(f"Turbo: {game.turbo}\n")
+    lines.append(f"⏳ <b>Válido até:</b> {valid_until}\n")
+    lines.append("Jogue agora e ganhe!")
+    lines.append("Boa sorte! 🍀")
+    
+    return "\n".join(lines)
+
+
+def format_album_footer(valid_until: str) -> str:
+    """
+    Formats the message sent after an album.
+    Albums cannot carry an inline keyboard, so this message holds the button.
+    
+    Args:
+        valid_until: Time string when the prediction expires
+    
+    Returns:
+        Formatted HTML message
+    """
+    lines = []
+    lines.append(f"⏳ <b>Válido até:</b> {valid_until}\n")
+    lines.append("Jogue agora e ganhe!")
+    lines.append("Boa sorte! 🍀")
+    
+    return "\n".join(lines)
+
+
+def get_game_image_path(game: GameRecord) -> str:
+    """
+    Gets the image path for a specific game.
+    Prefers the optimized JPEG variant when one has been generated.
+    
+    Args:
+        game: Game record
+    
+    Returns:
+        Full path to the image file
+    """
+    return _optimized_images.get(game.image_path, game.image_path)
+
+
+# =============================================================================
+# TELEGRAM FILE_ID CACHE
+# Each image is uploaded once; later sends reuse the file_id Telegram gave
+# back. Keyed by image content hash and stored in CACHE_DIR so it survives
+# restarts. Point CACHE_DIR at a Railway volume to also survive redeploys.
+# file_ids only work for the bot that uploaded them, so each tenant has its
+# own cache file.
+# =============================================================================
+
+FILE_ID_CACHE_FILE = os.path.join(CACHE_DIR, "telegram_file_ids.json")
+
+
+def get_file_id_cache_path(tenant_name: str) -> str:
+    """Cache file of one tenant (the default tenant keeps the original file)."""
+    if tenant_name == DEFAULT_TENANT:
+        return FILE_ID_CACHE_FILE
+    return os.path.join(CACHE_DIR, f"telegram_file_ids-{tenant_name}.json")
+
+# image path -> (mtime_ns, size, sha256), so unchanged files are hashed once
+_image_hash_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
+def get_image_content_hash(image_path: str) -> str:
+    """
+    Gets the SHA-256 of an image file, recomputed only when the file changes.
+    
+    Args:
+        image_path: Full path to the image file
+    
+    Returns:
+        Hex SHA-256 of the file contents
+    
+    Raises:
+        FileNotFoundError: If the image does not exist
+    """
+    stat = os.stat(image_path)
+    cached = _image_hash_cache.get(image_path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    
+    with open(image_path, "rb") as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+    _image_hash_cache[image_path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+    return content_hash
+
+
+class FileIdCache:
+    """
+    Persistent mapping of image content hash -> Telegram file_id.
+    """
+    
+    def __init__(self, path: str = FILE_ID_CACHE_FILE):
+        self.path = path
+        self._file_ids: Dict[str, str] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._file_ids = json.load(f)
+        except (OSError, ValueError):
+            pass
+    
+    def __len__(self) -> int:
+        return len(self._file_ids)
+    
+    def get(self, content_hash: str) -> Optional[str]:
+        """Returns the cached file_id for an image, or None."""
+        return self._file_ids.get(content_hash)
+    
+    def put(self, content_hash: str, file_id: str):
+        """Stores the file_id of an uploaded image."""
+        if self._file_ids.get(content_hash) != file_id:
+            self._file_ids[content_hash] = file_id
+            self._save()
+    
+    def discard(self, content_hash: str):
+        """Forgets a file_id Telegram no longer accepts."""
+        if self._file_ids.pop(content_hash, None) is not None:
+            self._save()
+    
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._file_ids, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning(f"⚠️ Não foi possível salvar o cache de file_id: {e}")
+
+
+
+# =============================================================================
+# TELEGRAM RATE LIMITER
+# Telegram's limits: ~30 messages/second per bot, enforced with a sliding
+# window so no one-second span goes over it (a full token bucket allowed a
+# burst of twice the rate), and ~20 messages/minute per group or channel,
+# enforced with token buckets. On RetryAfter the chat is paused
+# for the requested time and the send rate is halved, then recovers
+# additively on every success (AIMD).
+# =============================================================================
+
+# Messages per second across all chats
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+
+# Window TELEGRAM_GLOBAL_RATE is counted over. Slightly over one second:
+# requests reach Telegram with varying delays, and exact pacing let some
+# one-second spans on the server side go over the limit
+TELEGRAM_GLOBAL_WINDOW_SECONDS = float(os.getenv("TELEGRAM_GLOBAL_WINDOW_SECONDS", "1.2"))
+
+# Messages per minute for one group or channel
+TELEGRAM_CHAT_RATE_PER_MINUTE = float(os.getenv("TELEGRAM_CHAT_RATE_PER_MINUTE", "20"))
+
+# Retries of one request after RetryAfter before giving up
+TELEGRAM_MAX_RETRIES = 3
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` tokens per second.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float, rate_factor: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate * rate_factor)
+        self.updated = now
+    
+    def wait_time(self, now: float, cost: float, rate_factor: float = 1.0) -> float:
+        """Seconds until `cost` tokens are available (0 if available now)."""
+        self._refill(now, rate_factor)
+        cost = min(cost, self.capacity)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / (self.rate * rate_factor)
+    
+    def take(self, cost: float):
+        """Consumes tokens; call only after wait_time() returned 0."""
+        self.tokens -= min(cost, self.capacity)
+
+
+class SlidingWindow:
+    """
+    At most `limit` messages in any `window` seconds. Same interface as
+    TokenBucket; the rate factor scales the limit.
+    """
+    __slots__ = ("limit", "window", "events", "total")
+    
+    def __init__(self, limit: float, window: float = 1.0):
+        self.limit = limit
+        self.window = window
+        self.events: deque = deque()  # (monotonic time, cost)
+        self.total = 0
+    
+    def wait_time(self, now: float, cost: float, rate_factor: float = 1.0) -> float:
+        """Seconds until `cost` more messages fit in the window (0 if they fit now)."""
+        while self.events and self.events[0][0] <= now - self.window:
+            self.total -= self.events.popleft()[1]
+        limit = max(1.0, self.limit * rate_factor)
+        excess = self.total + min(cost, limit) - limit
+        if excess <= 0:
+            return 0.0
+        for sent_at, sent_cost in self.events:
+            excess -= sent_cost
+            if excess <= 0:
+                return sent_at + self.window - now
+        return self.window
+    
+    def take(self, cost: float):
+        """Records a send; call only after wait_time() returned 0."""
+        self.events.append((time.monotonic(), cost))
+        self.total += cost
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    retry_after = error.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class TelegramRateLimiter:
+    """
+    Global + per-chat rate limiter with AIMD adaptation on RetryAfter.
+    """
+    
+    # Rate factor bounds and AIMD steps
+    MIN_RATE_FACTOR = 0.1
+    DECREASE_FACTOR = 0.5
+    INCREASE_STEP = 0.05
+    
+    def __init__(
+        self,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        chat_rate_per_minute: float = TELEGRAM_CHAT_RATE_PER_MINUTE,
+        name: str = ""
+    ):
+        self.name = name
+        self.global_bucket = SlidingWindow(global_rate, TELEGRAM_GLOBAL_WINDOW_SECONDS)
+        self.chat_rate = chat_rate_per_minute / 60
+        self.chat_capacity = chat_rate_per_minute
+        self.chat_buckets: Dict[str, TokenBucket] = {}
+        self.blocked_until: Dict[str, float] = {}
+        self.rate_factor = 1.0
+    
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_capacity)
+        return bucket
+    
+    async def acquire(self, chat_id: str, cost: int = 1):
+        """Waits until one request of `cost` messages may be sent to chat_id."""
+        chat_bucket = self._chat_bucket(chat_id)
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            wait = max(
+                self.global_bucket.wait_time(now, cost, self.rate_factor),
+                chat_bucket.wait_time(now, cost, self.rate_factor),
+                self.blocked_until.get(chat_id, 0.0) - now
+            )
+            if wait <= 0:
+                self.global_bucket.take(cost)
+                chat_bucket.take(cost)
+                RATE_LIMIT_WAIT_SECONDS.observe(now - started, tenant=self.name)
+                return
+            await asyncio.sleep(wait)
+    
+    def on_success(self):
+        """Additive increase after a request went through."""
+        self.rate_factor = min(1.0, self.rate_factor + self.INCREASE_STEP)
+    
+    def on_retry_after(self, chat_id: str, retry_after: float):
+        """Multiplicative decrease and a pause for the throttled chat."""
+        self.rate_factor = max(self.MIN_RATE_FACTOR, self.rate_factor * self.DECREASE_FACTOR)
+        self.blocked_until[chat_id] = max(self.blocked_until.get(chat_id, 0.0), time.monotonic() + retry_after)
+    
+    async def call(self, chat_id: str, request, cost: int = 1, method: str = "request"):
+        """
+        Runs one Telegram API request under the rate limits.
+        
+        Args:
+            chat_id: Target chat
+            request: Zero-argument callable returning the API coroutine
+                     (called again on every retry)
+            cost: Number of messages the request produces (album size)
+            method: API method name, for metrics
+        
+        Returns:
+            Result of the request
+        
+        Raises:
+            RetryAfter: If still throttled after TELEGRAM_MAX_RETRIES retries
+        """
+        for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+            await self.acquire(chat_id, cost)
+            try:
+                with TELEGRAM_REQUEST_SECONDS.time(method=method):
+                    result = await request()
+            except RetryAfter as e:
+                TELEGRAM_RETRY_AFTER.inc(method=method)
+                retry_after = _retry_after_seconds(e)
+                self.on_retry_after(chat_id, retry_after)
+                log.warning(f"⏱️ Limite do Telegram em {chat_id}: aguardando {retry_after:.0f}s")
+                if attempt == TELEGRAM_MAX_RETRIES:
+                    raise
+                continue
+            self.on_success()
+            return result
+
+
+
+# =============================================================================
+# RETRY OUTBOX
+# Sends that fail for transient reasons (network errors, timeouts, 429) are
+# stored in a SQLite WAL database and retried with exponential backoff.
+# Entries expire with their prediction's interval, so stale predictions are
+# never delivered late.
+# =============================================================================
+
+OUTBOX_FILE = os.path.join(CACHE_DIR, "outbox.sqlite3")
+
+# Backoff between retries: OUTBOX_BASE_BACKOFF * 2^attempts, capped
+OUTBOX_BASE_BACKOFF = 2.0
+OUTBOX_MAX_BACKOFF = 60.0
+
+# How often the outbox is checked for due entries (seconds)
+OUTBOX_POLL_SECONDS = 2.0
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    True for errors worth retrying later (network problems, timeouts, 429).
+    BadRequest and Forbidden will fail the same way again, so they are not.
+    """
+    if isinstance(error, (BadRequest, Forbidden)):
+        return False
+    return isinstance(error, (NetworkError, RetryAfter))
+
+
+class OutboxEntry:
+    """
+    One pending send.
+    
+    Attributes:
+        entry_id: Row id in the outbox table
+        tenant: Name of the tenant whose bot sends the entry
+        chat_id: Target chat
+        kind: "photo", "message" or "album"
+        payload: Send arguments (see deliver_outbox_entry())
+        valid_until: Unix timestamp after which the entry is dropped
+        attempts: Failed attempts so far
+    """
+    __slots__ = ("entry_id", "tenant", "chat_id", "kind", "payload", "valid_until", "attempts")
+    
+    def __init__(
+        self, entry_id: int, tenant: str, chat_id: str, kind: str, payload: Dict, valid_until: float, attempts: int
+    ):
+        self.entry_id = entry_id
+        self.tenant = tenant
+        self.chat_id = chat_id
+        self.kind = kind
+        self.payload = payload
+        self.valid_until = valid_until
+        self.attempts = attempts
+
+
+class SendOutbox:
+    """
+    Persistent queue of failed sends backed by SQLite in WAL mode.
+    """
+    
+    def __init__(self, path: str = OUTBOX_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                valid_until REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL,
+                last_error TEXT
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS outbox_next_attempt ON outbox (next_attempt)")
+        
+        # Databases from before multi-tenant mode belong to the default tenant
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+        if "tenant" not in columns:
+            self._db.execute(f"ALTER TABLE outbox ADD COLUMN tenant TEXT NOT NULL DEFAULT '{DEFAULT_TENANT}'")
+    
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+    
+    @staticmethod
+    def backoff(attempts: int, retry_after: Optional[float] = None) -> float:
+        """Delay before the next attempt, never shorter than Telegram's retry_after."""
+        delay = min(OUTBOX_MAX_BACKOFF, OUTBOX_BASE_BACKOFF * (2 ** attempts))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+    
+    def enqueue(
+        self, chat_id: str, kind: str, payload: Dict, valid_until: float, error: Exception,
+        tenant: str = DEFAULT_TENANT
+    ):
+        """
+        Stores a failed send for retry, unless its interval already ended.
+        
+        Args:
+            chat_id: Target chat
+            kind: "photo", "message" or "album"
+            payload: JSON-serializable send arguments
+            valid_until: Unix timestamp when the prediction expires
+            error: Error of the first attempt
+            tenant: Name of the tenant that sends it
+        """
+        now = time.time()
+        if valid_until <= now:
+            return
+        retry_after = _retry_after_seconds(error) if isinstance(error, RetryAfter) else None
+        self._db.execute(
+            "INSERT INTO outbox (tenant, chat_id, kind, payload, valid_until, attempts, next_attempt, last_error) "
+            "VALUES (?, ?, ?, ?, ?, 1, ?, ?)",
+            (tenant, chat_id, kind, json.dumps(payload), valid_until, now + self.backoff(0, retry_after), str(error))
+        )
+    
+    def purge_expired(self) -> int:
+        """Drops entries whose prediction interval has ended."""
+        return self._db.execute("DELETE FROM outbox WHERE valid_until <= ?", (time.time(),)).rowcount
+    
+    def due(self, limit: int = 100) -> List[OutboxEntry]:
+        """Entries whose next attempt time has come."""
+        rows = self._db.execute(
+            "SELECT id, tenant, chat_id, kind, payload, valid_until, attempts FROM outbox "
+            "WHERE next_attempt <= ? AND valid_until > ? ORDER BY next_attempt LIMIT ?",
+            (time.time(), time.time(), limit)
+        ).fetchall()
+        return [OutboxEntry(row[0], row[1], row[2], row[3], json.loads(row[4]), row[5], row[6]) for row in rows]
+    
+    def reschedule(self, entry: OutboxEntry, error: Exception):
+        """Records another failed attempt and schedules the next one."""
+        retry_after = _retry_after_seconds(error) if isinstance(error, RetryAfter) else None
+        self._db.execute(
+            "UPDATE outbox SET attempts = attempts + 1, next_attempt = ?, last_error = ? WHERE id = ?",
+            (time.time() + self.backoff(entry.attempts, retry_after), str(error), entry.entry_id)
+        )
+    
+    def remove(self, entry: OutboxEntry):
+        """Removes a delivered (or undeliverable) entry."""
+        self._db.execute("DELETE FROM outbox WHERE id = ?", (entry.entry_id,))
+
+
+OUTBOX = SendOutbox()
+
+
+# =============================================================================
+# SEND LEDGER AND WARM STATE
+# Every delivered game is recorded as (tenant, channel, time_seed, game_id)
+# right after Telegram accepts it. A process
+# restarted mid-interval (crash, redeploy) skips what the ledger already has,
+# so nothing is sent twice. Time seeds repeat across month boundaries, so
+# lookups only consider rows younger than LEDGER_RETENTION (far shorter than
+# the ~29 days between repeats).
+#
+# On shutdown the current snapshot is saved next to the ledger and loaded
+# again on startup; file_ids and the forecast already persist in CACHE_DIR.
+# =============================================================================
+
+LEDGER_FILE = os.path.join(CACHE_DIR, "ledger.sqlite3")
+WARM_STATE_FILE = os.path.join(CACHE_DIR, "warm_state.npz")
+
+# How long ledger rows are kept (seconds)
+LEDGER_RETENTION = 24 * 3600
+
+
+class SendLedger:
+    """
+    Durable record of delivered predictions (SQLite in WAL mode; committed
+    rows survive a crash of the process).
+    """
+    
+    def __init__(self, path: str = LEDGER_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sent (
+                tenant TEXT NOT NULL,
+                chat_id TEXT NOT NULL,
+                time_seed INTEGER NOT NULL,
+                game_id TEXT NOT NULL,
+                sent_at REAL NOT NULL,
+                PRIMARY KEY (tenant, chat_id, time_seed, game_id)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS sent_at ON sent (sent_at)")
+    
+    def sent_game_ids(self, tenant: str, chat_id: str, time_seed: int) -> set:
+        """game_ids already delivered to a chat for one interval."""
+        rows = self._db.execute(
+            "SELECT game_id FROM sent WHERE tenant = ? AND chat_id = ? AND time_seed = ? AND sent_at > ?",
+            (tenant, chat_id, time_seed, time.time() - LEDGER_RETENTION)
+        ).fetchall()
+        return {row[0] for row in rows}
+    
+    def record(self, tenant: str, chat_id: str, time_seed: int, game_ids: List[str]):
+        """
+        Records delivered games.
+        
+        Args:
+            tenant: Tenant name
+            chat_id: Target chat
+            time_seed: Interval the predictions belong to
+            game_ids: Delivered games
+        """
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO sent (tenant, chat_id, time_seed, game_id, sent_at) VALUES (?, ?, ?, ?, ?)",
+            [(tenant, chat_id, time_seed, game_id, now) for game_id in game_ids]
+        )
+    
+    def prune(self) -> int:
+        """Drops rows older than LEDGER_RETENTION."""
+        return self._db.execute(
+            "DELETE FROM sent WHERE sent_at <= ?", (time.time() - LEDGER_RETENTION,)
+        ).rowcount
+
+
+SEND_LEDGER = SendLedger()
+
+
+def save_warm_state(path: str = WARM_STATE_FILE):
+    """
+    Saves the most recent interval snapshot so a restart can serve the
+    current interval without recomputing it.
+    """
+    if not _snapshot_cache:
+        return
+    snapshot = next(reversed(_snapshot_cache.values()))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            fingerprint=np.array(snapshot.catalog.fingerprint),
+            interval_start=np.array(snapshot.interval_start.timestamp()),
+            **{field: getattr(snapshot, field) for field in FORECAST_FIELDS}
+        )
+        os.replace(tmp_path, path)
+        log.info(f"💾 Estado salvo: intervalo {snapshot.interval_start.strftime('%H:%M')}")
+    except OSError as e:
+        log.warning(f"⚠️ Não foi possível salvar o estado: {e}")
+
+
+def load_warm_state(catalog: GameCatalog = None, path: str = WARM_STATE_FILE) -> Optional[IntervalSnapshot]:
+    """
+    Restores the snapshot saved by save_warm_state() when it belongs to the
+    current interval and catalog.
+    
+    Returns:
+        The restored snapshot, or None
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    try:
+        with np.load(path) as data:
+            if str(data["fingerprint"]) != catalog.fingerprint:
+                return None
+            interval_start = datetime.fromtimestamp(float(data["interval_start"]), SAO_PAULO_TZ)
+            if interval_start != get_interval_start():
+                return None
+            snapshot = IntervalSnapshot(catalog, interval_start, {field: data[field] for field in FORECAST_FIELDS})
+    except (OSError, KeyError, ValueError):
+        return None
+    _snapshot_cache[snapshot.time_seed] = snapshot
+    return snapshot
+
+
+# =============================================================================
+# TENANTS - SEVERAL BOTS IN ONE PROCESS
+# Each tenant (brand) has its own Bot with its own connection pool, rate
+# limiter and file_id cache, plus its channels, threshold, max games and
+# buttons. The interval snapshot is computed once and shared by all tenants.
+# =============================================================================
+
+# HTTP connections per bot (python-telegram-bot defaults to 1, which makes
+# concurrent sends of one bot wait for each other)
+TELEGRAM_POOL_SIZE = int(os.getenv("TELEGRAM_POOL_SIZE", "8"))
+
+
+class Tenant:
+    """
+    One brand served by its own bot token.
+    
+    Attributes:
+        name: Tenant name (from catalog.json)
+        token: Bot token
+        bot: Telegram Bot with a dedicated connection pool
+        rate_limiter: Telegram limits of this bot
+        file_ids: file_id cache of this bot
+        link_url / play_url: Brand links
+        rtp_threshold: Default minimum RTP of the tenant's channels
+        max_games: Default games per notification of the tenant's channels
+        keyboard: Inline keyboard sent with every prediction
+        channels: Channel configurations
+    """
+    
+    def __init__(self, config: Dict, token: str):
+        self.name = config["name"]
+        self.token = token
+        self.bot = Bot(
+            token=token,
+            base_url=config.get("base_url", TELEGRAM_BASE_URL),
+            request=HTTPXRequest(connection_pool_size=TELEGRAM_POOL_SIZE, pool_timeout=30.0)
+        )
+        self.rate_limiter = TelegramRateLimiter(name=self.name)
+        self.file_ids = FileIdCache(get_file_id_cache_path(self.name))
+        self.configure(config)
+    
+    @staticmethod
+    def resolve_token(config: Dict) -> str:
+        """
+        Bot token of a tenant configuration: "bot_token", the environment
+        variable named by "bot_token_env", or BOT_TOKEN for the default tenant.
+        
+        Raises:
+            ValueError: If no token is configured
+        """
+        token = config.get("bot_token")
+        if not token and config.get("bot_token_env"):
+            token = os.getenv(config["bot_token_env"])
+        if not token and config["name"] == DEFAULT_TENANT:
+            token = BOT_TOKEN
+        if not token:
+            raise ValueError(f"tenant {config['name']!r} has no bot token")
+        return token
+    
+    def configure(self, config: Dict):
+        """Applies the settings that can change without a new Bot."""
+        self.link_url = config.get("link_url", LINK_URL)
+        self.play_url = config.get("play_url", PLAY_URL)
+        self.rtp_threshold = config.get("rtp_threshold", CONFIG["rtp_threshold"])
+        self.max_games = config.get("max_games", MAX_GAMES_PER_NOTIFICATION)
+        self.channels: List[Dict] = config.get("channels", [])
+        
+        buttons = config.get("buttons") or [{"text": "🎁 BOT BÔNUS", "url": "{link_url}"}]
+        self.keyboard = InlineKeyboardMarkup([
+            [InlineKeyboardButton(
+                button["text"], url=button["url"].format(link_url=self.link_url, play_url=self.play_url)
+            )]
+            for button in buttons
+        ])
+
+
+class TenantRegistry:
+    """
+    Tenants by name, kept in sync with the tenant configurations.
+    Tenants whose token did not change keep their Bot, connection pool,
+    rate limiter state and file_id cache across reloads.
+    """
+    
+    def __init__(self):
+        self._tenants: Dict[str, Tenant] = {}
+        self._configs = None
+    
+    def __len__(self) -> int:
+        return len(self._tenants)
+    
+    def __iter__(self):
+        return iter(list(self._tenants.values()))
+    
+    def get(self, name: str) -> Optional[Tenant]:
+        """Returns the tenant called `name`, or None."""
+        return self._tenants.get(name)
+    
+    def sync(self, configs: List[Dict]):
+        """
+        Creates, updates and drops tenants to match `configs`.
+        A tenant without a usable token is reported and skipped.
+        """
+        if configs is self._configs:
+            return
+        tenants = {}
+        for config in configs:
+            try:
+                token = Tenant.resolve_token(config)
+            except ValueError as e:
+                log.error(f"❌ Tenant ignorado: {e}")
+                continue
+            tenant = self._tenants.get(config["name"])
+            if (
+                tenant is not None and tenant.token == token
+                and tenant.bot.base_url.startswith(config.get("base_url", TELEGRAM_BASE_URL))
+            ):
+                tenant.configure(config)
+            else:
+                tenant = Tenant(config, token)
+            tenants[tenant.name] = tenant
+        self._tenants = tenants
+        self._configs = configs
+    
+    def channels(self) -> List[Tuple[Tenant, Dict]]:
+        """Every (tenant, channel configuration) pair."""
+        return [(tenant, channel_cfg) for tenant in self for channel_cfg in tenant.channels]
+
+
+TENANTS = TenantRegistry()
+
+
+def get_tenants() -> TenantRegistry:
+    """Returns the tenant registry, synced with the current catalog.json."""
+    TENANTS.sync(get_tenant_configs())
+    return TENANTS
+
+
+def get_default_tenant() -> Tenant:
+    """The default tenant, or the first one when there is no "default"."""
+    tenants = get_tenants()
+    return tenants.get(DEFAULT_TENANT) or next(iter(tenants))
+
+
+# =============================================================================
+# CHANNEL SHARDING - LEASE-BASED OWNERSHIP ACROSS REPLICAS
+# With SHARDING=1, replicas split the channels between them. Each replica
+# heartbeats into a shared lease store and only sends to channels it holds a
+# lease for. Targets are assigned by rendezvous hashing over the live
+# replicas, so when a replica dies (its heartbeat expires) its channels move
+# to the others, and a new replica takes over its share. A lease is only
+# taken once the previous owner released it or it expired, so no channel
+# ever has two owners. SHARD_LEASE_FILE must be on storage shared by all
+# replicas (e.g. a Railway volume).
+# =============================================================================
+
+SHARDING_ENABLED = os.getenv("SHARDING", "0") == "1"
+SHARD_LEASE_FILE = os.getenv("SHARD_LEASE_FILE", os.path.join(CACHE_DIR, "leases.sqlite3"))
+REPLICA_ID = os.getenv("REPLICA_ID", f"{socket.gethostname()}-{os.getpid()}")
+
+# A lease (and a replica's heartbeat) expires LEASE_TTL seconds after renewal
+LEASE_TTL = float(os.getenv("LEASE_TTL", "30"))
+LEASE_RENEW_SECONDS = LEASE_TTL / 3
+
+# Leases this close to expiry no longer count as owned
+LEASE_SAFETY_MARGIN = 2.0
+
+
+class SqliteLeaseStore:
+    """
+    Lease store shared by replicas through one SQLite file.
+    Every operation is a single statement, so concurrent replicas cannot
+    both win a lease.
+    """
+    
+    def __init__(self, path: str = SHARD_LEASE_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS replicas (replica_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+    
+    def heartbeat(self, replica_id: str, now: float, ttl: float):
+        """Marks a replica alive until now + ttl."""
+        self._db.execute(
+            "INSERT INTO replicas (replica_id, expires_at) VALUES (?, ?) "
+            "ON CONFLICT(replica_id) DO UPDATE SET expires_at = excluded.expires_at",
+            (replica_id, now + ttl)
+        )
+    
+    def leave(self, replica_id: str):
+        """Removes a replica and all its leases."""
+        self._db.execute("DELETE FROM replicas WHERE replica_id = ?", (replica_id,))
+        self._db.execute("DELETE FROM leases WHERE owner = ?", (replica_id,))
+    
+    def live_replicas(self, now: float) -> List[str]:
+        """Replicas whose heartbeat has not expired, sorted."""
+        rows = self._db.execute(
+            "SELECT replica_id FROM replicas WHERE expires_at > ? ORDER BY replica_id", (now,)
+        ).fetchall()
+        return [row[0] for row in rows]
+    
+    def try_acquire(self, key: str, replica_id: str, now: float, ttl: float) -> bool:
+        """Takes or renews a lease if it is free, expired or already ours."""
+        return self._db.execute(
+            "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.owner = excluded.owner OR leases.expires_at <= ?",
+            (key, replica_id, now + ttl, now)
+        ).rowcount == 1
+    
+    def release(self, key: str, replica_id: str):
+        """Gives up a lease held by replica_id."""
+        self._db.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, replica_id))
+
+
+class MemoryLeaseStore:
+    """
+    In-process stand-in for SqliteLeaseStore (same semantics), for running
+    several coordinators in one process without a shared file (test_bot.py).
+    """
+    
+    def __init__(self):
+        self._replicas: Dict[str, float] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def heartbeat(self, replica_id: str, now: float, ttl: float):
+        with self._lock:
+            self._replicas[replica_id] = now + ttl
+    
+    def leave(self, replica_id: str):
+        with self._lock:
+            self._replicas.pop(replica_id, None)
+            self._leases = {k: v for k, v in self._leases.items() if v[0] != replica_id}
+    
+    def live_replicas(self, now: float) -> List[str]:
+        with self._lock:
+            return sorted(r for r, expires_at in self._replicas.items() if expires_at > now)
+    
+    def try_acquire(self, key: str, replica_id: str, now: float, ttl: float) -> bool:
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease[0] != replica_id and lease[1] > now:
+                return False
+            self._leases[key] = (replica_id, now + ttl)
+            return True
+    
+    def release(self, key: str, replica_id: str):
+        with self._lock:
+            if self._leases.get(key, ("",))[0] == replica_id:
+                del self._leases[key]
+
+
+def _rendezvous_owner(key: str, replicas: List[str]) -> str:
+    """Replica with the highest hash score for key (rendezvous hashing)."""
+    return max(
+        replicas,
+        key=lambda replica: hashlib.blake2b(f"{replica}|{key}".encode(), digest_size=8).digest()
+    )
+
+
+class ShardCoordinator:
+    """
+    Decides which channels this replica sends to.
+    
+    Attributes:
+        store: Lease store shared with the other replicas
+        replica_id: Identity of this replica
+        ttl: Lease lifetime in seconds
+    """
+    
+    def __init__(self, store, replica_id: str = REPLICA_ID, ttl: float = LEASE_TTL):
+        self.store = store
+        self.replica_id = replica_id
+        self.ttl = ttl
+        self._owned: Dict[str, float] = {}  # key -> local expiry time
+    
+    def rebalance(self, keys: List[str], now: Optional[float] = None) -> List[str]:
+        """
+        Heartbeats, gives up channels that now belong to another replica and
+        takes or renews the ones assigned to this replica.
+        
+        Args:
+            keys: Every channel key
+            now: Current time (defaults to time.time())
+        
+        Returns:
+            Keys owned after rebalancing
+        """
+        now = time.time() if now is None else now
+        self.store.heartbeat(self.replica_id, now, self.ttl)
+        replicas = self.store.live_replicas(now) or [self.replica_id]
+        
+        targets = {key for key in keys if _rendezvous_owner(key, replicas) == self.replica_id}
+        for key in list(self._owned):
+            if key not in targets:
+                self.store.release(key, self.replica_id)
+                del self._owned[key]
+        for key in targets:
+            if self.store.try_acquire(key, self.replica_id, now, self.ttl):
+                self._owned[key] = now + self.ttl
+            else:
+                self._owned.pop(key, None)
+        return sorted(self._owned)
+    
+    def owns(self, key: str, now: Optional[float] = None) -> bool:
+        """True while this replica holds a lease on key that is not about to expire."""
+        now = time.time() if now is None else now
+        return self._owned.get(key, 0.0) - LEASE_SAFETY_MARGIN > now
+    
+    def leave(self):
+        """Releases every lease so other replicas take over immediately."""
+        self.store.leave(self.replica_id)
+        self._owned.clear()
+
+
+def get_channel_key(tenant: Tenant, channel_id: str) -> str:
+    """Lease key of a tenant's channel."""
+    return f"{tenant.name}:{channel_id}"
+
+
+SHARDS = ShardCoordinator(SqliteLeaseStore()) if SHARDING_ENABLED else None
+
+
+def owns_channel(tenant: Tenant, channel_id: str) -> bool:
+    """True if this replica should send to the channel (always, without sharding)."""
+    return SHARDS is None or SHARDS.owns(get_channel_key(tenant, channel_id))
+
+
+async def run_shard_leases():
+    """Background task keeping this replica's leases renewed and balanced."""
+    owned = None
+    while True:
+        try:
+            keys = [get_channel_key(tenant, cfg["channel_id"]) for tenant, cfg in get_tenants().channels()]
+            current = SHARDS.rebalance(keys)
+            if current != owned:
+                log.info(f"🧩 Réplica {SHARDS.replica_id}: {len(current)}/{len(keys)} canais")
+                owned = current
+        except Exception as e:
+            log.error(f"❌ Erro ao renovar leases: {e}")
+        await asyncio.sleep(LEASE_RENEW_SECONDS)
+
+
+# =============================================================================
+# TELEGRAM BOT FUNCTIONS
+# =============================================================================
+
+
+async def send_game_photo(
+    tenant: Tenant,
+    chat_id: str,
+    image_path: str,
+    caption: str,
+    keyboard: InlineKeyboardMarkup,
+    image: Optional[Tuple[bytes, str]] = None
+):
+    """
+    Sends one game photo, reusing the cached Telegram file_id when possible.
+    If Telegram rejects a cached file_id, the image is uploaded again and
+    the new file_id replaces the stale one.
+    
+    Args:
+        tenant: Tenant whose bot sends the photo
+        chat_id: Telegram chat ID
+        image_path: Full path to the image file
+        caption: HTML caption
+        keyboard: Inline keyboard for the message
+        image: (bytes, content hash) already resolved by the prepare phase
+    
+    Returns:
+        The sent Message
+    
+    Raises:
+        FileNotFoundError: If the image does not exist
+    """
+    photo, content_hash = image if image is not None else await IMAGE_STORE.get(image_path)
+    
+    file_id = tenant.file_ids.get(content_hash)
+    if file_id is not None:
+        try:
+            return await tenant.rate_limiter.call(chat_id, lambda: tenant.bot.send_photo(
+                chat_id=chat_id,
+                photo=file_id,
+                caption=caption,
+                parse_mode="HTML",
+                reply_markup=keyboard
+            ), method="send_photo")
+        except BadRequest as e:
+            log.warning(f"⚠️ file_id recusado, reenviando imagem: {e}")
+            tenant.file_ids.discard(content_hash)
+    
+    message = await tenant.rate_limiter.call(chat_id, lambda: tenant.bot.send_photo(
+        chat_id=chat_id,
+        photo=photo,
+        caption=caption,
+        parse_mode="HTML",
+        reply_markup=keyboard
+    ), method="send_photo")
+    
+    if message.photo:
+        tenant.file_ids.put(content_hash, message.photo[-1].file_id)
+    return message
+
+
+async def send_text_message(tenant: Tenant, chat_id: str, text: str, keyboard: InlineKeyboardMarkup):
+    """
+    Sends one HTML text message with the inline keyboard.
+    
+    Args:
+        tenant: Tenant whose bot sends the message
+        chat_id: Telegram chat ID
+        text: HTML message text
+        keyboard: Inline keyboard for the message
+    
+    Returns:
+        The sent Message
+    """
+    return await tenant.rate_limiter.call(chat_id, lambda: tenant.bot.send_message(
+        chat_id=chat_id,
+        text=text,
+        parse_mode="HTML",
+        reply_markup=keyboard
+    ), method="send_message")
+
+
+async def send_game_album(
+    tenant: Tenant,
+    chat_id: str,
+    image_paths: List[str],
+    captions: List[str],
+    images: Optional[List[Tuple[bytes, str]]] = None
+):
+    """
+    Sends several games as one album. The footer with the button is sent
+    separately by send_album_footer(), after the album is in the ledger.
+    Cached file_ids are used for the album items; if Telegram rejects any of
+    them, those entries are dropped and the album is sent again with uploads.
+    
+    Args:
+        tenant: Tenant whose bot sends the album
+        chat_id: Telegram chat ID
+        image_paths: 2 to 10 image paths
+        captions: HTML caption for each image
+        images: (bytes, content hash) per image, already resolved by the prepare phase
+    
+    Returns:
+        The album's Messages, one per image
+    
+    Raises:
+        FileNotFoundError: If an image does not exist
+    """
+    if images is None:
+        images = [await IMAGE_STORE.get(path) for path in image_paths]
+    content_hashes = [content_hash for _, content_hash in images]
+    
+    def build_media(use_cache: bool) -> List[InputMediaPhoto]:
+        media = []
+        for (data, content_hash), caption in zip(images, captions):
+            file_id = tenant.file_ids.get(content_hash) if use_cache else None
+            media.append(InputMediaPhoto(media=file_id or data, caption=caption, parse_mode="HTML"))
+        return media
+    
+    try:
+        media = build_media(use_cache=True)
+        messages = await tenant.rate_limiter.call(
+            chat_id, lambda: tenant.bot.send_media_group(chat_id=chat_id, media=media), cost=len(media),
+            method="send_media_group"
+        )
+    except BadRequest as e:
+        if not any(tenant.file_ids.get(h) for h in content_hashes):
+            raise
+        log.warning(f"⚠️ file_id recusado no álbum, reenviando imagens: {e}")
+        for content_hash in content_hashes:
+            tenant.file_ids.discard(content_hash)
+        media = build_media(use_cache=False)
+        messages = await tenant.rate_limiter.call(
+            chat_id, lambda: tenant.bot.send_media_group(chat_id=chat_id, media=media), cost=len(media),
+            method="send_media_group"
+        )
+    
+    for content_hash, message in zip(content_hashes, messages):
+        if message.photo:
+            tenant.file_ids.put(content_hash, message.photo[-1].file_id)
+    return messages
+
+
+async def send_album_footer(
+    tenant: Tenant,
+    chat_id: str,
+    footer: str,
+    keyboard: InlineKeyboardMarkup,
+    time_seed: int,
+    provider: str,
+    valid_until_ts: float
+):
+    """
+    Sends the footer of an album that was already delivered. A failed footer
+    is queued on its own, so the album itself is never sent twice.
+    
+    Args:
+        tenant: Tenant whose bot sends the footer
+        chat_id: Telegram chat ID
+        footer: HTML text of the message carrying the keyboard
+        keyboard: Inline keyboard for the footer message
+        time_seed: Interval the album belongs to
+        provider: Provider label, for metrics
+        valid_until_ts: Unix timestamp when the prediction expires
+    """
+    try:
+        await send_text_message(tenant, chat_id, footer, keyboard)
+    except Exception as e:
+        log.error(f"❌ Erro ao enviar rodapé do álbum para {chat_id}: {e}")
+        if is_retryable_error(e):
+            payload = {"text": footer, "keyboard": keyboard.to_dict(), "time_seed": time_seed, "provider": provider}
+            OUTBOX.enqueue(chat_id, "message", payload, valid_until_ts, e, tenant.name)
+
+
+class PreparedPrediction:
+    """
+    One channel's prediction with everything resolved except the network calls:
+    games, captions, footer, image paths and image bytes.
+    
+    Attributes:
+        tenant: Tenant whose bot sends it
+        channel_id: Telegram channel ID
+        display_name: Channel name for logging
+        provider_label: Provider filter as text
+        snapshot: Interval the prediction is for
+        games: Games to send (already delivered ones excluded)
+        captions: HTML caption per game
+        image_paths: Image path per game
+        images: (bytes, content hash) per game, None where the image is missing
+        footer: Album footer, or None when sent as separate messages
+    """
+    __slots__ = (
+        "tenant", "channel_id", "display_name", "provider_label", "snapshot",
+        "games", "captions", "image_paths", "images", "footer"
+    )
+    
+    def __init__(
+        self, tenant: Tenant, channel_id: str, display_name: str, provider_label: str,
+        snapshot: IntervalSnapshot, games: List[GamePrediction], captions: List[str],
+        image_paths: List[str], images: List[Optional[Tuple[bytes, str]]], footer: Optional[str]
+    ):
+        self.tenant = tenant
+        self.channel_id = channel_id
+        self.display_name = display_name
+        self.provider_label = provider_label
+        self.snapshot = snapshot
+        self.games = games
+        self.captions = captions
+        self.image_paths = image_paths
+        self.images = images
+        self.footer = footer
+
+
+async def prepare_prediction(
+    channel_id: str,
+    provider_filter: str = "ALL",
+    channel_name: str = "",
+    snapshot: IntervalSnapshot = None,
+    album: bool = False,
+    query: GameQuery = None,
+    tenant: Tenant = None
+) -> Optional[PreparedPrediction]:
+    """
+    Prepare phase of a send: selects the games, renders the captions and
+    reads the images, so commit_prediction() only makes the Telegram calls.
+    
+    Args:
+        channel_id: Telegram channel ID (e.g., "@PPSinaisPOP")
+        provider_filter: "ALL" for all games, or specific provider name
+        channel_name: Display name for logging
+        snapshot: Interval snapshot to send (defaults to the current interval)
+        album: Send all games as one album instead of one message per game
+        query: Channel query (defaults to provider_filter with the tenant's limits)
+        tenant: Tenant whose bot sends the prediction (defaults to the default tenant)
+    
+    Returns:
+        PreparedPrediction, or None when there is nothing to send
+    """
+    if snapshot is None:
+        snapshot = get_interval_snapshot()
+    if tenant is None:
+        tenant = get_default_tenant()
+    if query is None:
+        query = get_channel_query({"provider": provider_filter}, tenant)
+    
+    # Get games with RTP >= 80% filtered by provider
+    high_rtp_games = query.run(snapshot)
+    
+    display_name = channel_name if channel_name else channel_id
+    provider_label = provider_filter if isinstance(provider_filter, str) else ", ".join(provider_filter)
+    provider_info = f" ({provider_label})" if provider_label != "ALL" else ""
+    
+    if not high_rtp_games:
+        log.info(f"📊 {display_name}{provider_info}: Nenhum jogo com RTP >= 80% neste momento")
+        return None
+    
+    # Skip games already delivered for this interval (e.g. before a restart)
+    already_sent = SEND_LEDGER.sent_game_ids(tenant.name, channel_id, snapshot.time_seed)
+    if already_sent:
+        high_rtp_games = [game for game in high_rtp_games if game.game.game_id not in already_sent]
+        if not high_rtp_games:
+            log.info(f"⏭️ {display_name}{provider_info}: previsões deste intervalo já enviadas")
+            return None
+    
+    # Valid until the end of the snapshot's interval (aligned with website)
+    valid_until_str = snapshot.valid_until.strftime("%H:%M")
+    
+    captions = []
+    for game in high_rtp_games:
+        with CAPTION_RENDER_SECONDS.time():
+            captions.append(format_single_game_message(game, valid_until_str))
+    
+    # Read the images now; a missing one is reported when sending
+    image_paths = [get_game_image_path(game.game) for game in high_rtp_games]
+    images = []
+    for path in image_paths:
+        try:
+            images.append(await IMAGE_STORE.get(path))
+        except FileNotFoundError:
+            images.append(None)
+    
+    footer = format_album_footer(valid_until_str) if album and len(high_rtp_games) > 1 else None
+    return PreparedPrediction(
+        tenant, channel_id, display_name, provider_label, snapshot,
+        high_rtp_games, captions, image_paths, images, footer
+    )
+
+
+async def commit_prediction(prepared: PreparedPrediction, boundary: Optional[datetime] = None):
+    """
+    Commit phase of a send: delivers a prepared prediction.
+    Each game with RTP >= 80% gets its OWN separate message with its own
+    picture, unless the prediction was prepared as an album.
+    
+    Args:
+        prepared: Output of prepare_prediction()
+        boundary: Interval boundary the send was scheduled for; when given,
+                  the boundary-to-delivery latency of each message is recorded
+    """
+    tenant = prepared.tenant
+    channel_id = prepared.channel_id
+    display_name = prepared.display_name
+    provider_label = prepared.provider_label
+    provider_info = f" ({provider_label})" if provider_label != "ALL" else ""
+    high_rtp_games = prepared.games
+    time_seed = prepared.snapshot.time_seed
+
+    # Tenant keyboard (same for all messages)
+    keyboard = tenant.keyboard
+
+    # Failed sends are retried from the outbox until the interval ends
+    valid_until_ts = prepared.snapshot.valid_until.timestamp()
+    keyboard_data = keyboard.to_dict()
+    
+    metric_labels = {"tenant": tenant.name, "channel": channel_id, "provider": provider_label}
+    
+    def delivered(count: int = 1):
+        MESSAGES_SENT.inc(count, **metric_labels)
+        if boundary is not None:
+            latency = (datetime.now(SAO_PAULO_TZ) - boundary).total_seconds()
+            for _ in range(count):
+                BOUNDARY_DELIVERY_SECONDS.observe(latency, tenant=tenant.name)
+    
+    # Album mode: all games in a single send_media_group call
+    if prepared.footer is not None:
+        album_payload = {
+            "image_paths": prepared.image_paths,
+            "captions": prepared.captions,
+            "footer": prepared.footer,
+            "keyboard": keyboard_data,
+            "time_seed": time_seed,
+            "game_ids": [game.game.game_id for game in high_rtp_games],
+            "provider": provider_label
+        }
+        try:
+            if None in prepared.images:
+                raise FileNotFoundError(prepared.image_paths[prepared.images.index(None)])
+            await send_game_album(
+                tenant, channel_id, album_payload["image_paths"], album_payload["captions"], prepared.images
+            )
+        except FileNotFoundError as e:
+            # Fall back to one message per game, which handles missing images
+            log.error(f"❌ Imagem não encontrada para o álbum: {e}")
+        except Exception as e:
+            log.error(f"❌ Erro ao enviar álbum para {display_name}{provider_info}: {e}")
+            MESSAGES_FAILED.inc(len(high_rtp_games), **metric_labels)
+            if is_retryable_error(e):
+                OUTBOX.enqueue(channel_id, "album", album_payload, valid_until_ts, e, tenant.name)
+            return
+        else:
+            # Recorded before the footer: a failed footer must not resend the album
+            SEND_LEDGER.record(tenant.name, channel_id, time_seed, album_payload["game_ids"])
+            delivered(len(high_rtp_games))
+            await send_album_footer(
+                tenant, channel_id, prepared.footer, keyboard, time_seed, provider_label, valid_until_ts
+            )
+            log.info(f"📤 Álbum enviado para {display_name}{provider_info}: {len(high_rtp_games)} jogos")
+            return
+    
+    # Send a SEPARATE message for EACH high RTP game
+    sent_count = 0
+    for game, caption, image_path, image in zip(high_rtp_games, prepared.captions, prepared.image_paths, prepared.images):
+        game_ids = [game.game.game_id]
+        
+        # The lease can be lost while earlier games wait on the rate limiter
+        if not owns_channel(tenant, channel_id):
+            log.info(f"🔀 {display_name}{provider_info} passou para outra réplica, envio interrompido")
+            break
+
+        try:
+            if image is None:
+                raise FileNotFoundError(image_path)
+            await send_game_photo(tenant, channel_id, image_path, caption, keyboard, image)
+            SEND_LEDGER.record(tenant.name, channel_id, time_seed, game_ids)
+            delivered()
+            
+            log.debug(f"✅ Enviado: {game.game.display_name} (RTP: {game.rtp}%)")
+            sent_count += 1
+            
+        except FileNotFoundError:
+            log.error(f"❌ Imagem não encontrada: {image_path}")
+            # Try sending without image
+            try:
+                await send_text_message(tenant, channel_id, caption, keyboard)
+                SEND_LEDGER.record(tenant.name, channel_id, time_seed, game_ids)
+                delivered()
+                log.debug(f"✅ Mensagem enviada sem imagem: {game.game.display_name}")
+                sent_count += 1
+            except Exception as e:
+                log.error(f"❌ Erro ao enviar mensagem: {e}")
+                MESSAGES_FAILED.inc(**metric_labels)
+                if is_retryable_error(e):
+                    payload = {
+                        "text": caption, "keyboard": keyboard_data,
+                        "time_seed": time_seed, "game_ids": game_ids, "provider": provider_label
+                    }
+                    OUTBOX.enqueue(channel_id, "message", payload, valid_until_ts, e, tenant.name)
+            
+        except Exception as e:
+            log.error(f"❌ Erro ao enviar {game.game.display_name}: {e}")
+            MESSAGES_FAILED.inc(**metric_labels)
+            if is_retryable_error(e):
+                payload = {
+                    "image_path": image_path, "caption": caption, "keyboard": keyboard_data,
+                    "time_seed": time_seed, "game_ids": game_ids, "provider": provider_label
+                }
+                OUTBOX.enqueue(channel_id, "photo", payload, valid_until_ts, e, tenant.name)
+    
+    log.info(f"📤 Total enviado para {display_name}{provider_info}: {sent_count}/{len(high_rtp_games)} jogos")
+
+
+async def send_prediction(
+    channel_id: str,
+    provider_filter: str = "ALL",
+    channel_name: str = "",
+    snapshot: IntervalSnapshot = None,
+    album: bool = False,
+    query: GameQuery = None,
+    tenant: Tenant = None
+):
+    """
+    Sends prediction messages to a Telegram channel right away
+    (prepare_prediction() followed by commit_prediction()).
+    
+    Args:
+        See prepare_prediction()
+    """
+    prepared = await prepare_prediction(channel_id, provider_filter, channel_name, snapshot, album, query, tenant)
+    if prepared is not None:
+        await commit_prediction(prepared)
+
+
+async def deliver_outbox_entry(entry: OutboxEntry):
+    """
+    Sends one outbox entry again.
+    
+    Args:
+        entry: Pending send from the outbox
+    
+    Returns:
+        The sent Messages, one per game
+    
+    Raises:
+        LookupError: If the entry's tenant no longer exists
+    """
+    tenant = get_tenants().get(entry.tenant)
+    if tenant is None:
+        raise LookupError(f"tenant {entry.tenant!r} not configured")
+    payload = entry.payload
+    keyboard = InlineKeyboardMarkup.de_json(payload["keyboard"], tenant.bot)
+    if entry.kind == "photo":
+        return [await send_game_photo(tenant, entry.chat_id, payload["image_path"], payload["caption"], keyboard)]
+    elif entry.kind == "album":
+        messages = await send_game_album(tenant, entry.chat_id, payload["image_paths"], payload["captions"])
+        # Recorded before the footer: a failed footer must not resend the album
+        SEND_LEDGER.record(entry.tenant, entry.chat_id, payload["time_seed"], payload["game_ids"])
+        await send_album_footer(
+            tenant, entry.chat_id, payload["footer"], keyboard, payload["time_seed"],
+            payload.get("provider", ""), entry.valid_until
+        )
+        return messages
+    else:
+        return [await send_text_message(tenant, entry.chat_id, payload["text"], keyboard)]
+
+
+async def retry_outbox_entry(entry: OutboxEntry):
+    """
+    Attempts one outbox entry and records the outcome.
+    
+    Args:
+        entry: Pending send from the outbox
+    """
+    game_ids = entry.payload.get("game_ids")
+    time_seed = entry.payload.get("time_seed")
+    metric_labels = {"tenant": entry.tenant, "channel": entry.chat_id, "provider": entry.payload.get("provider", "")}
+    if game_ids and set(game_ids) <= SEND_LEDGER.sent_game_ids(entry.tenant, entry.chat_id, time_seed):
+        OUTBOX.remove(entry)  # Delivered before a restart, after the entry was stored
+        return
+    try:
+        await deliver_outbox_entry(entry)
+        if game_ids:
+            SEND_LEDGER.record(entry.tenant, entry.chat_id, time_seed, game_ids)
+        OUTBOX.remove(entry)
+        MESSAGES_RETRIED.inc(result="sent", **metric_labels)
+        log.info(f"✅ Outbox: reenviado para {entry.chat_id} (tentativa {entry.attempts + 1})")
+    except Exception as e:
+        if is_retryable_error(e):
+            OUTBOX.reschedule(entry, e)
+            MESSAGES_RETRIED.inc(result="rescheduled", **metric_labels)
+        else:
+            OUTBOX.remove(entry)
+            MESSAGES_RETRIED.inc(result="dropped", **metric_labels)
+        log.error(f"❌ Outbox: falha ao reenviar para {entry.chat_id}: {e}")
+
+
+async def run_outbox():
+    """
+    Background task retrying failed sends until they succeed or expire.
+    Entries are retried concurrently, so one throttled chat does not hold
+    back the others.
+    """
+    in_flight: Dict[int, asyncio.Task] = {}
+    
+    while True:
+        try:
+            expired = OUTBOX.purge_expired()
+            if expired:
+                log.info(f"🗑️ Outbox: {expired} envio(s) expirado(s) descartado(s)")
+            
+            for entry in OUTBOX.due():
+                tenant = get_tenants().get(entry.tenant)
+                if tenant is not None and not owns_channel(tenant, entry.chat_id):
+                    continue  # Another replica owns the channel now; the entry expires
+                if entry.entry_id not in in_flight:
+                    task = asyncio.create_task(retry_outbox_entry(entry))
+                    task.add_done_callback(lambda _, entry_id=entry.entry_id: in_flight.pop(entry_id, None))
+                    in_flight[entry.entry_id] = task
+        except Exception as e:
+            log.error(f"❌ Erro no outbox: {e}")
+        
+        await asyncio.sleep(OUTBOX_POLL_SECONDS)
+
+
+def verify_hash_calculation():
     """
     Verifies hash calculation matches JavaScript.
     Run this to debug if RTP values don't match website.
+    At DEBUG level the snippet to compare in the browser console is logged too.
     """
-    print("\n" + "=" * 70)
-    print("🔍 VERIFICAÇÃO DE HASH - Comparar com JavaScript")
-    print("=" * 70)
-    
     # Test with a known game ID
     test_id = "PG SOFT/FORTUNE_1.webp"
     hash_val = string_to_hash(test_id)
     time_seed = get_time_seed()
     combined_seed = time_seed * 1000 + hash_val
     
-    print(f"Game ID: {test_id}")
-    print(f"Hash: {hash_val}")
-    print(f"Time Seed: {time_seed}")
-    print(f"Combined Seed: {combined_seed}")
-    print()
-    print("Para verificar no console do navegador, cole este código:")
-    print("-" * 70)
-    print(f'''
+    log.info(
+        f"🔍 Verificação de hash: {test_id} -> hash {hash_val}, time seed {time_seed}, combinado {combined_seed}",
+        extra={"fields": {"game_id": test_id, "hash": hash_val, "time_seed": time_seed, "combined_seed": combined_seed}}
+    )
+    log.debug(f'''Para verificar no console do navegador, cole este código:
 // Cole no console do navegador (F12) na página do website:
 const testId = "{test_id}";
 const hash = stringToHash(testId);
@@ -797,97 +3663,404 @@ const combined = timeSeed * 1000 + hash;
 console.log("Hash:", hash);
 console.log("Time Seed:", timeSeed);
 console.log("Combined:", combined);
-console.log("RTP:", getSeededRandomInt(combined, 30, 99));
-''')
-    print("-" * 70)
-    print("=" * 70 + "\n")
+console.log("RTP:", getSeededRandomInt(combined, 30, 99));''')
 
 
-def debug_print_all_games():
-    """
-    Prints RTP values for all top 15 games (for debugging).
-    Helps verify synchronization with website.
+# =============================================================================
+# DIAGNOSTICS - WHAT CHANGED SINCE THE PREVIOUS INTERVAL
+# Each cycle logs one line built from the interval snapshot: games that
+# entered or left the hot set, rank changes in the top DIAGNOSTICS_TOP_K and
+# the counts. The full per-game dump is only produced on demand (SIGUSR1,
+# GET /diagnostics on the metrics port, or sampled at DEBUG).
+# =============================================================================
+
+# Ranks tracked by the diff report
+DIAGNOSTICS_TOP_K = int(os.getenv("DIAGNOSTICS_TOP_K", "15"))
+
+# Minimum seconds between two sampled full dumps at DEBUG level
+DEBUG_TABLE_INTERVAL = float(os.getenv("DEBUG_TABLE_INTERVAL", "900"))
+
+_last_debug_table = 0.0
+
+
+def dump_games(snapshot: IntervalSnapshot) -> List[Dict]:
     """
-    print("\n" + "=" * 70)
-    print("📊 DEBUG: RTP DOS TOP 15 JOGOS")
-    print("=" * 70)
+    Full per-game view of one interval.
     
-    time_seed = get_time_seed()
-    now = datetime.now(SAO_PAULO_TZ)
+    Args:
+        snapshot: Interval snapshot
+    
+    Returns:
+        One dict per catalog game
+    """
+    games = []
+    for game in snapshot.catalog:
+        prediction = snapshot.prediction(game.index)
+        games.append({
+            "game": game.display_name,
+            "game_id": game.game_id,
+            "hash": game.game_hash,
+            "rtp": prediction.rtp,
+            "normal": prediction.normal,
+            "auto": prediction.auto,
+            "turbo": prediction.turbo,
+            "multiplier": prediction.multiplier["value"],
+            "hot": prediction.rtp >= CONFIG["rtp_threshold"]
+        })
+    return games
+
+
+def debug_print_all_games(snapshot: IntervalSnapshot = None, force: bool = False):
+    """
+    Logs RTP values for all games as one record.
+    Helps verify synchronization with website. Without force it is only
+    built at DEBUG level, at most once every DEBUG_TABLE_INTERVAL seconds;
+    with force it is logged at INFO right away.
     
-    print(f"⏰ Hora São Paulo: {now.strftime('%H:%M:%S')}")
-    print(f"🔢 Time Seed: {time_seed}")
-    print("-" * 70)
+    Args:
+        snapshot: Interval snapshot to log (defaults to the current interval)
+        force: On-demand dump (INFO level, no sampling)
+    """
+    global _last_debug_table
+    if not force:
+        if not log.isEnabledFor(logging.DEBUG) or time.monotonic() - _last_debug_table < DEBUG_TABLE_INTERVAL:
+            return
+        _last_debug_table = time.monotonic()
+    
+    if snapshot is None:
+        snapshot = get_interval_snapshot()
+    
+    games = dump_games(snapshot)
+    hot_count = int(snapshot.hot_mask().sum())
+    log.log(
+        logging.INFO if force else logging.DEBUG,
+        f"📊 DEBUG: RTP de {len(games)} jogos, {hot_count} com RTP >= {CONFIG['rtp_threshold']}%",
+        extra={"fields": {"time_seed": snapshot.time_seed, "hot_count": hot_count, "games": games}}
+    )
+
+
+class DiagnosticsReport:
+    """
+    Diff of the hot set and the top-K ranking between consecutive intervals.
+    State is kept by game_id, so a catalog reload between intervals is fine.
+    """
     
-    # Print header
-    print(f"{'#':<3} {'Game':<35} {'Hash':<12} {'RTP':<6} {'Status'}")
-    print("-" * 70)
+    def __init__(self, top_k: int = DIAGNOSTICS_TOP_K):
+        self.query = GameQuery(rtp_min=CONFIG["rtp_threshold"], limit=top_k, require_image=False)
+        self.time_seed: Optional[int] = None
+        self.hot_ids: frozenset = frozenset()
+        self.ranks: Dict[str, int] = {}
     
-    for i, game in enumerate(ALL_GAMES, 1):
-        game_hash = string_to_hash(game["game_id"])
-        rtp = generate_game_rtp(game["game_id"])
-        strategy = generate_game_strategy(game["game_id"])
+    def update(self, snapshot: IntervalSnapshot) -> Optional[Dict]:
+        """
+        Compares a snapshot with the previous one and remembers it.
         
-        status = "🔥 HOT!" if rtp >= CONFIG["rtp_threshold"] else ""
+        Args:
+            snapshot: Interval snapshot
         
-        print(f"{i:<3} {game['display_name']:<35} {game_hash:<12} {rtp}%   {status}")
-        print(f"    └ Normal: {strategy['normal']}X | Auto: {strategy['auto']} | Turbo: {strategy['turbo']}")
-    
-    print("-" * 70)
+        Returns:
+            The diff, or None when the snapshot was already reported
+        """
+        if snapshot.time_seed == self.time_seed:
+            return None
+        catalog = snapshot.catalog
+        records = catalog.records
+        
+        hot_ids = frozenset(records[i].game_id for i in np.flatnonzero(snapshot.hot_mask()))
+        ranks = {records[i].game_id: rank for rank, i in enumerate(self.query.top_indexes(snapshot), 1)}
+        
+        first = self.time_seed is None
+        entered = sorted(hot_ids - self.hot_ids)
+        left = sorted(self.hot_ids - hot_ids)
+        rank_changes = [
+            {"game_id": game_id, "from": self.ranks.get(game_id), "to": ranks.get(game_id)}
+            for game_id in sorted(set(ranks) | set(self.ranks))
+            if ranks.get(game_id) != self.ranks.get(game_id)
+        ]
+        
+        diff = {
+            "time_seed": snapshot.time_seed,
+            "hot_count": len(hot_ids),
+            "hot_delta": 0 if first else len(hot_ids) - len(self.hot_ids),
+            "entered": [] if first else entered,
+            "left": [] if first else left,
+            "rank_changes": [] if first else rank_changes
+        }
+        self.time_seed, self.hot_ids, self.ranks = snapshot.time_seed, hot_ids, ranks
+        return diff
     
-    high_rtp = [g for g in ALL_GAMES if generate_game_rtp(g["game_id"]) >= CONFIG["rtp_threshold"]]
-    print(f"📈 Jogos com RTP >= 80%: {len(high_rtp)}")
-    print("=" * 70 + "\n")
+    def report(self, snapshot: IntervalSnapshot):
+        """Logs the diff against the previous interval as one line."""
+        diff = self.update(snapshot)
+        if diff is None:
+            return
+        log.info(
+            f"🔁 Diagnóstico: {diff['hot_count']} jogos quentes ({diff['hot_delta']:+d}), "
+            f"+{len(diff['entered'])} / -{len(diff['left'])}, "
+            f"{len(diff['rank_changes'])} mudança(s) no top {self.query.limit}",
+            extra={"fields": diff}
+        )
+
+
+DIAGNOSTICS = DiagnosticsReport()
 
 
 # =============================================================================
 # MAIN LOOP
+# Two phases per interval: PREPARE_LEAD_SECONDS before the boundary the next
+# interval is evaluated from its future time seed and every channel's
+# captions and images are built; at the boundary the commit phase only makes
+# the Telegram calls.
 # =============================================================================
 
+# Seconds before each 3-minute boundary the next interval is prepared
+PREPARE_LEAD_SECONDS = float(os.getenv("PREPARE_LEAD_SECONDS", "20"))
+
+
+async def sleep_until(moment: datetime):
+    """Sleeps until a São Paulo time (returns at once if it already passed)."""
+    delay = (moment - datetime.now(SAO_PAULO_TZ)).total_seconds()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+async def prepare_cycle(snapshot: IntervalSnapshot) -> List[PreparedPrediction]:
+    """
+    Prepare phase for every channel this replica owns.
+    
+    Args:
+        snapshot: Interval to prepare (usually the next one)
+    
+    Returns:
+        Prepared predictions of the channels that have something to send
+    """
+    with PREPARE_SECONDS.time():
+        # Pick up added, removed or replaced images (one stat of the folder)
+        if IMAGE_INDEX.refresh():
+            IMAGE_INDEX.report_missing(get_catalog())
+            if IMAGE_INDEX.changed:
+                log.info(f"🖼️ {forget_changed_images(IMAGE_INDEX.changed)} imagem(ns) alterada(s) no disco")
+                await prepare_catalog_images(get_catalog())
+        
+        channels = [
+            (tenant, channel_cfg) for tenant, channel_cfg in get_tenants().channels()
+            if owns_channel(tenant, channel_cfg["channel_id"])
+        ]
+        results = await asyncio.gather(*(
+            prepare_prediction(
+                channel_id=channel_cfg["channel_id"],
+                provider_filter=channel_cfg["provider"],
+                channel_name=channel_cfg["name"],
+                snapshot=snapshot,
+                album=channel_cfg.get("album", False),
+                query=get_channel_query(channel_cfg, tenant),
+                tenant=tenant
+            )
+            for tenant, channel_cfg in channels
+        ), return_exceptions=True)
+    
+    prepared = []
+    for (tenant, channel_cfg), result in zip(channels, results):
+        if isinstance(result, Exception):
+            log.error(f"❌ Erro ao preparar o canal {channel_cfg['name']} ({tenant.name}): {result}")
+        elif result is not None:
+            prepared.append(result)
+    return prepared
+
+
+async def commit_cycle(prepared: List[PreparedPrediction], boundary: Optional[datetime] = None):
+    """
+    Commit phase: sends every prepared prediction concurrently; each
+    tenant's rate limiter paces its own bot.
+    
+    Args:
+        prepared: Output of prepare_cycle()
+        boundary: Interval boundary the sends were scheduled for (None for
+                  catch-up sends, which are not counted as boundary latency)
+    """
+    started = datetime.now(SAO_PAULO_TZ)
+    
+    # Leases may have moved since the prepare phase: never send for a channel
+    # another replica now owns
+    owned = [prediction for prediction in prepared if owns_channel(prediction.tenant, prediction.channel_id)]
+    if len(owned) < len(prepared):
+        log.info(f"🔀 {len(prepared) - len(owned)} canal(is) preparado(s) não pertencem mais a esta réplica")
+    prepared = owned
+    
+    results = await asyncio.gather(
+        *(commit_prediction(prediction, boundary) for prediction in prepared), return_exceptions=True
+    )
+    for prediction, result in zip(prepared, results):
+        if isinstance(result, Exception):
+            log.error(f"❌ Erro no canal {prediction.display_name} ({prediction.tenant.name}): {result}")
+    
+    if boundary is not None:
+        finished = datetime.now(SAO_PAULO_TZ)
+        log.info(
+            f"🎯 Virada das {boundary.strftime('%H:%M')}: {len(prepared)} canais, "
+            f"início +{(started - boundary).total_seconds() * 1000:.0f} ms, "
+            f"fim +{(finished - boundary).total_seconds() * 1000:.0f} ms",
+            extra={"fields": {
+                "channels": len(prepared),
+                "commit_start_offset_s": (started - boundary).total_seconds(),
+                "commit_end_offset_s": (finished - boundary).total_seconds(),
+            }}
+        )
+
+
+async def prepare_catalog_images(catalog: GameCatalog):
+    """
+    Converts new images and loads them into memory, off the event loop.
+    Images already converted or cached are skipped.
+    
+    Args:
+        catalog: Game catalog
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, optimize_catalog_images, catalog)
+    
+    # Load image bytes into memory so sends never touch the disk
+    loaded = await loop.run_in_executor(
+        None, IMAGE_STORE.preload, [get_game_image_path(record) for record in catalog]
+    )
+    log.info(f"🖼️ Imagens em memória: +{loaded} ({IMAGE_STORE.total_bytes // 1024} KB)")
+
+
+async def watch_catalog():
+    """
+    Background task reloading catalog.json when it changes.
+    Only games that were added get hashed and have their images prepared;
+    the send loop keeps using its current snapshot meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(CATALOG_POLL_SECONDS)
+        try:
+            if await loop.run_in_executor(None, CATALOG_LOADER.reload_if_changed):
+                catalog = get_catalog()
+                IMAGE_INDEX.report_missing(catalog)
+                await prepare_catalog_images(catalog)
+        except Exception as e:
+            log.error(f"❌ Erro ao recarregar o catálogo: {e}")
+
+
 async def main():
     """
     Main bot loop.
     Checks for high RTP games every 3 minutes (synchronized with website).
     Sends to different channels based on provider configuration.
     """
-    print("=" * 70)
-    print("🎰 RTP BOT v2.0 - Sincronizado com Website")
-    print("=" * 70)
-    print(f"📍 Timezone: São Paulo (UTC-3)")
-    print(f"🔄 Intervalo de atualização: 3 minutos")
-    print(f"📊 Limite RTP: >= {CONFIG['rtp_threshold']}%")
-    print(f"🎮 Jogos monitorados: {len(ALL_GAMES)}")
-    print()
-    print("📢 Canais configurados:")
-    for ch in CHANNEL_CONFIG:
-        print(f"   • {ch['name']}: {ch['channel_id']} ({ch['provider']})")
-    print("=" * 70)
+    channels = {
+        tenant.name: [f"{ch['name']}: {ch['channel_id']} ({ch['provider']})" for ch in tenant.channels]
+        for tenant in get_tenants()
+    }
+    log.info(
+        f"🎰 RTP BOT v2.0 - Sincronizado com Website: São Paulo (UTC-3), intervalo de 3 minutos, "
+        f"RTP >= {CONFIG['rtp_threshold']}%, {len(get_catalog())} jogos, "
+        f"{sum(len(c) for c in channels.values())} canais",
+        extra={"fields": {
+            "rtp_threshold": CONFIG["rtp_threshold"], "games": len(get_catalog()), "channels": channels
+        }}
+    )
     
     # Show hash verification info on startup
     verify_hash_calculation()
     
-    while True:
-        # Debug: Show all games RTP
-        debug_print_all_games()
+    # Index the images folder once and report games without an image
+    IMAGE_INDEX.refresh(force=True)
+    IMAGE_INDEX.report_missing(get_catalog())
+    
+    # Convert new or changed images before the first send
+    await prepare_catalog_images(get_catalog())
+    
+    # Restore the snapshot saved at shutdown, then precompute the upcoming intervals
+    if load_warm_state() is not None:
+        log.info("♨️ Snapshot do intervalo atual restaurado")
+    await refresh_forecast()
+    SCHEDULE.update()
+    
+    # Railway stops the service with SIGTERM: cancel main() so the state is saved
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        # kill -USR1 <pid> logs the full per-game dump of the current interval
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, debug_print_all_games, None, True)
+    except (NotImplementedError, RuntimeError):
+        pass  # No signal handlers on this platform
+    
+    # Retry failed sends in the background (also those left by a previous run)
+    # and pick up catalog.json changes without restarting
+    background_tasks = [asyncio.create_task(run_outbox()), asyncio.create_task(watch_catalog())]
+    metrics_server = None
+    forecast_task = None
+    try:
+        # Take this replica's share of the channels before the first send
+        if SHARDS is not None:
+            keys = [get_channel_key(tenant, cfg["channel_id"]) for tenant, cfg in get_tenants().channels()]
+            SHARDS.rebalance(keys)
+            background_tasks.append(asyncio.create_task(run_shard_leases()))
         
-        # Send to each configured channel with its provider filter
-        for channel_cfg in CHANNEL_CONFIG:
-            await send_prediction(
-                channel_id=channel_cfg["channel_id"],
-                provider_filter=channel_cfg["provider"],
-                channel_name=channel_cfg["name"]
-            )
-            await asyncio.sleep(2)  # Small delay between channels
+        # Prometheus endpoint on this event loop
+        metrics_server = await start_metrics_server()
         
-        # Wait until next 3-minute interval
-        now = datetime.now(SAO_PAULO_TZ)
-        current_second = now.second + (now.minute % 3) * 60
-        seconds_until_next = (3 * 60) - current_second
+        # First cycle: send the current interval right away
+        snapshot = get_interval_snapshot()
+        prepared = await prepare_cycle(snapshot)
+        boundary = None
         
-        print(f"\n⏳ Aguardando {seconds_until_next} segundos até próxima atualização...")
-        print(f"   Próxima verificação: {(now + timedelta(seconds=seconds_until_next)).strftime('%H:%M:%S')}\n")
+        while True:
+            # Commit phase: fire the pre-built sends the moment the interval starts
+            if boundary is not None:
+                await sleep_until(boundary)
+            WAKEUP_DRIFT_SECONDS.set((datetime.now(SAO_PAULO_TZ) - snapshot.interval_start).total_seconds())
+            cycle_started = time.perf_counter()
+            await commit_cycle(prepared, boundary)
         
-        await asyncio.sleep(seconds_until_next + 1)  # +1 to ensure we're in the new interval
+            # Diagnostics: only what changed since the previous interval
+            DIAGNOSTICS.report(snapshot)
+            debug_print_all_games(snapshot)
+        
+            # Drop ledger rows no longer needed for deduplication
+            SEND_LEDGER.prune()
+        
+            CYCLE_SECONDS.observe(time.perf_counter() - cycle_started)
+        
+            # Roll the forecast forward in the background while waiting
+            if forecast_needs_refresh() and (forecast_task is None or forecast_task.done()):
+                forecast_task = asyncio.create_task(refresh_forecast())
+        
+            # Roll the "when is it hot next" index forward by one interval
+            SCHEDULE.update()
+        
+            # Prepare phase: build the next interval's sends ahead of its boundary
+            boundary = snapshot.valid_until
+            prepare_at = boundary - timedelta(seconds=PREPARE_LEAD_SECONDS)
+            log.info(
+                f"⏳ Próxima atualização às {boundary.strftime('%H:%M:%S')} "
+                f"(preparação às {prepare_at.strftime('%H:%M:%S')})"
+            )
+            await sleep_until(prepare_at)
+            snapshot = get_interval_snapshot(boundary)
+            prepared = await prepare_cycle(snapshot)
+        
+            now = datetime.now(SAO_PAULO_TZ)
+            if now >= snapshot.valid_until:
+                # Stalled past the whole interval (e.g. host suspended): catch up
+                log.warning("⚠️ Intervalo preparado já terminou, enviando o intervalo atual")
+                snapshot = get_interval_snapshot()
+                prepared = await prepare_cycle(snapshot)
+                boundary = None
+            elif now > boundary:
+                log.warning(f"⚠️ Preparação terminou {(now - boundary).total_seconds():.1f}s após a virada")
+    finally:
+        # Stop the background work before the entry point saves state
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+        if forecast_task is not None:
+            background_tasks.append(forecast_task)
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
 
 
 # =============================================================================
@@ -895,14 +4068,20 @@ async def main():
 # =============================================================================
 
 if __name__ == "__main__":
+    setup_logging()
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     
     try:
         loop.run_until_complete(main())
     except KeyboardInterrupt:
-        print("\n🛑 Bot encerrado pelo usuário")
+        log.info("🛑 Bot encerrado pelo usuário")
+    except asyncio.CancelledError:
+        log.info("🛑 Bot encerrado (SIGTERM)")
     except Exception as e:
-        print(f"\n❌ Erro fatal: {e}")
+        log.exception(f"❌ Erro fatal: {e}")
     finally:
+        save_warm_state()
+        if SHARDS is not None:
+            SHARDS.leave()
         loop.close()
@@ -0,0 +1,206 @@
+/*
+ * =============================================================================
+ * RTP GOLDEN VECTORS - CAPTURED FROM THE WEBSITE JAVASCRIPT
+ * =============================================================================
+ * The functions below are copied from the website's script.js. Running this
+ * file under node regenerates rtp_golden_vectors.json, the corpus that
+ * rtp_reference.py and every optimized implementation are checked against:
+ *
+ *     node rtp_golden.js > rtp_golden_vectors.json
+ *
+ * Inputs are fixed (catalog.json game ids, edge cases and a seeded PRNG), so
+ * the output only changes when the website algorithm or the catalog changes.
+ * =============================================================================
+ */
+
+"use strict";
+
+// getTimeSeed() reads local time; pin it so the corpus does not depend on the host
+process.env.TZ = "UTC";
+
+const fs = require("fs");
+const path = require("path");
+
+// =============================================================================
+// WEBSITE FUNCTIONS (script.js)
+// =============================================================================
+
+function stringToHash(str) {
+    let hash = 0;
+    for (let i = 0; i < str.length; i++) {
+        const char = str.charCodeAt(i);
+        hash = ((hash << 5) - hash) + char;
+        hash = hash & hash;
+    }
+    return Math.abs(hash);
+}
+
+function getTimeSeed(saoPauloTime) {
+    const currentMinute = saoPauloTime.getMinutes();
+    const roundedMinute = Math.floor(currentMinute / 3) * 3;
+    return saoPauloTime.getFullYear() * 525600 +
+        saoPauloTime.getMonth() * 43800 +
+        saoPauloTime.getDate() * 1440 +
+        saoPauloTime.getHours() * 60 +
+        roundedMinute;
+}
+
+function seededRandom(seed) {
+    seed = Math.abs(seed | 0);
+    let t = seed += 0x6D2B79F5;
+    t = Math.imul(t ^ t >>> 15, t | 1);
+    t ^= t + Math.imul(t ^ t >>> 7, t | 61);
+    return ((t ^ t >>> 14) >>> 0) / 4294967296;
+}
+
+function getSeededRandomInt(seed, min, max) {
+    seed = (seed * 9301 + 49297) % 233280;
+    const rnd = seededRandom(seed);
+    return Math.floor(rnd * (max - min + 1)) + min;
+}
+
+function getSeededChoice(seed, options) {
+    seed = (seed * 9301 + 49297) % 233280;
+    const rnd = seededRandom(seed);
+    return options[Math.floor(rnd * options.length)];
+}
+
+const AUTO_OPTIONS = [10, 30, 50, 80];
+const TURBO_OPTIONS = ["Ativo", "Desativado"];
+const MULTIPLIERS = ["3X", "7X", "9X", "10X", "11X", "13X", "15X", "17X", "20X"];
+
+function evaluateGame(gameHash, timeSeed) {
+    const baseSeed = timeSeed * 1000 + gameHash;
+    return [
+        getSeededRandomInt(baseSeed, 30, 99),
+        getSeededRandomInt(baseSeed + 1000, 2, 15),
+        AUTO_OPTIONS.indexOf(getSeededChoice(baseSeed + 2000, AUTO_OPTIONS)),
+        TURBO_OPTIONS.indexOf(getSeededChoice(baseSeed + 3000, TURBO_OPTIONS)),
+        getSeededRandomInt(baseSeed * 7, 0, MULTIPLIERS.length - 1),
+    ];
+}
+
+// =============================================================================
+// INPUTS
+// =============================================================================
+
+// Deterministic input generator (seededRandom's own mulberry32 core)
+let prngState = 20250115;
+function nextUint32() {
+    prngState = (prngState + 0x6D2B79F5) >>> 0;
+    let t = prngState;
+    t = Math.imul(t ^ t >>> 15, t | 1);
+    t ^= t + Math.imul(t ^ t >>> 7, t | 61);
+    return (t ^ t >>> 14) >>> 0;
+}
+function randomInt(min, max) {
+    return min + Math.floor(nextUint32() / 4294967296 * (max - min + 1));
+}
+
+const catalog = JSON.parse(fs.readFileSync(path.join(__dirname, "catalog.json"), "utf8"));
+const gameIds = catalog.games.map((game) => game.game_id);
+
+const EDGE_STRINGS = [
+    "", "a", "test", "PG SOFT/FORTUNE_1.webp", "Pragmatic Play/POPULAR_1.webp",
+    "ação/jogo.webp", "🎰 slot.webp", "𝐀𝐭𝐢𝐯𝐨", "\u0000", "x".repeat(1000),
+];
+
+const EDGE_HASHES = [0, 1, 2, 1000, 2147483647, 2147483648];
+const EDGE_TIME_SEEDS = [0, 1, 3, 1064842017, 1064842020, 1100000000, 2147483647];
+
+const EDGE_DATES = [
+    [2024, 1, 1, 0, 0], [2024, 1, 1, 0, 2], [2024, 1, 1, 0, 3], [2024, 2, 29, 23, 59],
+    [2024, 12, 31, 23, 58], [2025, 1, 15, 12, 1], [2025, 3, 31, 11, 30], [2025, 6, 30, 5, 44],
+    [2025, 10, 31, 18, 57], [2026, 7, 4, 9, 9], [2030, 11, 30, 14, 33], [2099, 12, 31, 23, 59],
+];
+
+// Values read off the website at time seed 1064842017 (see verify_fix.py)
+const OBSERVED = [
+    [1064842017, "PG SOFT/FORTUNE_1.webp", 85],
+    [1064842017, "PG SOFT/FORTUNE_2.webp", 88],
+    [1064842017, "PG SOFT/FORTUNE_3.webp", 86],
+    [1064842017, "PG SOFT/FORTUNE_4.webp", 36],
+    [1064842017, "PG SOFT/FORTUNE_5.webp", 30],
+];
+
+// =============================================================================
+// CORPUS
+// =============================================================================
+
+const hashes = [...EDGE_STRINGS, ...gameIds].map((s) => [s, stringToHash(s)]);
+
+const dates = [...EDGE_DATES];
+for (let i = 0; i < 188; i++) {
+    dates.push([randomInt(2020, 2035), randomInt(1, 12), randomInt(1, 28), randomInt(0, 23), randomInt(0, 59)]);
+}
+const timeSeeds = dates.map((parts) => [parts, getTimeSeed(new Date(parts[0], parts[1] - 1, parts[2], parts[3], parts[4]))]);
+
+const seeds = [0, 1, -1, 233279, 2147483647, -2147483648, 2147483648, 4294967295, 1064842017000];
+for (let i = 0; i < 491; i++) {
+    seeds.push(i % 2 ? randomInt(0, 233279) : randomInt(-2147483648, 2147483647));
+}
+const seededRandomVectors = seeds.map((seed) => [seed, seededRandom(seed)]);
+
+const rows = [];
+const catalogTimeSeeds = timeSeeds.slice(0, 16).map(([, seed]) => seed);
+for (const timeSeed of catalogTimeSeeds) {
+    for (const gameId of gameIds) {
+        const gameHash = stringToHash(gameId);
+        rows.push([timeSeed, gameHash, ...evaluateGame(gameHash, timeSeed)]);
+    }
+}
+for (const timeSeed of EDGE_TIME_SEEDS) {
+    for (const gameHash of EDGE_HASHES) {
+        rows.push([timeSeed, gameHash, ...evaluateGame(gameHash, timeSeed)]);
+    }
+}
+for (let i = 0; i < 2000; i++) {
+    const timeSeed = i % 4 ? randomInt(1000000000, 1100000000) : randomInt(0, 2147483647);
+    const gameHash = randomInt(0, 2147483648);
+    rows.push([timeSeed, gameHash, ...evaluateGame(gameHash, timeSeed)]);
+}
+
+for (const [timeSeed, gameId, rtp] of OBSERVED) {
+    if (getSeededRandomInt(timeSeed * 1000 + stringToHash(gameId), 30, 99) !== rtp) {
+        throw new Error(`website observation not reproduced: ${gameId} @ ${timeSeed}`);
+    }
+}
+
+const corpus = {
+    description: "Golden vectors of the website RTP algorithm, generated by rtp_golden.js under node",
+    node: process.version,
+    hashes,
+    time_seeds: timeSeeds,
+    seeded_random: seededRandomVectors,
+    evaluations: {
+        fields: ["time_seed", "game_hash", "rtp", "normal", "auto_index", "turbo_index", "multiplier_index"],
+        rows,
+    },
+    observed: {
+        fields: ["time_seed", "game_id", "rtp"],
+        rows: OBSERVED,
+    },
+};
+
+// One vector per line keeps diffs of the corpus readable
+function formatVectors(list, indent) {
+    return "[\n" + list.map((item) => indent + "  " + JSON.stringify(item)).join(",\n") + "\n" + indent + "]";
+}
+
+process.stdout.write([
+    "{",
+    `  "description": ${JSON.stringify(corpus.description)},`,
+    `  "node": ${JSON.stringify(corpus.node)},`,
+    `  "hashes": ${formatVectors(corpus.hashes, "  ")},`,
+    `  "time_seeds": ${formatVectors(corpus.time_seeds, "  ")},`,
+    `  "seeded_random": ${formatVectors(corpus.seeded_random, "  ")},`,
+    `  "evaluations": {`,
+    `    "fields": ${JSON.stringify(corpus.evaluations.fields)},`,
+    `    "rows": ${formatVectors(corpus.evaluations.rows, "    ")}`,
+    `  },`,
+    `  "observed": {`,
+    `    "fields": ${JSON.stringify(corpus.observed.fields)},`,
+    `    "rows": ${formatVectors(corpus.observed.rows, "    ")}`,
+    `  }`,
+    "}",
+].join("\n") + "\n");
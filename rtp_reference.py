@@ -0,0 +1,359 @@
+"""
+=============================================================================
+RTP REFERENCE IMPLEMENTATION - THE WEBSITE ALGORITHM (script.js)
+=============================================================================
+Plain, scalar Python port of the website's RTP functions. This module is the
+single source of truth: the bot's table lookups and numpy batch engine are
+optimizations that must produce exactly the same numbers (see fuzz_rtp.py),
+and the debug scripts import their functions from here.
+
+Nothing here is optimized on purpose. Every step mirrors a line of the
+JavaScript, including its 32-bit integer wrapping and the float64 precision
+loss of getSeededRandomInt().
+
+The golden vectors in rtp_golden_vectors.json were produced by running the
+website functions under node (rtp_golden.js); verify_golden_vectors() checks
+this module against them.
+=============================================================================
+"""
+
+import ctypes
+import json
+import math
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence
+
+# =============================================================================
+# WEBSITE CONSTANTS
+# =============================================================================
+
+RTP_MIN = 30
+RTP_MAX = 99
+NORMAL_MIN = 2
+NORMAL_MAX = 15
+AUTO_OPTIONS = (10, 30, 50, 80)
+TURBO_OPTIONS = ("Ativo", "Desativado")
+MULTIPLIER_VALUES = ("3X", "7X", "9X", "10X", "11X", "13X", "15X", "17X", "20X")
+
+# getSeededRandomInt() reduces every seed modulo this value
+SEED_MODULUS = 233280
+
+GOLDEN_VECTORS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rtp_golden_vectors.json")
+
+# Fields of one evaluation, in the order used by the golden vectors
+EVALUATION_FIELDS = ("rtp", "normal", "auto_index", "turbo_index", "multiplier_index")
+
+
+# =============================================================================
+# JAVASCRIPT INTEGER SEMANTICS
+# Uses ctypes.c_int32 for proper JavaScript 32-bit signed integer emulation
+# =============================================================================
+
+def to_int32(val: int) -> int:
+    """
+    Converts a Python integer to JavaScript-style 32-bit signed integer.
+    Uses ctypes for exact behavior matching.
+
+    Args:
+        val: Input integer value
+
+    Returns:
+        32-bit signed integer (-2147483648 to 2147483647)
+    """
+    return ctypes.c_int32(val).value
+
+
+def to_uint32(val: int) -> int:
+    """
+    Converts a Python integer to JavaScript-style 32-bit unsigned integer.
+    Uses ctypes for exact behavior matching.
+
+    Args:
+        val: Input integer value
+
+    Returns:
+        32-bit unsigned integer (0 to 4294967295)
+    """
+    return ctypes.c_uint32(val).value
+
+
+def js_imul(a: int, b: int) -> int:
+    """
+    JavaScript Math.imul equivalent - 32-bit integer multiplication.
+
+    Math.imul performs 32-bit integer multiplication, similar to how
+    the multiplication would work in C. This handles overflow correctly.
+
+    Args:
+        a: First operand
+        b: Second operand
+
+    Returns:
+        32-bit signed integer result of multiplication
+    """
+    # Convert both to 32-bit unsigned, multiply, then convert result to signed
+    a = to_uint32(a)
+    b = to_uint32(b)
+    # Perform multiplication and take lower 32 bits
+    result = (a * b) & 0xFFFFFFFF
+    # Convert to signed 32-bit
+    return to_int32(result)
+
+
+def utf16_code_units(s: str) -> Iterator[int]:
+    """
+    Yields the UTF-16 code units of a string, like JavaScript's charCodeAt().
+    Characters outside the BMP (emoji) become a surrogate pair.
+    """
+    for char in s:
+        code_point = ord(char)
+        if code_point > 0xFFFF:
+            code_point -= 0x10000
+            yield 0xD800 + (code_point >> 10)
+            yield 0xDC00 + (code_point & 0x3FF)
+        else:
+            yield code_point
+
+
+# =============================================================================
+# WEBSITE FUNCTIONS
+# =============================================================================
+
+def string_to_hash(s: str) -> int:
+    """
+    Converts a string to a 32-bit hash value.
+    This is an EXACT port of the JavaScript stringToHash() function.
+
+    JavaScript equivalent:
+        function stringToHash(str) {
+            let hash = 0;
+            for (let i = 0; i < str.length; i++) {
+                const char = str.charCodeAt(i);
+                hash = ((hash << 5) - hash) + char;
+                hash = hash & hash;
+            }
+            return Math.abs(hash);
+        }
+
+    CRITICAL: JavaScript's << operator returns a 32-bit SIGNED integer.
+    The & hash operation also forces 32-bit signed conversion.
+    We use ctypes.c_int32 to exactly match this behavior.
+    str.length and charCodeAt() count UTF-16 code units, so characters
+    outside the BMP contribute two values.
+
+    Args:
+        s: Input string (game ID like "PG SOFT/FORTUNE_1.webp")
+
+    Returns:
+        Absolute value of 32-bit hash
+    """
+    hash_val = 0
+    for char_code in utf16_code_units(s):
+        # JavaScript: hash << 5 returns 32-bit signed
+        shifted = to_int32(hash_val << 5)
+        # JavaScript: (shifted - hash) + char, then & hash converts to int32
+        hash_val = to_int32(shifted - hash_val + char_code)
+    return abs(hash_val)
+
+
+def get_time_seed(now: datetime) -> int:
+    """
+    Time-based seed of the 3-minute interval containing a São Paulo time.
+    This is an EXACT port of the JavaScript getTimeSeed() function.
+
+    Args:
+        now: São Paulo wall-clock time
+
+    Returns:
+        Total minutes since epoch in São Paulo timezone, rounded to 3-minute intervals
+    """
+    # Round down to nearest 3-minute interval
+    rounded_minute = (now.minute // 3) * 3
+
+    # Note: JavaScript getMonth() is 0-11, so we use month - 1
+    return (
+        now.year * 525600 +
+        (now.month - 1) * 43800 +
+        now.day * 1440 +
+        now.hour * 60 +
+        rounded_minute
+    )
+
+
+def seeded_random(seed: int) -> float:
+    """
+    Generates a deterministic random number from a seed.
+    This is an EXACT port of the JavaScript seededRandom() function.
+
+    JavaScript equivalent:
+        function seededRandom(seed) {
+            seed = Math.abs(seed | 0);
+            let t = seed += 0x6D2B79F5;
+            t = Math.imul(t ^ t >>> 15, t | 1);
+            t ^= t + Math.imul(t ^ t >>> 7, t | 61);
+            return ((t ^ t >>> 14) >>> 0) / 4294967296;
+        }
+
+    Args:
+        seed: Input seed value
+
+    Returns:
+        Float between 0 and 1
+    """
+    # seed = Math.abs(seed | 0) - convert to 32-bit signed, then abs
+    seed = abs(to_int32(seed))
+
+    # let t = seed += 0x6D2B79F5
+    # In JS this modifies seed and assigns to t, but we only need t
+    t = to_uint32(seed + 0x6D2B79F5)
+
+    # t = Math.imul(t ^ t >>> 15, t | 1)
+    # >>> is unsigned right shift in JavaScript
+    t_shifted = t >> 15  # In Python, >> on positive numbers is like >>>
+    t = to_uint32(js_imul(t ^ t_shifted, t | 1))
+
+    # t ^= t + Math.imul(t ^ t >>> 7, t | 61)
+    t_shifted2 = t >> 7
+    imul_result = js_imul(t ^ t_shifted2, t | 61)
+    t = to_uint32(t ^ to_uint32(t + imul_result))
+
+    # return ((t ^ t >>> 14) >>> 0) / 4294967296
+    # >>> 0 ensures unsigned 32-bit
+    result = to_uint32(t ^ (t >> 14))
+
+    return result / 4294967296
+
+
+def reduce_seed(seed: int) -> int:
+    """
+    The seed = (seed * 9301 + 49297) % 233280 step of getSeededRandomInt().
+
+    CRITICAL: JavaScript uses 64-bit floats which lose precision for large integers.
+    We must use float() to match JavaScript's behavior exactly!
+
+    Args:
+        seed: Input seed value
+
+    Returns:
+        Reduced seed in [0, 233280)
+    """
+    return int((float(seed) * 9301 + 49297) % SEED_MODULUS)
+
+
+def get_seeded_random_int(seed: int, min_val: int, max_val: int) -> int:
+    """
+    Generates a deterministic random integer within a range.
+    This is an EXACT port of the JavaScript getSeededRandomInt() function.
+
+    Args:
+        seed: Input seed value
+        min_val: Minimum value (inclusive)
+        max_val: Maximum value (inclusive)
+
+    Returns:
+        Random integer between min_val and max_val
+    """
+    rnd = seeded_random(reduce_seed(seed))
+    return math.floor(rnd * (max_val - min_val + 1)) + min_val
+
+
+def get_seeded_choice(seed: int, options: Sequence):
+    """
+    Selects a deterministic choice from a list of options.
+    This is an EXACT port of the JavaScript getSeededChoice() function.
+
+    Args:
+        seed: Input seed value
+        options: List of options to choose from
+
+    Returns:
+        Selected option
+    """
+    rnd = seeded_random(reduce_seed(seed))
+    return options[math.floor(rnd * len(options))]
+
+
+def evaluate_game(game_hash: int, time_seed: int) -> Dict[str, int]:
+    """
+    Everything the website shows for one game in one interval.
+
+    Args:
+        game_hash: string_to_hash() of the game ID
+        time_seed: Time seed of the interval (see get_time_seed())
+
+    Returns:
+        Dictionary with the EVALUATION_FIELDS; options are returned as
+        indexes into AUTO_OPTIONS, TURBO_OPTIONS and MULTIPLIER_VALUES
+    """
+    base_seed = time_seed * 1000 + game_hash
+    return {
+        "rtp": get_seeded_random_int(base_seed, RTP_MIN, RTP_MAX),
+        "normal": get_seeded_random_int(base_seed + 1000, NORMAL_MIN, NORMAL_MAX),
+        "auto_index": get_seeded_choice(base_seed + 2000, range(len(AUTO_OPTIONS))),
+        "turbo_index": get_seeded_choice(base_seed + 3000, range(len(TURBO_OPTIONS))),
+        "multiplier_index": get_seeded_random_int(base_seed * 7, 0, len(MULTIPLIER_VALUES) - 1),
+    }
+
+
+# =============================================================================
+# GOLDEN VECTORS
+# =============================================================================
+
+def load_golden_vectors(path: str = GOLDEN_VECTORS_FILE) -> Dict:
+    """Loads the golden vector corpus captured from the website JavaScript."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def verify_golden_vectors(vectors: Dict = None) -> List[str]:
+    """
+    Checks this module against every golden vector.
+
+    Args:
+        vectors: Loaded corpus (defaults to load_golden_vectors())
+
+    Returns:
+        Description of each mismatch (empty when everything matches)
+    """
+    if vectors is None:
+        vectors = load_golden_vectors()
+    mismatches = []
+
+    for s, expected in vectors["hashes"]:
+        got = string_to_hash(s)
+        if got != expected:
+            mismatches.append(f"string_to_hash({s!r}) = {got}, expected {expected}")
+
+    for parts, expected in vectors["time_seeds"]:
+        got = get_time_seed(datetime(*parts))
+        if got != expected:
+            mismatches.append(f"get_time_seed({parts}) = {got}, expected {expected}")
+
+    for seed, expected in vectors["seeded_random"]:
+        got = seeded_random(seed)
+        if got != expected:
+            mismatches.append(f"seeded_random({seed}) = {got!r}, expected {expected!r}")
+
+    for time_seed, game_id, expected in vectors["observed"]["rows"]:
+        got = get_seeded_random_int(time_seed * 1000 + string_to_hash(game_id), RTP_MIN, RTP_MAX)
+        if got != expected:
+            mismatches.append(f"website RTP of {game_id} at time_seed={time_seed} = {got}, expected {expected}")
+
+    for row in vectors["evaluations"]["rows"]:
+        time_seed, game_hash = row[0], row[1]
+        got = evaluate_game(game_hash, time_seed)
+        for field, expected in zip(vectors["evaluations"]["fields"][2:], row[2:]):
+            if got[field] != expected:
+                mismatches.append(
+                    f"{field}(time_seed={time_seed}, hash={game_hash}) = {got[field]}, expected {expected}"
+                )
+    return mismatches
+
+
+if __name__ == "__main__":
+    problems = verify_golden_vectors()
+    for problem in problems[:20]:
+        print(f"❌ {problem}")
+    print("✅ Referência confere com os vetores golden" if not problems else f"❌ {len(problems)} divergência(s)")
+    raise SystemExit(1 if problems else 0)
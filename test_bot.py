@@ -0,0 +1,225 @@
+"""
+=============================================================================
+BOT STATE TESTS - Forecast rebuilds, album retries and shard leases
+=============================================================================
+Checks the parts of kiki2test.py that keep state between cycles. Runs with
+pytest or directly:
+
+    python -m pytest -q test_bot.py
+    python test_bot.py
+=============================================================================
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+
+# Keep the ledger, outbox and caches of the tests away from the bot's own
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="rtp_bot_test_"))
+
+import numpy as np
+
+import kiki2test as bot
+from telegram.error import NetworkError
+
+# Interval used by every forecast test
+START = bot.get_interval_start(bot.SAO_PAULO_TZ.localize(bot.datetime(2025, 1, 31, 9, 0)))
+
+
+# =============================================================================
+# FORECAST
+# =============================================================================
+
+def _expected_rows(catalog: bot.GameCatalog, table: bot.ForecastTable) -> np.ndarray:
+    """The forecast rows recomputed from scratch."""
+    rows = []
+    for time_seed in table.time_seeds:
+        results = bot.evaluate_games_batch(catalog.hashes, time_seed)
+        rows.append(np.stack([results[field] for field in bot.FORECAST_FIELDS], axis=-1))
+    return np.asarray(rows, dtype=np.uint8)
+
+
+def test_forecast_rebuild_keeps_previous_rows():
+    cache_dir = tempfile.mkdtemp()
+    meta_path = os.path.join(cache_dir, "forecast.json")
+    try:
+        catalog = bot.get_catalog()
+        first = bot.build_forecast(catalog, START, 20, workers=1, meta_path=meta_path)
+        assert int(first.data[..., 0].max()) == bot.CONFIG["rtp_max"]
+
+        # Same start and catalog: every row comes from the table being replaced
+        same = bot.build_forecast(catalog, START, 20, previous=first, workers=1, meta_path=meta_path)
+        assert np.array_equal(same.data, _expected_rows(catalog, same))
+        assert np.array_equal(first.data, _expected_rows(catalog, first))
+
+        # Rolled forward: 15 rows reused, 5 computed
+        later = START + timedelta(minutes=15)
+        rolled = bot.build_forecast(catalog, later, 20, previous=same, workers=1, meta_path=meta_path)
+        assert np.array_equal(rolled.data, _expected_rows(catalog, rolled))
+
+        loaded = bot.load_forecast(catalog, meta_path)
+        assert loaded is not None and np.array_equal(loaded.data, rolled.data)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def test_zeroed_forecast_on_disk_is_not_loaded():
+    cache_dir = tempfile.mkdtemp()
+    meta_path = os.path.join(cache_dir, "forecast.json")
+    try:
+        catalog = bot.get_catalog()
+        table = bot.build_forecast(catalog, START, 5, workers=1, meta_path=meta_path)
+        assert bot.load_forecast(catalog, meta_path) is not None
+        zeroed = np.load(os.path.join(cache_dir, [n for n in os.listdir(cache_dir) if n.endswith(".npy")][0]), mmap_mode="r+")
+        zeroed[:] = 0
+        zeroed.flush()
+        del table, zeroed
+        assert bot.load_forecast(catalog, meta_path) is None
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+
+# =============================================================================
+# ALBUM RETRIES
+# =============================================================================
+
+class FooterFailingBot:
+    """Telegram stand-in whose albums go through and whose text messages fail."""
+
+    def __init__(self):
+        self.albums = 0
+        self.messages = 0
+        self.fail_messages = True
+
+    async def send_media_group(self, chat_id, media, **kwargs):
+        self.albums += 1
+        return [SimpleNamespace(message_id=i, photo=[SimpleNamespace(file_id=f"file-{i}")]) for i in range(len(media))]
+
+    async def send_message(self, **kwargs):
+        if self.fail_messages:
+            raise NetworkError("connection reset")
+        self.messages += 1
+        return SimpleNamespace(message_id=100, photo=None)
+
+
+def _pending_outbox(chat_id: str) -> list:
+    """Outbox entries of a chat, backoff ignored."""
+    bot.OUTBOX._db.execute("UPDATE outbox SET next_attempt = 0")
+    return [entry for entry in bot.OUTBOX.due() if entry.chat_id == chat_id]
+
+
+def test_failed_album_footer_does_not_resend_album():
+    tenant = bot.get_default_tenant()
+    tenant.bot = FooterFailingBot()
+    tenant.rate_limiter = bot.TelegramRateLimiter(name=tenant.name)
+    snapshot = bot.get_interval_snapshot()
+    games = bot.get_high_rtp_games("ALL", snapshot)[:3]
+    assert len(games) > 1
+    prepared = bot.PreparedPrediction(
+        tenant, "@album_test", "Album test", "ALL", snapshot, games,
+        [game.game.display_name for game in games], ["unused"] * len(games),
+        [(b"image", f"hash-{i}") for i in range(len(games))], "footer"
+    )
+
+    asyncio.run(bot.commit_prediction(prepared))
+    assert tenant.bot.albums == 1
+    sent = bot.SEND_LEDGER.sent_game_ids(tenant.name, "@album_test", snapshot.time_seed)
+    assert sent == {game.game.game_id for game in games}
+    (entry,) = _pending_outbox("@album_test")
+    assert entry.kind == "message" and entry.payload["text"] == "footer"
+
+    # The retry delivers only the footer
+    tenant.bot.fail_messages = False
+    asyncio.run(bot.retry_outbox_entry(entry))
+    assert (tenant.bot.albums, tenant.bot.messages) == (1, 1)
+    assert not _pending_outbox("@album_test")
+
+
+# =============================================================================
+# SHARD LEASES
+# =============================================================================
+
+KEYS = [f"default:@channel_{i}" for i in range(40)]
+TTL = 30.0
+
+
+def _owners(coordinators, now: float) -> dict:
+    """key -> replicas that believe they own it."""
+    owners = {key: [] for key in KEYS}
+    for coordinator in coordinators:
+        for key in KEYS:
+            if coordinator.owns(key, now):
+                owners[key].append(coordinator.replica_id)
+    return owners
+
+
+def test_lease_acquire_renew_expire():
+    coordinator = bot.ShardCoordinator(bot.MemoryLeaseStore(), "a", TTL)
+    assert coordinator.rebalance(KEYS, now=0.0) == sorted(KEYS)
+    assert coordinator.owns(KEYS[0], now=TTL - bot.LEASE_SAFETY_MARGIN - 0.1)
+    # Not trusted within the safety margin of the expiry
+    assert not coordinator.owns(KEYS[0], now=TTL - bot.LEASE_SAFETY_MARGIN)
+
+    # Renewing extends the lease
+    coordinator.rebalance(KEYS, now=10.0)
+    assert coordinator.owns(KEYS[0], now=TTL + 5.0)
+    assert not coordinator.owns(KEYS[0], now=10.0 + TTL)
+
+
+def test_lease_handoff_never_has_two_owners():
+    store = bot.MemoryLeaseStore()
+    a = bot.ShardCoordinator(store, "a", TTL)
+    b = bot.ShardCoordinator(store, "b", TTL)
+    a.rebalance(KEYS, now=0.0)
+
+    # b joins: its share is still leased by a, so it takes nothing yet
+    assert b.rebalance(KEYS, now=1.0) == []
+    # a sees b and releases b's share, which b then takes
+    kept = a.rebalance(KEYS, now=2.0)
+    taken = b.rebalance(KEYS, now=3.0)
+    assert kept and taken and not set(kept) & set(taken)
+    assert sorted(kept + taken) == sorted(KEYS)
+    assert taken == sorted(key for key in KEYS if bot._rendezvous_owner(key, ["a", "b"]) == "b")
+
+    for now in (1.0, 2.5, 3.5):
+        assert all(len(owners) <= 1 for owners in _owners([a, b], now).values())
+
+
+def test_lease_of_dead_replica_expires():
+    store = bot.MemoryLeaseStore()
+    a = bot.ShardCoordinator(store, "a", TTL)
+    b = bot.ShardCoordinator(store, "b", TTL)
+    a.rebalance(KEYS, now=0.0)
+    b.rebalance(KEYS, now=0.0)
+    a.rebalance(KEYS, now=0.0)
+    b.rebalance(KEYS, now=0.0)
+
+    # a stops renewing: b cannot take its channels before the leases expire...
+    assert len(b.rebalance(KEYS, now=TTL - 1.0)) < len(KEYS)
+    # ...and a stops trusting them before that
+    assert not any(a.owns(key, now=TTL - 1.0) for key in KEYS)
+    assert b.rebalance(KEYS, now=TTL + 1.0) == sorted(KEYS)
+    assert all(owners == ["b"] for owners in _owners([a, b], TTL + 1.0).values())
+
+
+def test_leave_hands_over_at_once():
+    store = bot.MemoryLeaseStore()
+    a = bot.ShardCoordinator(store, "a", TTL)
+    b = bot.ShardCoordinator(store, "b", TTL)
+    for now in (0.0, 0.0, 1.0):
+        a.rebalance(KEYS, now=now)
+        b.rebalance(KEYS, now=now)
+    a.leave()
+    assert not any(a.owns(key, now=2.0) for key in KEYS)
+    assert b.rebalance(KEYS, now=2.0) == sorted(KEYS)
+
+
+if __name__ == "__main__":
+    tests = [(name, func) for name, func in sorted(globals().items()) if name.startswith("test_")]
+    for name, func in tests:
+        func()
+        print(f"✅ {name}")
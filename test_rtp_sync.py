@@ -7,72 +7,26 @@ Open website console (F12) and compare the output values.
 =============================================================================
 """
 
-import ctypes
-import math
 from datetime import datetime
 import pytz
 
+import rtp_reference
+from rtp_reference import RTP_MAX, RTP_MIN, get_seeded_random_int, string_to_hash
+
 SAO_PAULO_TZ = pytz.timezone("America/Sao_Paulo")
 
 # =============================================================================
-# EXACT COPIES OF THE RTP FUNCTIONS
+# RTP FUNCTIONS - SHARED REFERENCE PORT (rtp_reference.py)
 # =============================================================================
 
-def to_int32(val):
-    return ctypes.c_int32(val).value
-
-def to_uint32(val):
-    return ctypes.c_uint32(val).value
-
-def string_to_hash(s):
-    hash_val = 0
-    for char in s:
-        char_code = ord(char)
-        shifted = to_int32(hash_val << 5)
-        hash_val = to_int32(shifted - hash_val + char_code)
-    return abs(hash_val)
-
 def get_time_seed():
-    sao_paulo_time = datetime.now(SAO_PAULO_TZ)
-    current_minute = sao_paulo_time.minute
-    rounded_minute = (current_minute // 3) * 3
-    total_minutes = (
-        sao_paulo_time.year * 525600 +
-        (sao_paulo_time.month - 1) * 43800 +
-        sao_paulo_time.day * 1440 +
-        sao_paulo_time.hour * 60 +
-        rounded_minute
-    )
-    return total_minutes
-
-def js_imul(a, b):
-    a = to_uint32(a)
-    b = to_uint32(b)
-    result = (a * b) & 0xFFFFFFFF
-    return to_int32(result)
-
-def seeded_random(seed):
-    seed = abs(to_int32(seed))
-    t = to_uint32(seed + 0x6D2B79F5)
-    t_shifted = t >> 15
-    t = to_uint32(js_imul(t ^ t_shifted, t | 1))
-    t_shifted2 = t >> 7
-    imul_result = js_imul(t ^ t_shifted2, t | 61)
-    t = to_uint32(t ^ to_uint32(t + imul_result))
-    result = to_uint32(t ^ (t >> 14))
-    return result / 4294967296
-
-def get_seeded_random_int(seed, min_val, max_val):
-    # MUST use float to match JavaScript's 64-bit float precision loss!
-    seed = int((float(seed) * 9301 + 49297) % 233280)
-    rnd = seeded_random(seed)
-    return math.floor(rnd * (max_val - min_val + 1)) + min_val
+    return rtp_reference.get_time_seed(datetime.now(SAO_PAULO_TZ))
 
 def generate_rtp(game_id):
     time_seed = get_time_seed()
     game_hash = string_to_hash(game_id)
     combined_seed = time_seed * 1000 + game_hash
-    rtp = get_seeded_random_int(combined_seed, 30, 99)
+    rtp = get_seeded_random_int(combined_seed, RTP_MIN, RTP_MAX)
     return rtp, game_hash, time_seed, combined_seed
 
 # =============================================================================
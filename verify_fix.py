@@ -1,35 +1,5 @@
 """Verify the RTP fix works - compare with website values"""
-import ctypes
-import math
-
-def to_int32(val):
-    return ctypes.c_int32(val).value
-
-def to_uint32(val):
-    return ctypes.c_uint32(val).value
-
-def string_to_hash(s):
-    hash_val = 0
-    for char in s:
-        shifted = to_int32(hash_val << 5)
-        hash_val = to_int32(shifted - hash_val + ord(char))
-    return abs(hash_val)
-
-def js_imul(a, b):
-    return to_int32((to_uint32(a) * to_uint32(b)) & 0xFFFFFFFF)
-
-def seeded_random(seed):
-    seed = abs(to_int32(seed))
-    t = to_uint32(seed + 0x6D2B79F5)
-    t = to_uint32(js_imul(t ^ (t >> 15), t | 1))
-    t = to_uint32(t ^ to_uint32(t + js_imul(t ^ (t >> 7), t | 61)))
-    return to_uint32(t ^ (t >> 14)) / 4294967296
-
-def get_seeded_random_int(seed, min_val, max_val):
-    # FIXED: Use float to match JavaScript's 64-bit float precision loss!
-    seed = int((float(seed) * 9301 + 49297) % 233280)
-    rnd = seeded_random(seed)
-    return math.floor(rnd * (max_val - min_val + 1)) + min_val
+from rtp_reference import RTP_MAX, RTP_MIN, get_seeded_random_int, string_to_hash, verify_golden_vectors
 
 # Test with the EXACT time seed from website: 1064842017
 time_seed = 1064842017
@@ -60,13 +30,20 @@ all_match = True
 for i, (game_id, name) in enumerate(games):
     game_hash = string_to_hash(game_id)
     combined = time_seed * 1000 + game_hash
-    rtp = get_seeded_random_int(combined, 30, 99)
+    rtp = get_seeded_random_int(combined, RTP_MIN, RTP_MAX)
     exp = expected[game_id]
     match = "✓" if rtp == exp else "✗"
     if rtp != exp:
         all_match = False
     print(f"{i+1}. {name:<20} | RTP: {rtp:2}% (expected: {exp}%) {match}")
 
+# Full corpus captured from the website JavaScript (rtp_golden.js)
+golden_mismatches = verify_golden_vectors()
+print(f"Golden vectors: {'all match' if not golden_mismatches else f'{len(golden_mismatches)} mismatches'}")
+for mismatch in golden_mismatches[:10]:
+    print(f"   {mismatch}")
+all_match = all_match and not golden_mismatches
+
 print()
 if all_match:
     print("🎉 ALL VALUES MATCH! The fix works!")